@@ -0,0 +1,121 @@
+"""
+Benchmark: binary-quantized retrieval vs exact search
+
+Samples stored embeddings as query vectors and compares search_mode='binary'
+(Hamming-index candidates + full-precision rerank) against an exact scan,
+reporting recall@k and p50/p95 latency.
+
+Usage:
+    python benchmark_binary_quantization.py --collection news_articles --queries 100
+"""
+import argparse
+import logging
+import time
+from typing import List, Tuple
+
+from sqlalchemy import text
+
+from config import settings
+from models import engine
+from quantized_search import binary_rerank_sql, set_ef_search
+from vector_store import distance_sql, embedding_dimension, ensure_binary_index, vector_table, vector_table_name
+
+logging.basicConfig(level=logging.INFO)
+
+EXACT_QUERY = """
+SELECT node_id, {distance} AS distance
+FROM {table}
+WHERE id <> :exclude
+ORDER BY distance
+LIMIT :top_k
+"""
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def sample_queries(conn, table: str, count: int) -> List[Tuple[int, str]]:
+    """Pick random stored embeddings to use as query vectors"""
+    result = conn.execute(
+        text(f"SELECT id, CAST(embedding AS text) FROM {table} WHERE embedding IS NOT NULL ORDER BY random() LIMIT :n"),
+        {"n": count}
+    )
+    return [(row[0], row[1]) for row in result]
+
+
+def run_search(conn, sql: str, params: dict, exact: bool, candidates: int) -> Tuple[List[str], float]:
+    """Run one search in its own transaction, returning node ids and latency in ms"""
+    with conn.begin():
+        if exact:
+            # Force a full-precision sequential scan as ground truth
+            conn.execute(text("SET LOCAL enable_indexscan = off"))
+            conn.execute(text("SET LOCAL enable_bitmapscan = off"))
+        else:
+            set_ef_search(conn, candidates)
+        
+        start = time.perf_counter()
+        rows = conn.execute(text(sql), params).fetchall()
+        elapsed = (time.perf_counter() - start) * 1000
+    
+    return [row[0] for row in rows], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark binary-quantized retrieval against exact search")
+    parser.add_argument("--collection", default="news_articles", help="Collection suffix (e.g. jobs, news_articles)")
+    parser.add_argument("--queries", type=int, default=100, help="Number of sampled query vectors")
+    parser.add_argument("--top-k", type=int, default=10, help="k for recall@k")
+    parser.add_argument("--candidates", type=int, default=settings.binary_rerank_candidates,
+                        help="Hamming candidates passed to the exact rerank")
+    parser.add_argument("--create-index", action="store_true", help="Create the binary-quantized index first")
+    args = parser.parse_args()
+    
+    collection_name = f"{settings.vector_table_prefix}_{args.collection}"
+    table = vector_table(collection_name)
+    metric = settings.vector_distance_metric
+    
+    with engine.connect() as conn:
+        if args.create_index:
+            print("Creating binary-quantized index...")
+            with conn.begin():
+                ensure_binary_index(conn, collection_name)
+        
+        dim = embedding_dimension(conn, vector_table_name(collection_name))
+        queries = sample_queries(conn, table, args.queries)
+        conn.commit()
+        
+        exact_sql = EXACT_QUERY.format(distance=distance_sql(metric, dim, exact=True), table=table)
+        binary_sql = binary_rerank_sql(table, "id <> :exclude", dim, metric)
+        
+        recalls, exact_ms, binary_ms = [], [], []
+        for row_id, embedding in queries:
+            params = {"embedding": embedding, "exclude": row_id, "top_k": args.top_k, "candidates": args.candidates}
+            
+            truth, exact_latency = run_search(conn, exact_sql, params, exact=True, candidates=args.candidates)
+            found, binary_latency = run_search(conn, binary_sql, params, exact=False, candidates=args.candidates)
+            
+            if truth:
+                recalls.append(len(set(truth) & set(found)) / len(truth))
+            exact_ms.append(exact_latency)
+            binary_ms.append(binary_latency)
+    
+    if not recalls:
+        print(f"No embeddings found in {table}")
+        return
+    
+    print("\n" + "=" * 60)
+    print(f"BINARY QUANTIZATION BENCHMARK - {collection_name}")
+    print("=" * 60)
+    print(f"Dimensions: {dim} | Metric: {metric} | Queries: {len(recalls)} | Candidates: {args.candidates}")
+    print(f"\nRecall@{args.top_k}: {sum(recalls) / len(recalls):.3f} (min {min(recalls):.2f})")
+    print(f"\n{'':<10}{'p50 ms':>12}{'p95 ms':>12}")
+    print(f"{'Exact':<10}{percentile(exact_ms, 50):>12.1f}{percentile(exact_ms, 95):>12.1f}")
+    print(f"{'Binary':<10}{percentile(binary_ms, 50):>12.1f}{percentile(binary_ms, 95):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
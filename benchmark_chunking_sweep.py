@@ -0,0 +1,238 @@
+"""
+Benchmark: chunk_size / chunk_overlap parameter sweep
+
+Chunks a sample of news_articles and jobs under a grid of settings, embeds the
+chunks with a fake (hashing) or the configured local embedding model, and
+reports number of vectors, storage size, build time and retrieval hit rate on
+a labeled query set.
+
+Queries come from a labeled JSON file (required):
+    [{"query": "...", "source": "news_articles", "relevant_ids": ["123", "456"]}, ...]
+Write queries the way users search rather than copying text from the records:
+a query pasted from a record matches its first chunk verbatim under every
+setting, so the sweep could not tell the configurations apart. Records are
+chunked with the indexers' own splitters (build_splitter), so the grid
+measures what would actually be indexed.
+
+Usage:
+    python benchmark_chunking_sweep.py --queries labeled_queries.json --chunk-sizes 256,512,1024 --overlaps 0,50,100
+    python benchmark_chunking_sweep.py --embedder local --queries labeled_queries.json --pgvector
+"""
+import argparse
+import hashlib
+import json
+import logging
+import re
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+from llama_index.core import Document
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.node_parser import NodeParser
+from llama_index.core.schema import MetadataMode
+from sqlalchemy import text
+
+from config import settings
+from embeddings import create_local_embedding
+from indexer import JobIndexer, NewsArticleIndexer
+from models import Job, NewsArticle, SessionLocal, engine
+
+logging.basicConfig(level=logging.WARNING)
+
+SOURCES = {"news_articles": NewsArticle, "jobs": Job}
+INDEXERS = {"news_articles": NewsArticleIndexer, "jobs": JobIndexer}
+WORD = re.compile(r"[^\s.,;:!?()\[\]\"'“”‘’।]+")
+SWEEP_TABLE = "chunk_sweep_benchmark"
+
+
+class HashingEmbedding(BaseEmbedding):
+    """Deterministic bag-of-words embedding (feature hashing) - no model needed"""
+
+    dim: int = 384
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "HashingEmbedding"
+
+    def _vector(self, content: str) -> List[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in WORD.findall(content.lower()):
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._vector(query)
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._vector(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._vector(text)
+
+
+def sample_documents(count: int) -> Dict[str, List[Document]]:
+    """Load up to `count` recent records per source as Documents"""
+    db = SessionLocal()
+    try:
+        return {
+            source: [
+                Document(text=r.to_document_text(), metadata=r.to_metadata(), id_=str(r.id))
+                for r in db.query(model).order_by(model.id.desc()).limit(count).all()
+            ]
+            for source, model in SOURCES.items()
+        }
+    finally:
+        db.close()
+
+
+def load_queries(path: str, documents: Dict[str, List[Document]]) -> List[Dict]:
+    """Read the labeled query set, keeping queries whose relevant records were sampled"""
+    with open(path, encoding="utf-8") as f:
+        queries = json.load(f)
+    sampled = {source: {doc.id_ for doc in docs} for source, docs in documents.items()}
+    return [
+        q for q in queries
+        if sampled.get(q["source"], set()) & set(map(str, q["relevant_ids"]))
+    ]
+
+
+def build_splitter(source: str, chunk_size: int, chunk_overlap: int) -> NodeParser:
+    """Splitter the indexer for this source uses, at the given size and overlap"""
+    return INDEXERS[source].build_splitter(chunk_size, chunk_overlap)
+
+
+def pgvector_build(vectors: np.ndarray, texts: List[str]) -> tuple:
+    """Load vectors into a scratch table and build an HNSW index; returns (seconds, bytes)"""
+    dim = vectors.shape[1]
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {SWEEP_TABLE}"))
+        conn.execute(text(f"CREATE TABLE {SWEEP_TABLE} (id serial PRIMARY KEY, text text, embedding vector({dim}))"))
+        conn.execute(
+            text(f"INSERT INTO {SWEEP_TABLE} (text, embedding) VALUES (:text, CAST(:embedding AS vector))"),
+            [{"text": t, "embedding": "[" + ",".join(map(str, v)) + "]"} for t, v in zip(texts, vectors)]
+        )
+
+        start = time.perf_counter()
+        conn.execute(text(f"CREATE INDEX ON {SWEEP_TABLE} USING hnsw (embedding vector_ip_ops)"))
+        seconds = time.perf_counter() - start
+
+        size = conn.execute(text(f"SELECT pg_total_relation_size('{SWEEP_TABLE}')")).scalar()
+        conn.execute(text(f"DROP TABLE {SWEEP_TABLE}"))
+    return seconds, size
+
+
+def evaluate(
+    embed_model: BaseEmbedding,
+    documents: Dict[str, List[Document]],
+    queries: List[Dict],
+    chunk_size: int,
+    chunk_overlap: int,
+    top_k: int,
+    use_pgvector: bool
+) -> Dict:
+    """Chunk, embed and search one grid point"""
+    result = {"vectors": 0, "bytes": 0, "embed_s": 0.0, "index_s": 0.0}
+    per_source = {}
+
+    for source, docs in documents.items():
+        nodes = build_splitter(source, chunk_size, chunk_overlap).get_nodes_from_documents(docs)
+        texts = [node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes]
+
+        start = time.perf_counter()
+        vectors = np.array(embed_model.get_text_embedding_batch(texts), dtype=np.float32)
+        result["embed_s"] += time.perf_counter() - start
+        vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+        if use_pgvector and len(texts):
+            seconds, size = pgvector_build(vectors, texts)
+            result["index_s"] += seconds
+            result["bytes"] += size
+        else:
+            result["bytes"] += vectors.nbytes + sum(len(t.encode("utf-8")) for t in texts)
+
+        result["vectors"] += len(nodes)
+        per_source[source] = (vectors, [node.ref_doc_id for node in nodes])
+
+    hits, reciprocal_ranks = 0, 0.0
+    for q in queries:
+        vectors, doc_ids = per_source[q["source"]]
+        if not len(doc_ids):
+            continue
+        query_vector = np.array(embed_model.get_query_embedding(q["query"]), dtype=np.float32)
+        scores = vectors @ (query_vector / max(np.linalg.norm(query_vector), 1e-12))
+
+        # Rank records by their best chunk
+        ranked: List[str] = []
+        for i in np.argsort(-scores):
+            if doc_ids[i] not in ranked:
+                ranked.append(doc_ids[i])
+            if len(ranked) == top_k:
+                break
+
+        relevant = set(map(str, q["relevant_ids"]))
+        for rank, doc_id in enumerate(ranked, start=1):
+            if doc_id in relevant:
+                hits += 1
+                reciprocal_ranks += 1 / rank
+                break
+
+    result["hit_rate"] = hits / max(len(queries), 1)
+    result["mrr"] = reciprocal_ranks / max(len(queries), 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep chunk_size / chunk_overlap on sampled records")
+    parser.add_argument("--docs", type=int, default=300, help="Records sampled per source")
+    parser.add_argument("--chunk-sizes", default="256,512,1024")
+    parser.add_argument("--overlaps", default="0,50,100,200")
+    parser.add_argument("--embedder", choices=["fake", "local"], default="fake",
+                        help="fake = hashing bag-of-words, local = LOCAL_EMBEDDING_* model")
+    parser.add_argument("--queries", required=True, help="Labeled query set (JSON)")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--pgvector", action="store_true",
+                        help="Measure real HNSW build time and table size in a scratch table")
+    args = parser.parse_args()
+
+    documents = sample_documents(args.docs)
+    if not any(documents.values()):
+        print("No records found")
+        return
+    queries = load_queries(args.queries, documents)
+    if not queries:
+        print("No labeled queries point at the sampled records (raise --docs?)")
+        return
+
+    if args.embedder == "local":
+        embed_model = create_local_embedding(
+            model_name=settings.local_embedding_model,
+            backend=settings.local_embedding_backend,
+            quantize=settings.local_embedding_quantize,
+            cache_dir=settings.local_embedding_cache_dir or None,
+        )
+    else:
+        embed_model = HashingEmbedding()
+
+    print("\n" + "=" * 60)
+    print(f"CHUNKING SWEEP - {sum(len(d) for d in documents.values())} records, {len(queries)} queries")
+    print("=" * 60)
+    print(f"Embedder: {args.embedder} | Hit rate@{args.top_k} | Build: {'HNSW' if args.pgvector else 'embedding only'}")
+    print(f"\n{'size':>6}{'overlap':>9}{'vectors':>9}{'MB':>8}{'embed s':>9}{'index s':>9}{'hit':>7}{'MRR':>7}")
+
+    for chunk_size in map(int, args.chunk_sizes.split(",")):
+        for chunk_overlap in map(int, args.overlaps.split(",")):
+            if chunk_overlap >= chunk_size:
+                continue
+            r = evaluate(embed_model, documents, queries, chunk_size, chunk_overlap, args.top_k, args.pgvector)
+            print(
+                f"{chunk_size:>6}{chunk_overlap:>9}{r['vectors']:>9}{r['bytes'] / 1e6:>8.1f}"
+                f"{r['embed_s']:>9.1f}{r['index_s']:>9.2f}{r['hit_rate']:>7.3f}{r['mrr']:>7.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: local embedding backends on CPU
+
+Embeds a sample of stored records with the PyTorch HuggingFace model (fp32
+reference), the ONNX Runtime export and its int8-quantized copy, reporting
+docs/sec and cosine agreement with the fp32 reference vectors.
+
+Usage:
+    python benchmark_local_embeddings.py --docs 500
+    python benchmark_local_embeddings.py --docs 500 --threads 8 --batch-size 128
+    python benchmark_local_embeddings.py --docs 2000 --workers 0
+"""
+import argparse
+import logging
+import time
+from typing import List
+
+from config import settings
+from embeddings import MultiProcessEmbedding, OnnxEmbedding, l2_normalize
+from models import Job, NewsArticle, SessionLocal
+
+logging.basicConfig(level=logging.INFO)
+
+
+def sample_texts(count: int) -> List[str]:
+    """Take document texts from news articles and jobs (half each when available)"""
+    db = SessionLocal()
+    try:
+        texts = [r.to_document_text() for r in db.query(NewsArticle).limit(count // 2).all()]
+        texts += [r.to_document_text() for r in db.query(Job).limit(count - len(texts)).all()]
+        return texts
+    finally:
+        db.close()
+
+
+def time_embeddings(model, texts: List[str]) -> tuple:
+    """Embed texts once after a short warm-up, returning (vectors, docs/sec)"""
+    model.get_text_embedding_batch(texts[:8])
+    start = time.perf_counter()
+    vectors = model.get_text_embedding_batch(texts)
+    elapsed = time.perf_counter() - start
+    return vectors, len(texts) / elapsed
+
+
+def cosine_agreement(reference: List[List[float]], vectors: List[List[float]]) -> tuple:
+    """Mean and minimum cosine similarity between paired vectors"""
+    cosines = [
+        sum(a * b for a, b in zip(l2_normalize(ref), l2_normalize(vec)))
+        for ref, vec in zip(reference, vectors)
+    ]
+    return sum(cosines) / len(cosines), min(cosines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local embedding backends")
+    parser.add_argument("--model", default=settings.local_embedding_model, help="HuggingFace model id")
+    parser.add_argument("--docs", type=int, default=500, help="Number of records to embed")
+    parser.add_argument("--batch-size", type=int, default=settings.local_embedding_batch_size)
+    parser.add_argument("--threads", type=int, default=settings.local_embedding_threads,
+                        help="ONNX Runtime threads (0 = all cores)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Also benchmark a multi-process pool with this many workers (0 = one per core)")
+    args = parser.parse_args()
+
+    texts = sample_texts(args.docs)
+    if not texts:
+        print("No records found to embed")
+        return
+
+    from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+    backends = [
+        ("PyTorch fp32", lambda: HuggingFaceEmbedding(model_name=args.model, embed_batch_size=args.batch_size)),
+        ("ONNX fp32", lambda: OnnxEmbedding(
+            model_name=args.model,
+            quantize=False,
+            cache_dir=settings.local_embedding_cache_dir or None,
+            num_threads=args.threads,
+            embed_batch_size=args.batch_size,
+        )),
+        ("ONNX int8", lambda: OnnxEmbedding(
+            model_name=args.model,
+            quantize=True,
+            cache_dir=settings.local_embedding_cache_dir or None,
+            num_threads=args.threads,
+            embed_batch_size=args.batch_size,
+        )),
+    ]
+    if args.workers != 1:
+        backends.append((f"PyTorch x{args.workers or 'cpu'}", lambda: MultiProcessEmbedding(
+            model_name=args.model,
+            num_workers=args.workers,
+        )))
+
+    results = []
+    reference = None
+    for name, build in backends:
+        print(f"Embedding {len(texts)} docs with {name}...")
+        vectors, docs_per_sec = time_embeddings(build(), texts)
+        if reference is None:
+            reference = vectors
+        results.append((name, docs_per_sec, *cosine_agreement(reference, vectors)))
+
+    print("\n" + "=" * 60)
+    print(f"LOCAL EMBEDDING BENCHMARK - {args.model}")
+    print("=" * 60)
+    print(f"Docs: {len(texts)} | Batch size: {args.batch_size} | Threads: {args.threads or 'all'}")
+    print(f"\n{'':<14}{'docs/sec':>10}{'speedup':>10}{'mean cos':>10}{'min cos':>10}")
+    baseline = results[0][1]
+    for name, docs_per_sec, mean_cos, min_cos in results:
+        print(f"{name:<14}{docs_per_sec:>10.1f}{docs_per_sec / baseline:>9.1f}x{mean_cos:>10.4f}{min_cos:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: Tamil-aware vs default sentence splitting on news articles
+
+Chunks a sample of news_articles with LlamaIndex's default SentenceSplitter and
+with the Tamil-aware splitter, measuring every chunk with the embedding
+model's tokenizer. Reports chunk counts, token counts, overlap overhead and
+time per 1,000 articles.
+
+Usage:
+    python benchmark_news_chunking.py --articles 1000
+"""
+import argparse
+import logging
+import time
+from typing import Callable, Dict, List
+
+from llama_index.core import Document
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import MetadataMode
+
+from config import settings
+from embeddings import PROVIDER_TOKEN_LIMITS, load_token_codec
+from indexer import BaseIndexer
+from models import NewsArticle, SessionLocal
+from tamil_splitter import tamil_sentence_splitter
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def sample_documents(count: int) -> List[Document]:
+    """Load the most recent news articles as Documents"""
+    db = SessionLocal()
+    try:
+        records = db.query(NewsArticle).order_by(NewsArticle.id.desc()).limit(count).all()
+        return [
+            Document(text=r.to_document_text(), metadata=r.to_metadata(), id_=str(r.id))
+            for r in records
+        ]
+    finally:
+        db.close()
+
+
+def measure(splitter: SentenceSplitter, documents: List[Document], encode: Callable, max_input: int) -> Dict:
+    """Chunk the documents and count embedded tokens per chunk"""
+    start = time.perf_counter()
+    nodes = splitter.get_nodes_from_documents(documents)
+    elapsed = time.perf_counter() - start
+
+    chunk_tokens = [len(encode(node.get_content(metadata_mode=MetadataMode.EMBED))) for node in nodes]
+    source_tokens = sum(len(encode(doc.text)) for doc in documents)
+
+    return {
+        "chunks": len(nodes),
+        "tokens": sum(chunk_tokens),
+        "mean": sum(chunk_tokens) / max(len(chunk_tokens), 1),
+        "max": max(chunk_tokens, default=0),
+        "over_limit": sum(1 for t in chunk_tokens if t > max_input),
+        "overhead": (sum(chunk_tokens) - source_tokens) / max(source_tokens, 1),
+        "seconds_per_1k": elapsed / max(len(documents), 1) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare news chunking strategies")
+    parser.add_argument("--articles", type=int, default=1000, help="Number of articles to chunk")
+    parser.add_argument("--chunk-size", type=int, default=settings.news_chunk_size)
+    parser.add_argument("--chunk-overlap", type=int, default=settings.news_chunk_overlap)
+    args = parser.parse_args()
+
+    documents = sample_documents(args.articles)
+    if not documents:
+        print("No news articles found")
+        return
+
+    model_name = BaseIndexer._embedding_model_name()
+    encode, _ = load_token_codec(settings.embedding_provider, model_name)
+    max_input = PROVIDER_TOKEN_LIMITS[settings.embedding_provider][0]
+
+    options = dict(
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        paragraph_separator="\n\n",
+        include_metadata=True,
+        include_prev_next_rel=True,
+    )
+    splitters = [
+        ("Default", SentenceSplitter.from_defaults(**options)),
+        ("Tamil-aware", tamil_sentence_splitter(tokenizer=encode, **options)),
+    ]
+
+    print("\n" + "=" * 60)
+    print(f"NEWS CHUNKING BENCHMARK - {len(documents)} articles")
+    print("=" * 60)
+    print(f"Chunk size: {args.chunk_size} | Overlap: {args.chunk_overlap} | Tokenizer: {model_name}")
+    print(f"\n{'':<13}{'chunks':>8}{'tokens':>10}{'mean':>7}{'max':>6}{'>limit':>8}{'overhead':>10}{'s/1k':>7}")
+    for name, splitter in splitters:
+        r = measure(splitter, documents, encode, max_input)
+        print(
+            f"{name:<13}{r['chunks']:>8}{r['tokens']:>10}{r['mean']:>7.0f}{r['max']:>6}"
+            f"{r['over_limit']:>8}{r['overhead']:>9.1%}{r['seconds_per_1k']:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -32,7 +32,7 @@ class Settings(BaseSettings):
     openai_api_key: str = Field(default="", alias="OPENAI_API_KEY")
     
     # Embedding Configuration
-    embedding_provider: Literal["azure", "openai", "local"] = Field(
+    embedding_provider: Literal["azure", "openai", "local", "server"] = Field(
         default="azure", 
         alias="EMBEDDING_PROVIDER"
     )
@@ -44,10 +44,51 @@ class Settings(BaseSettings):
         default="BAAI/bge-small-en-v1.5",
         alias="LOCAL_EMBEDDING_MODEL"
     )
+    # huggingface = PyTorch eager; onnx = ONNX Runtime export (optionally int8-quantized)
+    local_embedding_backend: Literal["huggingface", "onnx"] = Field(
+        default="huggingface",
+        alias="LOCAL_EMBEDDING_BACKEND"
+    )
+    local_embedding_quantize: bool = Field(default=False, alias="LOCAL_EMBEDDING_QUANTIZE")
+    local_embedding_threads: int = Field(default=0, alias="LOCAL_EMBEDDING_THREADS")  # 0 = all cores
+    local_embedding_batch_size: int = Field(default=256, alias="LOCAL_EMBEDDING_BATCH_SIZE")
+    local_embedding_cache_dir: str = Field(default="", alias="LOCAL_EMBEDDING_CACHE_DIR")
+    local_embedding_workers: int = Field(default=1, alias="LOCAL_EMBEDDING_WORKERS")  # 1 = in-process, 0 = one per core
+    
+    # Shared embedding server (embedding_server.py, EMBEDDING_PROVIDER=server)
+    embedding_server_url: str = Field(default="http://127.0.0.1:8765", alias="EMBEDDING_SERVER_URL")
+    embedding_server_max_batch_size: int = Field(default=64, alias="EMBEDDING_SERVER_MAX_BATCH_SIZE")
+    embedding_server_max_wait_ms: float = Field(default=5.0, alias="EMBEDDING_SERVER_MAX_WAIT_MS")
+    embedding_server_query_instruction: str = Field(default="", alias="EMBEDDING_SERVER_QUERY_INSTRUCTION")
+    
+    # Token-aware embedding batching (pack requests by token count; 0 = provider default limit)
+    embedding_token_batching: bool = Field(default=False, alias="EMBEDDING_TOKEN_BATCHING")
+    embedding_max_input_tokens: int = Field(default=0, alias="EMBEDDING_MAX_INPUT_TOKENS")
+    embedding_max_request_tokens: int = Field(default=0, alias="EMBEDDING_MAX_REQUEST_TOKENS")
+    embedding_max_request_inputs: int = Field(default=0, alias="EMBEDDING_MAX_REQUEST_INPUTS")
+    embedding_split_oversized: bool = Field(default=True, alias="EMBEDDING_SPLIT_OVERSIZED")
+    
+    # Dry-run estimates (0 price = built-in list price for known models; 0 rate = unlimited)
+    embedding_price_per_million_tokens: float = Field(default=0.0, alias="EMBEDDING_PRICE_PER_MILLION_TOKENS")
+    embedding_tokens_per_minute: int = Field(default=350_000, alias="EMBEDDING_TOKENS_PER_MINUTE")
+    embedding_requests_per_minute: int = Field(default=2_100, alias="EMBEDDING_REQUESTS_PER_MINUTE")
     
     # LlamaIndex Configuration
     chunk_size: int = Field(default=1024, alias="CHUNK_SIZE")
     chunk_overlap: int = Field(default=200, alias="CHUNK_OVERLAP")
+    news_chunk_size: int = Field(default=512, alias="NEWS_CHUNK_SIZE")
+    news_chunk_overlap: int = Field(default=50, alias="NEWS_CHUNK_OVERLAP")
+    # tamil = Unicode sentence boundaries + embedding-model token counts (tamil_splitter.py)
+    news_sentence_splitter: Literal["default", "tamil"] = Field(default="default", alias="NEWS_SENTENCE_SPLITTER")
+    
+    # Ingestion pipeline: transformation cache and docstore dedupe (both in Postgres, opt-in)
+    ingestion_cache: bool = Field(default=False, alias="INGESTION_CACHE")
+    ingestion_dedupe: bool = Field(default=False, alias="INGESTION_DEDUPE")
+    
+    # Deferred LLM metadata enrichment (title/keyword extraction after vectors are written)
+    enrichment_after_indexing: bool = Field(default=False, alias="ENRICHMENT_AFTER_INDEXING")
+    enrichment_concurrency: int = Field(default=8, alias="ENRICHMENT_CONCURRENCY")
+    enrichment_batch_size: int = Field(default=200, alias="ENRICHMENT_BATCH_SIZE")
     
     # PgVector Configuration
     vector_dimension: int = Field(default=384, alias="VECTOR_DIMENSION")
@@ -70,7 +111,36 @@ class Settings(BaseSettings):
     similarity_top_k: int = Field(default=10, alias="SIMILARITY_TOP_K")
     
     # PgVector Advanced
-    vector_distance_metric: str = Field(default="cosine", alias="VECTOR_DISTANCE_METRIC")
+    # inner_product stores L2-normalized vectors and ranks with <#> (same ranking as cosine, cheaper);
+    # opt-in: run migration 003 first so existing vectors are normalized
+    vector_distance_metric: Literal["cosine", "l2", "inner_product"] = Field(
+        default="cosine",
+        alias="VECTOR_DISTANCE_METRIC"
+    )
+    
+    # Hybrid Search (tsvector column maintained at index time + RRF with vector results)
+    hybrid_search: bool = Field(default=False, alias="HYBRID_SEARCH")
+    text_search_config: str = Field(default="tamil_english", alias="TEXT_SEARCH_CONFIG")
+    hybrid_rrf_k: int = Field(default=60, alias="HYBRID_RRF_K")
+    
+    # Binary Quantization (Hamming-index candidate pass + full-precision rerank)
+    binary_quantization: bool = Field(default=False, alias="BINARY_QUANTIZATION")
+    binary_rerank_candidates: int = Field(default=100, alias="BINARY_RERANK_CANDIDATES")
+    
+    # News Partitioning (one vector collection per month of scraped_date)
+    news_partition_by_month: bool = Field(default=False, alias="NEWS_PARTITION_BY_MONTH")
+    news_retention_months: int = Field(default=0, alias="NEWS_RETENTION_MONTHS")  # 0 = keep all
+    news_retention_action: Literal["archive", "drop"] = Field(
+        default="archive",
+        alias="NEWS_RETENTION_ACTION"
+    )
+    news_archive_schema: str = Field(default="archive", alias="NEWS_ARCHIVE_SCHEMA")
+    
+    # News near-duplicate suppression (MinHash + LSH; only canonical articles are embedded)
+    news_near_duplicates: bool = Field(default=False, alias="NEWS_NEAR_DUPLICATES")
+    news_duplicate_threshold: float = Field(default=0.8, alias="NEWS_DUPLICATE_THRESHOLD")
+    news_minhash_permutations: int = Field(default=128, alias="NEWS_MINHASH_PERMUTATIONS")
+    news_minhash_band_rows: int = Field(default=8, alias="NEWS_MINHASH_BAND_ROWS")
     
     # Indexing Advanced
     index_batch_size: int = Field(default=100, alias="INDEX_BATCH_SIZE")
@@ -0,0 +1,241 @@
+"""
+Shared local embedding server with dynamic micro-batching
+
+Loads the local embedding model once per host and serves it over localhost
+HTTP. Concurrent requests from indexers and portal workers are merged into
+micro-batches: the batcher takes the first waiting request, then keeps
+collecting until max_batch_size texts are queued or max_wait_ms has passed.
+Requests with more texts than max_batch_size are split into several batches.
+
+Clients use embeddings.RemoteEmbedding (EMBEDDING_PROVIDER=server).
+
+Usage:
+    python embedding_server.py
+    python embedding_server.py --port 8765 --max-batch-size 64 --max-wait-ms 5
+"""
+import argparse
+import json
+import logging
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import urlparse
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+
+from config import settings
+from embeddings import create_local_embedding
+
+logging.basicConfig(level=settings.log_level)
+logger = logging.getLogger(__name__)
+
+
+class _PendingRequest:
+    """One client request waiting in the batch queue"""
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.embeddings: Optional[List[List[float]]] = None
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+
+
+class MicroBatcher:
+    """Merge concurrent embedding requests into batches for a single model"""
+
+    def __init__(
+        self,
+        model: BaseEmbedding,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        query_instruction: str = ""
+    ):
+        """
+        Args:
+            model: Embedding model owned by the server
+            max_batch_size: Texts that close a batch early
+            max_wait_ms: Longest time the first request waits for others
+            query_instruction: Prefix added to query texts
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.query_instruction = query_instruction
+        self._stats = {"requests": 0, "texts": 0, "batches": 0}
+        self._stats_lock = threading.Lock()
+        self._queue: "queue.Queue[_PendingRequest]" = queue.Queue()
+        # Request that would have overflowed the previous batch
+        self._carry: Optional[_PendingRequest] = None
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def embed(self, texts: List[str], query: bool = False) -> List[List[float]]:
+        """Queue texts for the next batch and block until they are embedded"""
+        if query and self.query_instruction:
+            texts = [self.query_instruction + t for t in texts]
+
+        # Never more than max_batch_size texts per queued request
+        parts = [
+            _PendingRequest(texts[start:start + self.max_batch_size])
+            for start in range(0, len(texts), self.max_batch_size)
+        ]
+        for pending in parts:
+            self._queue.put(pending)
+
+        embeddings: List[List[float]] = []
+        for pending in parts:
+            pending.done.wait()
+            if pending.error:
+                raise pending.error
+            embeddings.extend(pending.embeddings)
+        with self._stats_lock:
+            self._stats["requests"] += 1
+        return embeddings
+
+    @property
+    def stats(self) -> dict:
+        """Requests served, texts embedded and batches run so far"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _collect(self) -> List[_PendingRequest]:
+        """Block for one request, then gather more until the batch is full or the wait expires"""
+        if self._carry is not None:
+            batch, self._carry = [self._carry], None
+        else:
+            batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if size + len(pending.texts) > self.max_batch_size:
+                # Starts the next batch instead
+                self._carry = pending
+                break
+            batch.append(pending)
+            size += len(pending.texts)
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [t for pending in batch for t in pending.texts]
+
+            try:
+                embeddings = self.model.get_text_embedding_batch(texts)
+            except Exception as e:
+                logger.error(f"Embedding batch of {len(texts)} texts failed: {e}")
+                for pending in batch:
+                    pending.error = e
+                    pending.done.set()
+                continue
+
+            offset = 0
+            for pending in batch:
+                pending.embeddings = embeddings[offset:offset + len(pending.texts)]
+                offset += len(pending.texts)
+                pending.done.set()
+
+            with self._stats_lock:
+                self._stats["texts"] += len(texts)
+                self._stats["batches"] += 1
+
+
+def make_handler(batcher: MicroBatcher):
+    """Build the HTTP request handler bound to a batcher"""
+
+    class EmbeddingHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, body: dict):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path != "/health":
+                self._send_json(404, {"error": "not found"})
+                return
+            self._send_json(200, {"status": "ok", "model": batcher.model.model_name, **batcher.stats})
+
+        def do_POST(self):
+            if self.path != "/embed":
+                self._send_json(404, {"error": "not found"})
+                return
+
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                texts = body["texts"]
+                if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                    raise ValueError("texts must be a list of strings")
+            except (ValueError, KeyError) as e:
+                self._send_json(400, {"error": f"Invalid request: {e}"})
+                return
+
+            try:
+                embeddings = batcher.embed(texts, query=bool(body.get("query")))
+            except Exception as e:
+                self._send_json(500, {"error": str(e)})
+                return
+
+            self._send_json(200, {"embeddings": embeddings})
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return EmbeddingHandler
+
+
+def main():
+    url = urlparse(settings.embedding_server_url)
+
+    parser = argparse.ArgumentParser(description="Shared local embedding server")
+    parser.add_argument("--host", default=url.hostname or "127.0.0.1")
+    parser.add_argument("--port", type=int, default=url.port or 8765)
+    parser.add_argument("--max-batch-size", type=int, default=settings.embedding_server_max_batch_size)
+    parser.add_argument("--max-wait-ms", type=float, default=settings.embedding_server_max_wait_ms)
+    args = parser.parse_args()
+
+    model = create_local_embedding(
+        model_name=settings.local_embedding_model,
+        backend=settings.local_embedding_backend,
+        quantize=settings.local_embedding_quantize,
+        cache_dir=settings.local_embedding_cache_dir or None,
+        num_threads=settings.local_embedding_threads,
+        embed_batch_size=settings.local_embedding_batch_size,
+        num_workers=settings.local_embedding_workers,
+    )
+    batcher = MicroBatcher(
+        model,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        query_instruction=settings.embedding_server_query_instruction,
+    )
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(batcher))
+    logger.info(
+        f"Embedding server ({settings.local_embedding_model}) on http://{args.host}:{args.port} "
+        f"- max batch {args.max_batch_size}, max wait {args.max_wait_ms}ms"
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down embedding server")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,615 @@
+"""
+Embedding model wrappers used by the indexer and the portal
+"""
+import atexit
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.bridge.pydantic import Field, PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+
+def l2_normalize(vector: List[float]) -> List[float]:
+    """Scale a vector to unit length (zero vectors are returned unchanged)"""
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return vector
+    return [x / norm for x in vector]
+
+
+class NormalizedEmbedding(BaseEmbedding):
+    """
+    Wrap an embedding model so every vector it returns is L2-normalized
+
+    With unit vectors, inner product equals cosine similarity, so pgvector can
+    rank with <#> and skip the per-row norm computation cosine distance needs.
+    """
+
+    _base: BaseEmbedding = PrivateAttr()
+
+    def __init__(self, base_embedding: BaseEmbedding, **kwargs):
+        super().__init__(
+            model_name=base_embedding.model_name,
+            embed_batch_size=base_embedding.embed_batch_size,
+            **kwargs
+        )
+        self._base = base_embedding
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "NormalizedEmbedding"
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return l2_normalize(self._base._get_query_embedding(query))
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return l2_normalize(await self._base._aget_query_embedding(query))
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return l2_normalize(self._base._get_text_embedding(text))
+
+    async def _aget_text_embedding(self, text: str) -> List[float]:
+        return l2_normalize(await self._base._aget_text_embedding(text))
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return [l2_normalize(e) for e in self._base._get_text_embeddings(texts)]
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return [l2_normalize(e) for e in await self._base._aget_text_embeddings(texts)]
+
+
+class OnnxEmbedding(BaseEmbedding):
+    """
+    Local HuggingFace embedding model running on ONNX Runtime (CPU)
+
+    The model is exported to ONNX once (and optionally dynamically quantized to
+    int8) into a cache directory. Texts are tokenized once, sorted by length and
+    packed into batches under a token budget, so short texts run in large
+    batches, long texts in small ones, and padding stays minimal. The runtime
+    uses all cores unless num_threads is set.
+    """
+
+    max_length: int = Field(default=512, description="Maximum tokens per text")
+    max_batch_tokens: int = Field(default=16384, description="Padded token budget per model call")
+    pooling: str = Field(default="cls", description="'cls' (BGE) or 'mean' pooling")
+    quantize: bool = Field(default=False, description="Use the int8 dynamically quantized model")
+
+    _model: Any = PrivateAttr()
+    _tokenizer: Any = PrivateAttr()
+
+    def __init__(
+        self,
+        model_name: str,
+        quantize: bool = False,
+        cache_dir: Optional[str] = None,
+        num_threads: int = 0,
+        embed_batch_size: int = 256,
+        **kwargs
+    ):
+        """
+        Args:
+            model_name: HuggingFace model id (e.g. BAAI/bge-small-en-v1.5)
+            quantize: Run the int8 dynamically quantized model
+            cache_dir: Where exported ONNX models are kept (default ~/.cache/digitalgrub/onnx)
+            num_threads: ONNX Runtime intra-op threads (0 = all cores)
+            embed_batch_size: Texts handed to each bucketing pass
+        """
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+
+        super().__init__(
+            model_name=model_name,
+            embed_batch_size=embed_batch_size,
+            quantize=quantize,
+            **kwargs
+        )
+
+        model_dir = self._export(model_name, quantize, cache_dir)
+
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = num_threads or os.cpu_count() or 1
+        session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self._tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self._model = ORTModelForFeatureExtraction.from_pretrained(
+            model_dir,
+            file_name="model_quantized.onnx" if quantize else "model.onnx",
+            session_options=session_options,
+            provider="CPUExecutionProvider",
+        )
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "OnnxEmbedding"
+
+    @staticmethod
+    def _export(model_name: str, quantize: bool, cache_dir: Optional[str]) -> Path:
+        """Export (and optionally quantize) the model once, returning its directory"""
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        base_dir = Path(cache_dir or Path.home() / ".cache" / "digitalgrub" / "onnx") / model_name.replace("/", "__")
+        fp32_dir = base_dir / "fp32"
+        int8_dir = base_dir / "int8"
+
+        if not (fp32_dir / "model.onnx").exists():
+            logger.info(f"Exporting {model_name} to ONNX: {fp32_dir}")
+            ORTModelForFeatureExtraction.from_pretrained(model_name, export=True).save_pretrained(fp32_dir)
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(fp32_dir)
+
+        if not quantize:
+            return fp32_dir
+
+        if not (int8_dir / "model_quantized.onnx").exists():
+            logger.info(f"Quantizing {model_name} to int8: {int8_dir}")
+            quantizer = ORTQuantizer.from_pretrained(fp32_dir)
+            quantizer.quantize(
+                save_dir=int8_dir,
+                quantization_config=AutoQuantizationConfig.avx2(is_static=False, per_channel=False),
+            )
+            AutoTokenizer.from_pretrained(fp32_dir).save_pretrained(int8_dir)
+
+        return int8_dir
+
+    def _length_buckets(self, lengths: List[int]) -> List[List[int]]:
+        """Group text indices (shortest first) into batches under the padded token budget"""
+        batches = []
+        batch: List[int] = []
+        for i in sorted(range(len(lengths)), key=lengths.__getitem__):
+            # Sorted ascending, so the current text sets the padded length
+            if batch and (len(batch) + 1) * lengths[i] > self.max_batch_tokens:
+                batches.append(batch)
+                batch = []
+            batch.append(i)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        import numpy as np
+
+        encoded = self._tokenizer(texts, truncation=True, max_length=self.max_length)
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+        embeddings: List[List[float]] = [[] for _ in texts]
+
+        for batch in self._length_buckets(lengths):
+            features = self._tokenizer.pad(
+                [{key: values[i] for key, values in encoded.items()} for i in batch],
+                padding=True,
+                return_tensors="np",
+            )
+            hidden = self._model(**features).last_hidden_state
+
+            if self.pooling == "mean":
+                mask = features["attention_mask"][..., None].astype(hidden.dtype)
+                pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            else:
+                pooled = hidden[:, 0]
+
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            for row, i in enumerate(batch):
+                embeddings[i] = pooled[row].tolist()
+
+        return embeddings
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._embed([query])[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._embed([text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts)
+
+
+# Model loaded once per pool worker process (see MultiProcessEmbedding)
+_worker_model: Optional[BaseEmbedding] = None
+
+
+def _init_embedding_worker(backend: str, model_name: str, num_threads: int, options: dict) -> None:
+    """Pool initializer: load the local model once in this worker"""
+    global _worker_model
+    if backend == "onnx":
+        _worker_model = OnnxEmbedding(model_name=model_name, num_threads=num_threads, **options)
+    else:
+        import torch
+        from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+        # Keep workers from oversubscribing the cores between them
+        torch.set_num_threads(num_threads)
+        _worker_model = HuggingFaceEmbedding(model_name=model_name, **options)
+
+
+def _embed_texts_in_worker(texts: List[str]) -> List[List[float]]:
+    return _worker_model.get_text_embedding_batch(texts)
+
+
+def _embed_query_in_worker(query: str) -> List[float]:
+    return _worker_model.get_query_embedding(query)
+
+
+class MultiProcessEmbedding(BaseEmbedding):
+    """
+    Local embedding model sharded across a pool of worker processes
+
+    Each worker loads the model once and gets an equal share of the cores.
+    Text batches are split into shards that run in parallel, and results are
+    returned in input order.
+    """
+
+    shard_size: int = Field(default=64, description="Texts per worker task")
+
+    _executor: Any = PrivateAttr()
+
+    def __init__(
+        self,
+        model_name: str,
+        backend: str = "huggingface",
+        num_workers: int = 0,
+        shard_size: int = 64,
+        model_options: Optional[dict] = None,
+        **kwargs
+    ):
+        """
+        Args:
+            model_name: HuggingFace model id
+            backend: 'huggingface' or 'onnx' model in each worker
+            num_workers: Worker processes (0 = one per core)
+            shard_size: Texts sent to a worker per task
+            model_options: Extra keyword arguments for the worker model
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        cpu_count = os.cpu_count() or 1
+        num_workers = num_workers or cpu_count
+
+        super().__init__(
+            model_name=model_name,
+            embed_batch_size=shard_size * num_workers,
+            shard_size=shard_size,
+            **kwargs
+        )
+
+        logger.info(f"Starting {num_workers} embedding workers ({backend}: {model_name})")
+        # spawn: forked workers can deadlock on torch / tokenizer thread pools
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_embedding_worker,
+            initargs=(backend, model_name, max(1, cpu_count // num_workers), model_options or {}),
+        )
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "MultiProcessEmbedding"
+
+    def close(self) -> None:
+        """Stop the worker processes"""
+        self._executor.shutdown(wait=True)
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._executor.submit(_embed_query_in_worker, query).result()
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        import asyncio
+
+        return await asyncio.wrap_future(self._executor.submit(_embed_query_in_worker, query))
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embeddings([text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        shards = [texts[i:i + self.shard_size] for i in range(0, len(texts), self.shard_size)]
+        embeddings: List[List[float]] = []
+        # map() yields shard results in submission order
+        for shard_embeddings in self._executor.map(_embed_texts_in_worker, shards):
+            embeddings.extend(shard_embeddings)
+        return embeddings
+
+
+class RemoteEmbedding(BaseEmbedding):
+    """
+    Client for the shared local embedding server (embedding_server.py)
+
+    The server owns the only copy of the model on the host and merges
+    concurrent requests from indexers and portal workers into micro-batches.
+    """
+
+    base_url: str = Field(default="http://127.0.0.1:8765", description="Embedding server URL")
+    timeout: float = Field(default=60.0, description="Request timeout in seconds")
+
+    def __init__(self, base_url: str = "http://127.0.0.1:8765", embed_batch_size: int = 64, **kwargs):
+        super().__init__(
+            model_name=f"remote:{base_url}",
+            base_url=base_url.rstrip("/"),
+            embed_batch_size=embed_batch_size,
+            **kwargs
+        )
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "RemoteEmbedding"
+
+    def _post(self, texts: List[str], query: bool = False) -> List[List[float]]:
+        import json
+        import urllib.request
+
+        request = urllib.request.Request(
+            f"{self.base_url}/embed",
+            data=json.dumps({"texts": texts, "query": query}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read())["embeddings"]
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._post([query], query=True)[0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        import asyncio
+
+        return (await asyncio.to_thread(self._post, [query], True))[0]
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._post([text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._post(texts)
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        import asyncio
+
+        return await asyncio.to_thread(self._post, texts)
+
+
+# One worker pool per model configuration per process: every indexer calls
+# create_local_embedding, and each pool holds a full model copy per worker
+_shared_pools: Dict[Tuple[str, str, int, str], MultiProcessEmbedding] = {}
+
+
+def _close_shared_pools() -> None:
+    """Stop the cached worker pools (registered with atexit)"""
+    for model in _shared_pools.values():
+        model.close()
+    _shared_pools.clear()
+
+
+def create_local_embedding(
+    model_name: str,
+    backend: str = "huggingface",
+    quantize: bool = False,
+    cache_dir: Optional[str] = None,
+    num_threads: int = 0,
+    embed_batch_size: int = 256,
+    num_workers: int = 1
+) -> BaseEmbedding:
+    """
+    Build a local embedding model
+
+    Args:
+        model_name: HuggingFace model id
+        backend: 'huggingface' (PyTorch) or 'onnx' (ONNX Runtime)
+        quantize: Use the int8 ONNX model
+        cache_dir: ONNX export cache directory
+        num_threads: ONNX Runtime threads (0 = all cores)
+        embed_batch_size: Texts per embedding call
+        num_workers: Worker processes (1 = in-process, 0 = one per core)
+
+    Returns:
+        Embedding model (falls back to HuggingFace if ONNX Runtime is missing).
+        Multi-process models are shared by all callers with the same settings.
+    """
+    if num_workers != 1:
+        # Shard batches across worker processes, one model copy per worker
+        if backend == "onnx":
+            model_options = {"quantize": quantize, "cache_dir": cache_dir}
+        else:
+            model_options = {}
+        key = (model_name, backend, num_workers, repr(sorted(model_options.items())))
+        if key not in _shared_pools:
+            if not _shared_pools:
+                atexit.register(_close_shared_pools)
+            _shared_pools[key] = MultiProcessEmbedding(
+                model_name=model_name,
+                backend=backend,
+                num_workers=num_workers,
+                model_options=model_options,
+            )
+        return _shared_pools[key]
+
+    if backend == "onnx":
+        try:
+            return OnnxEmbedding(
+                model_name=model_name,
+                quantize=quantize,
+                cache_dir=cache_dir,
+                num_threads=num_threads,
+                embed_batch_size=embed_batch_size,
+            )
+        except ImportError as e:
+            logger.warning(f"ONNX Runtime backend unavailable ({e}), falling back to HuggingFace")
+
+    from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+    return HuggingFaceEmbedding(model_name=model_name, embed_batch_size=embed_batch_size)
+
+
+# Per-provider (max tokens per input, max tokens per request, max inputs per request)
+PROVIDER_TOKEN_LIMITS = {
+    "azure": (8191, 250_000, 2048),
+    "openai": (8191, 250_000, 2048),
+    "local": (510, 16_384, 256),   # 512 minus [CLS]/[SEP]
+    "server": (510, 16_384, 256),
+}
+
+
+def load_token_codec(provider: str, model_name: str) -> Tuple[Callable[[str], List[int]], Callable[[List[int]], str]]:
+    """
+    Get (encode, decode) functions for the tokenizer an embedding model uses
+
+    Args:
+        provider: 'azure', 'openai', 'local' or 'server'
+        model_name: Embedding model (OpenAI model / Azure deployment or HuggingFace id)
+    """
+    if provider in ("azure", "openai"):
+        import tiktoken
+
+        try:
+            encoding = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            # Azure deployment names are arbitrary; all OpenAI embedding models use cl100k_base
+            encoding = tiktoken.get_encoding("cl100k_base")
+        return encoding.encode, encoding.decode
+
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    return (
+        lambda text: tokenizer.encode(text, add_special_tokens=False),
+        lambda tokens: tokenizer.decode(tokens),
+    )
+
+
+class TokenBudgetEmbedding(BaseEmbedding):
+    """
+    Pack embedding requests by token count instead of input count
+
+    Inputs longer than the model limit are split into pieces whose embeddings
+    are averaged (weighted by token count), or truncated. The remaining inputs
+    are packed in order into requests that stay under the per-request token
+    and input limits, so no request fails on length and each is filled close
+    to its limit.
+    """
+
+    max_input_tokens: int = Field(description="Longest single input the model accepts")
+    max_request_tokens: int = Field(description="Token budget per embedding request")
+    max_request_inputs: int = Field(description="Maximum inputs per embedding request")
+    split_oversized: bool = Field(default=True, description="Split (True) or truncate (False) long inputs")
+
+    _base: BaseEmbedding = PrivateAttr()
+    _encode: Callable[[str], List[int]] = PrivateAttr()
+    _decode: Callable[[List[int]], str] = PrivateAttr()
+
+    def __init__(
+        self,
+        base_embedding: BaseEmbedding,
+        encode: Callable[[str], List[int]],
+        decode: Callable[[List[int]], str],
+        max_input_tokens: int,
+        max_request_tokens: int,
+        max_request_inputs: int,
+        split_oversized: bool = True,
+        **kwargs
+    ):
+        super().__init__(
+            model_name=base_embedding.model_name,
+            # Hand whole node batches to _get_text_embeddings; packing happens there
+            embed_batch_size=max(base_embedding.embed_batch_size, 2048),
+            max_input_tokens=max_input_tokens,
+            max_request_tokens=max_request_tokens,
+            max_request_inputs=max_request_inputs,
+            split_oversized=split_oversized,
+            **kwargs
+        )
+        self._base = base_embedding
+        self._encode = encode
+        self._decode = decode
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "TokenBudgetEmbedding"
+
+    def _fit(self, text: str) -> List[Tuple[str, int]]:
+        """Cut a text into (piece, token count) pieces that fit the input limit"""
+        tokens = self._encode(text)
+        if len(tokens) <= self.max_input_tokens:
+            return [(text, len(tokens))]
+        if not self.split_oversized:
+            return [(self._decode(tokens[:self.max_input_tokens]), self.max_input_tokens)]
+        return [
+            (self._decode(tokens[i:i + self.max_input_tokens]), len(tokens[i:i + self.max_input_tokens]))
+            for i in range(0, len(tokens), self.max_input_tokens)
+        ]
+
+    def _plan(self, texts: List[str]) -> Tuple[List[List[str]], List[List[Tuple[int, int]]]]:
+        """
+        Pack texts into requests
+
+        Returns:
+            (requests, owners) where requests are lists of input pieces and
+            owners[i] lists (piece index, token count) for texts[i] across the
+            flattened pieces
+        """
+        requests: List[List[str]] = [[]]
+        request_tokens = 0
+        owners: List[List[Tuple[int, int]]] = []
+        piece_index = 0
+
+        for text in texts:
+            pieces = []
+            for piece, token_count in self._fit(text):
+                if requests[-1] and (
+                    request_tokens + token_count > self.max_request_tokens
+                    or len(requests[-1]) >= self.max_request_inputs
+                ):
+                    requests.append([])
+                    request_tokens = 0
+                requests[-1].append(piece)
+                request_tokens += token_count
+                pieces.append((piece_index, token_count))
+                piece_index += 1
+            owners.append(pieces)
+
+        requests = [request for request in requests if request]
+        logger.debug(f"Packed {len(texts)} inputs into {len(requests)} embedding requests")
+        return requests, owners
+
+    @staticmethod
+    def _combine(embeddings: List[List[float]], owners: List[List[Tuple[int, int]]]) -> List[List[float]]:
+        """Map piece embeddings back to inputs, averaging split inputs by token count"""
+        combined = []
+        for pieces in owners:
+            if len(pieces) == 1:
+                combined.append(embeddings[pieces[0][0]])
+                continue
+            total = sum(count for _, count in pieces) or 1
+            dim = len(embeddings[pieces[0][0]])
+            combined.append([
+                sum(embeddings[index][d] * count for index, count in pieces) / total
+                for d in range(dim)
+            ])
+        return combined
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        return self._base._get_query_embedding(self._fit(query)[0][0])
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return await self._base._aget_query_embedding(self._fit(query)[0][0])
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embeddings([text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        requests, owners = self._plan(texts)
+        embeddings: List[List[float]] = []
+        for request in requests:
+            embeddings.extend(self._base._get_text_embeddings(request))
+        return self._combine(embeddings, owners)
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        requests, owners = self._plan(texts)
+        embeddings: List[List[float]] = []
+        for request in requests:
+            embeddings.extend(await self._base._aget_text_embeddings(request))
+        return self._combine(embeddings, owners)
@@ -0,0 +1,40 @@
+"""
+Run the deferred LLM metadata enrichment pass over indexed news chunks
+
+Usage:
+    python enrich_metadata.py --titles --keywords
+    python enrich_metadata.py --keywords --limit 500
+"""
+import argparse
+import logging
+
+from indexer import NewsArticleIndexer
+
+logging.basicConfig(level=logging.INFO)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enrich stored news chunks with LLM-extracted metadata")
+    parser.add_argument("--titles", action="store_true", help="Generate a title for each chunk")
+    parser.add_argument("--keywords", action="store_true", help="Extract keywords for each chunk")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum chunks per collection")
+    args = parser.parse_args()
+
+    if not (args.titles or args.keywords):
+        parser.error("choose at least one of --titles / --keywords")
+
+    indexer = NewsArticleIndexer(use_title_extraction=args.titles, use_keyword_extraction=args.keywords)
+    results = indexer.enrich_metadata(limit=args.limit)
+
+    print("\n" + "=" * 60)
+    print("ENRICHMENT COMPLETE")
+    print("=" * 60)
+    for collection_name, stats in results.items():
+        print(f"\n{collection_name}:")
+        print(f"  ✓ Enriched: {stats['enriched']}")
+        print(f"  ⚠ Content filtered: {stats['content_filtered']}")
+        print(f"  ✗ Failed (will retry): {stats['failed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Deferred LLM metadata enrichment for vectors that are already stored
+
+Indexing writes and embeds chunks without LLM extractors, so new vectors are
+searchable straight away. This pass runs afterwards: it reads chunks that have
+not been enriched yet, runs the extractors concurrently (bounded), caches each
+chunk's result by content, and writes the new metadata back to metadata_ in place
+(both the top-level keys and the serialized node PGVectorStore reads back).
+A chunk rejected by the provider's content filter is marked and skipped from
+then on, without failing the rest of the batch. Pending chunks are found
+through a partial index on id (ensure_pending_index), which shrinks as chunks
+are enriched.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from llama_index.core.extractors import BaseExtractor
+from llama_index.core.schema import BaseNode
+from llama_index.core.storage.kvstore.types import BaseKVStore
+from llama_index.core.vector_stores.utils import node_to_metadata_dict
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from vector_store import node_from_row, vector_table, vector_table_name
+
+logger = logging.getLogger(__name__)
+
+ENRICHED_KEY = "enriched_at"
+ENRICHMENT_ERROR_KEY = "enrichment_error"
+CACHE_COLLECTION = "enrichment"
+
+PENDING_QUERY = """
+SELECT id, node_id, text, metadata_
+FROM {table}
+WHERE id > :after
+  AND (CAST(metadata_ AS jsonb) -> '{enriched_key}') IS NULL
+ORDER BY id
+LIMIT :batch_size
+"""
+
+
+def ensure_pending_index(conn, collection_name: str) -> None:
+    """Create the partial index PENDING_QUERY scans (ids of chunks not enriched yet) if missing"""
+    table = vector_table_name(collection_name)
+    conn.execute(text(
+        f'CREATE INDEX IF NOT EXISTS "{table}_enrichment_pending_idx" ON public."{table}" (id) '
+        f"WHERE (CAST(metadata_ AS jsonb) -> '{ENRICHED_KEY}') IS NULL"
+    ))
+
+
+def is_content_filter_error(error: Exception) -> bool:
+    """Whether an LLM error is a content-policy rejection (retrying will not help)"""
+    message = str(error).lower()
+    return "content_filter" in message or "responsibleaipolicyviolation" in message
+
+
+class MetadataEnricher:
+    """Run LLM extractors over stored chunks and update their metadata in place"""
+
+    def __init__(
+        self,
+        engine: Engine,
+        extractors: List[BaseExtractor],
+        concurrency: int = 8,
+        batch_size: int = 200,
+        cache: Optional[BaseKVStore] = None
+    ):
+        """
+        Args:
+            engine: SQLAlchemy engine for the vector database
+            extractors: Extractors to run on each chunk (e.g. TitleExtractor, KeywordExtractor)
+            concurrency: Maximum chunks being enriched at once
+            batch_size: Chunks read and updated per round
+            cache: Optional KV store caching extractor results by chunk content
+        """
+        self.engine = engine
+        self.extractors = extractors
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.cache = cache
+
+    def _cache_key(self, extractor: BaseExtractor, content: str) -> str:
+        """Cache key from the extractor configuration and the chunk text"""
+        config = json.dumps(extractor.to_dict(), sort_keys=True, default=str)
+        return hashlib.sha256(f"{config}\n{content}".encode("utf-8")).hexdigest()
+
+    async def _extract(self, extractor: BaseExtractor, node: BaseNode) -> Dict[str, Any]:
+        """Run one extractor on one chunk, using the cache when available"""
+        key = self._cache_key(extractor, node.get_content())
+        if self.cache is not None:
+            cached = await self.cache.aget(key, collection=CACHE_COLLECTION)
+            if cached is not None:
+                return cached
+
+        metadata = (await extractor.aextract([node]))[0]
+        if self.cache is not None:
+            await self.cache.aput(key, metadata, collection=CACHE_COLLECTION)
+        return metadata
+
+    async def _enrich_node(self, node: BaseNode, semaphore: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
+        """
+        Build the metadata patch for a chunk
+
+        Returns:
+            Metadata to merge, or None to leave the chunk for a later retry
+        """
+        async with semaphore:
+            patch: Dict[str, Any] = {}
+            try:
+                for extractor in self.extractors:
+                    patch.update(await self._extract(extractor, node))
+            except Exception as e:
+                if is_content_filter_error(e):
+                    logger.warning(f"Content filter rejected chunk {node.node_id} - marking and skipping")
+                    return {ENRICHMENT_ERROR_KEY: "content_filter", ENRICHED_KEY: datetime.utcnow().isoformat()}
+                logger.error(f"Enrichment failed for chunk {node.node_id}: {e}")
+                return None
+
+            patch[ENRICHED_KEY] = datetime.utcnow().isoformat()
+            return patch
+
+    def _metadata_is_jsonb(self, conn, table_name: str) -> bool:
+        """PGVectorStore stores metadata_ as json by default, jsonb with use_jsonb=True"""
+        data_type = conn.execute(
+            text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_schema = 'public' AND table_name = :table AND column_name = 'metadata_'"
+            ),
+            {"table": table_name}
+        ).scalar()
+        return data_type == "jsonb"
+
+    async def enrich_collection(self, collection_name: str, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Enrich every pending chunk of a collection
+
+        Args:
+            collection_name: PGVectorStore collection (without the data_ prefix)
+            limit: Maximum chunks to process (None for all pending)
+
+        Returns:
+            Dictionary with enriched / filtered / failed counts
+        """
+        table = vector_table(collection_name)
+        stats = {"enriched": 0, "content_filtered": 0, "failed": 0}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        after = 0
+
+        with self.engine.begin() as conn:
+            column_type = "jsonb" if self._metadata_is_jsonb(conn, vector_table_name(collection_name)) else "json"
+            # Partitions created after migration 010 get the index on their first pass
+            ensure_pending_index(conn, collection_name)
+        update_sql = text(f"UPDATE {table} SET metadata_ = CAST(:metadata AS {column_type}) WHERE id = :id")
+
+        while limit is None or sum(stats.values()) < limit:
+            batch_size = self.batch_size if limit is None else min(self.batch_size, limit - sum(stats.values()))
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    text(PENDING_QUERY.format(table=table, enriched_key=ENRICHED_KEY)),
+                    {"after": after, "batch_size": batch_size}
+                ).fetchall()
+            if not rows:
+                break
+            after = rows[-1][0]
+
+            nodes: List[Tuple[int, BaseNode]] = [
+                (row_id, node_from_row(node_id, node_text, metadata))
+                for row_id, node_id, node_text, metadata in rows
+            ]
+            patches = await asyncio.gather(*(self._enrich_node(node, semaphore) for _, node in nodes))
+
+            updates = []
+            for (row_id, node), patch in zip(nodes, patches):
+                if patch is None:
+                    stats["failed"] += 1
+                    continue
+                if ENRICHMENT_ERROR_KEY in patch:
+                    stats["content_filtered"] += 1
+                else:
+                    stats["enriched"] += 1
+                node.metadata.update(patch)
+                # Enrichment is LLM context (the stored vector was built without
+                # it); the bookkeeping keys are neither
+                node.excluded_embed_metadata_keys = list(
+                    {*node.excluded_embed_metadata_keys, *patch}
+                )
+                node.excluded_llm_metadata_keys = list(
+                    {*node.excluded_llm_metadata_keys, ENRICHED_KEY, ENRICHMENT_ERROR_KEY}
+                )
+                metadata = node_to_metadata_dict(node, remove_text=True, flat_metadata=False)
+                updates.append({"id": row_id, "metadata": json.dumps(metadata)})
+
+            if updates:
+                with self.engine.begin() as conn:
+                    conn.execute(update_sql, updates)
+
+            logger.info(f"Enriched batch of {len(rows)} chunks in {collection_name}: {stats}")
+
+        return stats
@@ -0,0 +1,59 @@
+"""
+Dry run: estimate chunks, tokens, cost and time before indexing
+
+Streams records through to_document_text and the indexer's node parsers
+without calling the embedding provider.
+
+Usage:
+    python example_estimate.py                    # pending records, all sources
+    python example_estimate.py --source news_articles --all   # full reindex
+"""
+import argparse
+import logging
+
+from config import settings
+from indexer import AIJobIndexer, JobIndexer, NewsArticleIndexer, TNNewsIndexer
+
+logging.basicConfig(level=logging.WARNING)
+
+INDEXERS = {
+    "jobs": JobIndexer,
+    "tnnews": TNNewsIndexer,
+    "aijobs": AIJobIndexer,
+    "news_articles": NewsArticleIndexer,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate embedding cost and time without calling the provider")
+    parser.add_argument("--source", choices=sorted(INDEXERS), action="append",
+                        help="Source to estimate (repeatable, default: all)")
+    parser.add_argument("--all", action="store_true", help="Estimate a full reindex instead of pending records")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum records per source")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"INDEXING DRY RUN - {settings.embedding_provider} embeddings")
+    print("=" * 60)
+    print(f"Rate limits: {settings.embedding_tokens_per_minute:,} tokens/min, "
+          f"{settings.embedding_requests_per_minute:,} requests/min")
+
+    for name in args.source or sorted(INDEXERS):
+        indexer = INDEXERS[name]()
+        if args.all:
+            report = indexer.reindex_all(dry_run=True)
+        else:
+            report = indexer.index_records(limit=args.limit, dry_run=True)
+
+        cost = report["estimated_cost_usd"]
+        print(f"\n{name.upper()}:")
+        print(f"  Documents: {report['documents']:,}")
+        print(f"  Chunks: {report['chunks']:,} ({report['oversized_chunks']:,} over the input limit)")
+        print(f"  Tokens: {report['total_tokens']:,}")
+        print(f"  Requests: {report['requests']:,}")
+        print(f"  Estimated cost: {'unknown (set EMBEDDING_PRICE_PER_MILLION_TOKENS)' if cost is None else f'${cost:,.2f}'}")
+        print(f"  Projected time: {report['projected_minutes']:,} min")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,4 +25,6 @@ if __name__ == "__main__":
         else:
             print(f"  ✓ Processed: {stats['total_processed']}")
             print(f"  ✓ Indexed: {stats['total_indexed']}")
+            if stats.get('duplicates_skipped'):
+                print(f"  ≈ Near-duplicates linked: {stats['duplicates_skipped']}")
             print(f"  ✗ Errors: {stats['errors']}")
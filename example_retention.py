@@ -0,0 +1,29 @@
+"""
+Example: Apply the retention policy to monthly news partitions
+Archives (or drops) news_articles vector partitions older than NEWS_RETENTION_MONTHS
+"""
+from indexer import NewsArticleIndexer
+from config import settings
+import logging
+
+logging.basicConfig(level=logging.INFO)
+
+if __name__ == "__main__":
+    print("Applying news partition retention policy...")
+    print("=" * 60)
+    
+    indexer = NewsArticleIndexer()
+    
+    print(f"Live partitions: {indexer.list_partitions()}")
+    print(f"Keep months: {settings.news_retention_months} (action: {settings.news_retention_action})")
+    
+    retired = indexer.apply_retention()
+    
+    print("\n" + "=" * 60)
+    print("RETENTION COMPLETE")
+    print("=" * 60)
+    if retired:
+        for collection in retired:
+            print(f"  ✓ {settings.news_retention_action}: {collection}")
+    else:
+        print("  No partitions past retention")
@@ -0,0 +1,84 @@
+"""
+Materialized filter facets (values with counts) for the portal's filter dropdowns
+
+The portal used to run SELECT DISTINCT over news_articles and jobs on every
+request. The filter_facets materialized view holds the same values with
+record counts, restricted to records that are actually indexed (and, for news,
+to canonical articles). The indexer refreshes it at the end of each indexing
+or retention run. Until migration 006 creates the view, load_facets groups the
+base tables directly, as the portal used to.
+"""
+import logging
+from typing import Dict, List, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+FACETS_VIEW = "filter_facets"
+
+# Tables whose indexing changes the facets
+FACET_SOURCES = {"news_articles", "jobs"}
+
+FACETS_QUERY = """
+SELECT 'news_category' AS facet, category AS value, count(*) AS count
+FROM news_articles
+WHERE index_status = 1 AND canonical_id IS NULL AND category IS NOT NULL
+GROUP BY category
+UNION ALL
+SELECT 'news_source', source, count(*)
+FROM news_articles
+WHERE index_status = 1 AND canonical_id IS NULL AND source IS NOT NULL
+GROUP BY source
+UNION ALL
+SELECT 'job_sector', sector, count(*)
+FROM jobs
+WHERE index_status = 1 AND sector IS NOT NULL
+GROUP BY sector
+"""
+
+
+# Used while the view does not exist: every value, as before the view
+FALLBACK_FACETS_QUERY = """
+SELECT 'news_category' AS facet, category AS value, count(*) AS count
+FROM news_articles WHERE category IS NOT NULL GROUP BY category
+UNION ALL
+SELECT 'news_source', source, count(*)
+FROM news_articles WHERE source IS NOT NULL GROUP BY source
+UNION ALL
+SELECT 'job_sector', sector, count(*)
+FROM jobs WHERE sector IS NOT NULL GROUP BY sector
+"""
+
+
+def ensure_facets_view(conn) -> None:
+    """Create the facets view (populated) with the unique index concurrent refreshes need"""
+    conn.execute(text(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {FACETS_VIEW} AS {FACETS_QUERY}"))
+    conn.execute(text(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {FACETS_VIEW}_facet_value_idx ON {FACETS_VIEW} (facet, value)"
+    ))
+
+
+def refresh_facets(conn) -> None:
+    """Recompute the facets without blocking readers"""
+    conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {FACETS_VIEW}"))
+
+
+def load_facets(conn) -> Dict[str, List[Tuple[str, int]]]:
+    """
+    Read all facets
+
+    Returns:
+        {facet: [(value, count), ...]} with values in alphabetical order
+    """
+    if conn.execute(text(f"SELECT to_regclass('{FACETS_VIEW}')")).scalar() is not None:
+        source = FACETS_VIEW
+    else:
+        logger.warning(f"{FACETS_VIEW} view missing (run python migrate.py) - grouping the base tables")
+        source = f"({FALLBACK_FACETS_QUERY}) AS facets"
+
+    facets: Dict[str, List[Tuple[str, int]]] = {}
+    result = conn.execute(text(f"SELECT facet, value, count FROM {source} ORDER BY facet, value"))
+    for facet, value, count in result:
+        facets.setdefault(facet, []).append((value, count))
+    return facets
@@ -0,0 +1,145 @@
+"""
+Hybrid lexical + vector retrieval over PGVectorStore collections
+
+Dense (pgvector) and lexical (tsvector) rankings are computed and fused with
+reciprocal-rank fusion (RRF) in a single SQL statement, so exact names that
+embeddings handle poorly (people, places, Tamil proper nouns) still surface.
+"""
+import logging
+from typing import List, Optional
+
+from llama_index.core import QueryBundle
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import NodeWithScore
+from llama_index.core.vector_stores import MetadataFilters
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from vector_store import build_filter_clause, distance_sql, node_from_row, vector_table
+
+logger = logging.getLogger(__name__)
+
+# Generated tsvector column PGVectorStore maintains when hybrid_search=True
+TSV_COLUMN = "text_search_tsv"
+
+# Text search configuration created by migration 002: English stemming for
+# ASCII words, simple (lowercased, unstemmed) tokens for Tamil script
+DEFAULT_TEXT_SEARCH_CONFIG = "tamil_english"
+
+# Standard RRF damping constant
+DEFAULT_RRF_K = 60
+
+HYBRID_QUERY = """
+WITH lexical AS (
+    SELECT CAST(
+        replace(CAST(plainto_tsquery(CAST(:ts_config AS regconfig), :lexical_query) AS text), ' & ', ' | ')
+        AS tsquery
+    ) AS query
+),
+dense AS (
+    SELECT id, ROW_NUMBER() OVER (ORDER BY distance) AS rank
+    FROM (
+        SELECT id, {distance} AS distance
+        FROM {table}
+        WHERE {where}
+        ORDER BY distance
+        LIMIT :candidates
+    ) AS nearest
+),
+sparse AS (
+    SELECT id, ROW_NUMBER() OVER (ORDER BY lexical_rank DESC) AS rank
+    FROM (
+        SELECT id, ts_rank_cd({tsv}, lexical.query) AS lexical_rank
+        FROM {table}, lexical
+        WHERE {tsv} @@ lexical.query AND {where}
+        ORDER BY lexical_rank DESC
+        LIMIT :candidates
+    ) AS matches
+),
+fused AS (
+    SELECT COALESCE(dense.id, sparse.id) AS id,
+           COALESCE(1.0 / (:rrf_k + dense.rank), 0.0)
+           + COALESCE(1.0 / (:rrf_k + sparse.rank), 0.0) AS score
+    FROM dense FULL OUTER JOIN sparse ON dense.id = sparse.id
+)
+SELECT t.node_id, t.text, t.metadata_, fused.score
+FROM fused JOIN {table} AS t ON t.id = fused.id
+ORDER BY fused.score DESC
+LIMIT :top_k
+"""
+
+
+class HybridRetriever(BaseRetriever):
+    """Retrieve nodes by reciprocal-rank fusion of vector and full-text ranking"""
+
+    def __init__(
+        self,
+        engine: Engine,
+        collection_name: str,
+        embed_model: BaseEmbedding,
+        similarity_top_k: int = 10,
+        filters: Optional[MetadataFilters] = None,
+        lexical_query: Optional[str] = None,
+        text_search_config: str = DEFAULT_TEXT_SEARCH_CONFIG,
+        rrf_k: int = DEFAULT_RRF_K,
+        candidate_multiplier: int = 4,
+        distance_metric: str = "cosine"
+    ):
+        """
+        Args:
+            engine: SQLAlchemy engine for the vector database
+            collection_name: PGVectorStore collection (without the data_ prefix)
+            embed_model: Embedding model used for the query vector
+            similarity_top_k: Number of fused results to return
+            filters: Optional equality metadata filters
+            lexical_query: Keywords for the full-text side (defaults to the query string);
+                           terms are OR-ed so any exact name match counts
+            text_search_config: Postgres text search configuration of the tsvector column
+            rrf_k: RRF damping constant
+            candidate_multiplier: Each side contributes top_k * multiplier candidates
+            distance_metric: 'cosine', 'l2' or 'inner_product' (pre-normalized embeddings)
+        """
+        self._engine = engine
+        self._collection_name = collection_name
+        self._embed_model = embed_model
+        self._similarity_top_k = similarity_top_k
+        self._filters = filters
+        self._lexical_query = lexical_query
+        self._text_search_config = text_search_config
+        self._rrf_k = rrf_k
+        self._candidate_multiplier = candidate_multiplier
+        self._distance_metric = distance_metric
+        super().__init__()
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        # Reuse an embedding computed by a sibling retriever (e.g. another partition)
+        if query_bundle.embedding is None:
+            query_bundle.embedding = self._embed_model.get_query_embedding(query_bundle.query_str)
+
+        table = vector_table(self._collection_name)
+        where, params = build_filter_clause(self._filters)
+        distance = distance_sql(self._distance_metric, len(query_bundle.embedding))
+        sql = HYBRID_QUERY.format(table=table, where=where, tsv=TSV_COLUMN, distance=distance)
+
+        params.update({
+            "embedding": "[" + ",".join(str(x) for x in query_bundle.embedding) + "]",
+            "ts_config": self._text_search_config,
+            "lexical_query": self._lexical_query or query_bundle.query_str,
+            "candidates": self._similarity_top_k * self._candidate_multiplier,
+            "rrf_k": self._rrf_k,
+            "top_k": self._similarity_top_k,
+        })
+
+        with self._engine.connect() as conn:
+            rows = conn.execute(text(sql), params).fetchall()
+
+        logger.debug(f"Hybrid search on {self._collection_name} returned {len(rows)} nodes")
+
+        return [
+            NodeWithScore(
+                node=node_from_row(node_id, node_text, metadata),
+                score=float(score)
+            )
+            for node_id, node_text, metadata, score in rows
+        ]
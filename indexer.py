@@ -1,23 +1,68 @@
 """
 LlamaIndex PgVector Indexer with Incremental Updates
 """
+import asyncio
 import logging
-from typing import List, Optional, Type
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Type
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from llama_index.core import Document, VectorStoreIndex, StorageContext, Settings
+from llama_index.core.ingestion import DocstoreStrategy, IngestionCache, IngestionPipeline, run_transformations
+from llama_index.core.node_parser import NodeParser, SentenceSplitter
+from llama_index.storage.docstore.postgres import PostgresDocumentStore
+from llama_index.storage.kvstore.postgres import PostgresKVStore
+from llama_index.core.schema import MetadataMode
 from llama_index.vector_stores.postgres import PGVectorStore
 from config import settings
-from models import Job, TNNews, AIJob, NewsArticle, SessionLocal, Base
+from models import Job, TNNews, AIJob, NewsArticle, SessionLocal, Base, engine
+from embeddings import (
+    PROVIDER_TOKEN_LIMITS,
+    NormalizedEmbedding,
+    RemoteEmbedding,
+    TokenBudgetEmbedding,
+    create_local_embedding,
+    load_token_codec,
+)
+from enrichment import MetadataEnricher
+from filter_facets import FACET_SOURCES, refresh_facets
+from indexing_estimate import EmbeddingEstimate, embedding_price_per_million
+from near_duplicates import NearDuplicateDetector, tables_ready as near_duplicate_tables_ready
+from tamil_splitter import tamil_sentence_splitter
+from token_usage import metadata_tokens_saved
+from vector_store import InnerProductPGVectorStore, ensure_binary_index, ensure_ip_index, vector_table, vector_table_name
+from news_partitions import (
+    VECTOR_TABLE_PREFIX,
+    list_partition_collections,
+    partition_collection_name,
+    partition_month,
+    retention_cutoff,
+)
 
 # Configure logging early
 logging.basicConfig(level=settings.log_level)
 logger = logging.getLogger(__name__)
 
+# Postgres KV stores behind the ingestion pipelines (tables data_<name>)
+INGESTION_DOCSTORE_TABLE = "ingestion_docstore"
+INGESTION_CACHE_TABLE = "ingestion_cache"
+
+# Collections a KVDocumentStore namespace is split into
+DOCSTORE_COLLECTION_SUFFIXES = ("/data", "/ref_doc_info", "/metadata")
+
+# index_status values (NULL/0 = pending)
+INDEXED = 1
+# Vectors archived or dropped by news retention; not indexed again
+RETIRED = 2
+
 # Import embedding models based on provider
 if settings.embedding_provider == "azure":
     from llama_index.embeddings.azure_openai import AzureOpenAIEmbedding
 elif settings.embedding_provider == "openai":
     from llama_index.embeddings.openai import OpenAIEmbedding
+elif settings.embedding_provider == "server":
+    pass  # RemoteEmbedding (embeddings.py) talks to embedding_server.py over HTTP
 else:
     try:
         from llama_index.embeddings.huggingface import HuggingFaceEmbedding
@@ -31,6 +76,9 @@ else:
 class BaseIndexer:
     """Base class for indexing different data sources"""
     
+    # index_status values that are neither pending nor reset by reindex_all
+    RETIRED_STATUSES: tuple = ()
+    
     def __init__(
         self,
         table_name: str,
@@ -51,6 +99,13 @@ class BaseIndexer:
         self.storage_context = StorageContext.from_defaults(
             vector_store=self.vector_store
         )
+        
+        # Per-indexer ingestion pipeline (chunking, extraction, embedding, write)
+        self.transformations = self._setup_transformations()
+        self.pipeline = self._build_pipeline(self.collection_name, self.vector_store)
+        
+        # Portal filter facets (filter_facets.py) pending a refresh
+        self._facets_stale = False
     
     def _setup_embeddings(self):
         """Setup embedding model and LLM based on configuration"""
@@ -91,35 +146,186 @@ class BaseIndexer:
                 api_key=settings.openai_api_key
             )
             
+        elif settings.embedding_provider == "server":
+            logger.info(f"Using shared embedding server: {settings.embedding_server_url}")
+            Settings.embed_model = RemoteEmbedding(base_url=settings.embedding_server_url)
+            logger.warning("No LLM configured for server embeddings - metadata extraction will be limited")
+            
         else:
-            logger.info(f"Using local embeddings: {settings.local_embedding_model}")
-            Settings.embed_model = HuggingFaceEmbedding(
-                model_name=settings.local_embedding_model
-            )
+            logger.info(f"Using local embeddings: {settings.local_embedding_model} ({settings.local_embedding_backend})")
+            Settings.embed_model = self._local_embedding_model()
             logger.warning("No LLM configured for local embeddings - metadata extraction will be limited")
+        
+        # Pack embedding requests by token count rather than node count
+        if settings.embedding_token_batching:
+            Settings.embed_model = self._token_budget_embedding(Settings.embed_model)
+        
+        # Store unit vectors so inner product ranks exactly like cosine
+        if settings.vector_distance_metric == "inner_product":
+            Settings.embed_model = NormalizedEmbedding(Settings.embed_model)
+    
+    def _local_embedding_model(self):
+        """Build the local embedding model from the LOCAL_EMBEDDING_* settings"""
+        return create_local_embedding(
+            model_name=settings.local_embedding_model,
+            backend=settings.local_embedding_backend,
+            quantize=settings.local_embedding_quantize,
+            cache_dir=settings.local_embedding_cache_dir or None,
+            num_threads=settings.local_embedding_threads,
+            embed_batch_size=settings.local_embedding_batch_size,
+            num_workers=settings.local_embedding_workers,
+        )
     
-    def _setup_vector_store(self) -> PGVectorStore:
-        """Setup PgVector store"""
-        logger.info(f"Setting up PgVector store for collection: {self.collection_name}")
+    @staticmethod
+    def _embedding_model_name() -> str:
+        """Name of the configured embedding model (Azure deployment for azure)"""
+        if settings.embedding_provider == "azure":
+            return settings.azure_openai_embedding_deployment
+        if settings.embedding_provider == "openai":
+            return settings.openai_embedding_model
+        return settings.local_embedding_model
+    
+    @staticmethod
+    def _token_limits() -> tuple:
+        """(max input tokens, max request tokens, max request inputs) for the provider"""
+        max_input, max_request, max_inputs = PROVIDER_TOKEN_LIMITS[settings.embedding_provider]
+        return (
+            settings.embedding_max_input_tokens or max_input,
+            settings.embedding_max_request_tokens or max_request,
+            settings.embedding_max_request_inputs or max_inputs,
+        )
+    
+    def _token_budget_embedding(self, embed_model):
+        """Wrap the embedding model so requests are packed by token budget"""
+        model_name = self._embedding_model_name()
+        try:
+            encode, decode = load_token_codec(settings.embedding_provider, model_name)
+        except Exception as e:
+            logger.warning(f"No tokenizer for {model_name} ({e}) - batching embeddings by count")
+            return embed_model
         
-        vector_store = PGVectorStore.from_params(
+        max_input, max_request, max_inputs = self._token_limits()
+        return TokenBudgetEmbedding(
+            embed_model,
+            encode=encode,
+            decode=decode,
+            max_input_tokens=max_input,
+            max_request_tokens=max_request,
+            max_request_inputs=max_inputs,
+            split_oversized=settings.embedding_split_oversized,
+        )
+    
+    def _setup_vector_store(self, collection_name: Optional[str] = None) -> PGVectorStore:
+        """Setup PgVector store (defaults to this indexer's collection)"""
+        collection_name = collection_name or self.collection_name
+        logger.info(f"Setting up PgVector store for collection: {collection_name}")
+        
+        # Inner product on normalized vectors ranks like cosine without per-row norms
+        if settings.vector_distance_metric == "inner_product":
+            store_class = InnerProductPGVectorStore
+        else:
+            store_class = PGVectorStore
+        
+        vector_store = store_class.from_params(
             database=settings.db_name,
             host=settings.db_host,
             password=settings.db_password,
             port=settings.db_port,        
             user=settings.db_user,
-            table_name=self.collection_name,
+            table_name=collection_name,
             embed_dim=settings.vector_dimension,
+            hybrid_search=settings.hybrid_search,          # Maintain text_search_tsv for lexical search
+            text_search_config=settings.text_search_config,
         )
         
         return vector_store
     
-    def get_unindexed_records(self, db: Session, limit: Optional[int] = None):
-        """Get records that haven't been indexed yet (incremental update)"""
-        query = db.query(self.model_class).filter(
+    def _setup_transformations(self) -> list:
+        """Node transformations for this source (run before embedding)"""
+        return [self.build_splitter(settings.chunk_size, settings.chunk_overlap)]
+    
+    @classmethod
+    def build_splitter(cls, chunk_size: int, chunk_overlap: int) -> NodeParser:
+        """Chunker this source indexes with (also used by benchmark_chunking_sweep.py)"""
+        return SentenceSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    
+    def _build_pipeline(self, collection_name: str, vector_store: PGVectorStore) -> IngestionPipeline:
+        """
+        Build the ingestion pipeline writing to a collection
+        
+        The transformation cache (Postgres KV store) skips re-running splitting,
+        extraction and embedding on nodes already seen. The docstore keeps one
+        hash per document id, so unchanged documents are skipped entirely and
+        changed ones replace their old vectors (upserts).
+        """
+        db_params = dict(
+            host=settings.db_host,
+            port=str(settings.db_port),
+            database=settings.db_name,
+            user=settings.db_user,
+            password=settings.db_password,
+        )
+        
+        cache = None
+        if settings.ingestion_cache:
+            cache = IngestionCache(
+                cache=PostgresKVStore.from_params(**db_params, table_name=INGESTION_CACHE_TABLE),
+                collection=collection_name,
+            )
+        
+        docstore = None
+        if settings.ingestion_dedupe:
+            docstore = PostgresDocumentStore.from_params(
+                **db_params,
+                table_name=INGESTION_DOCSTORE_TABLE,
+                namespace=collection_name,
+            )
+        
+        return IngestionPipeline(
+            name=collection_name,
+            transformations=[*self.transformations, Settings.embed_model],
+            vector_store=vector_store,
+            cache=cache,
+            docstore=docstore,
+            docstore_strategy=DocstoreStrategy.UPSERTS,
+        )
+    
+    @staticmethod
+    def _clear_ingestion_state(conn, collection_name: str) -> None:
+        """
+        Forget a collection's docstore hashes and cached transformations
+        
+        Without this, documents whose text is unchanged are skipped by the
+        docstore (UPSERTS) and never written to the collection again.
+        """
+        docstore_table = f"{VECTOR_TABLE_PREFIX}{INGESTION_DOCSTORE_TABLE}"
+        if conn.execute(text(f"SELECT to_regclass('public.{docstore_table}')")).scalar() is not None:
+            conn.execute(
+                text(f'DELETE FROM public."{docstore_table}" WHERE namespace = ANY(:namespaces)'),
+                {"namespaces": [f"{collection_name}{suffix}" for suffix in DOCSTORE_COLLECTION_SUFFIXES]}
+            )
+        
+        cache_table = f"{VECTOR_TABLE_PREFIX}{INGESTION_CACHE_TABLE}"
+        if conn.execute(text(f"SELECT to_regclass('public.{cache_table}')")).scalar() is not None:
+            conn.execute(
+                text(f'DELETE FROM public."{cache_table}" WHERE namespace = :collection'),
+                {"collection": collection_name}
+            )
+    
+    def _stored_collections(self) -> List[str]:
+        """Live collections holding this indexer's vectors"""
+        return [self.collection_name]
+    
+    def _pending_filter(self):
+        """Filter for records that still need indexing"""
+        return (
             (self.model_class.index_status == None) | 
-            (self.model_class.index_status != 1)
+            self.model_class.index_status.notin_((INDEXED,) + self.RETIRED_STATUSES)
         )
+    
+    def get_unindexed_records(self, db: Session, limit: Optional[int] = None):
+        """Get records that haven't been indexed yet (incremental update)"""
+        query = db.query(self.model_class).filter(self._pending_filter())
         
         if limit:
             query = query.limit(limit)
@@ -134,10 +340,14 @@ class BaseIndexer:
             doc_text = record.to_document_text()
             metadata = record.to_metadata()
             
+            # Per-source exclusions keep metadata filterable without
+            # repeating it in every chunk's embedded and LLM text
             doc = Document(
                 text=doc_text,
                 metadata=metadata,
-                id_=str(record.id)
+                id_=str(record.id),
+                excluded_embed_metadata_keys=list(getattr(record, "EXCLUDED_EMBED_METADATA_KEYS", [])),
+                excluded_llm_metadata_keys=list(getattr(record, "EXCLUDED_LLM_METADATA_KEYS", [])),
             )
             documents.append(doc)
         
@@ -146,7 +356,8 @@ class BaseIndexer:
     def index_records(
         self, 
         batch_size: int = 100,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        dry_run: bool = False
     ) -> dict:
         """
         Index records with incremental updates
@@ -154,15 +365,21 @@ class BaseIndexer:
         Args:
             batch_size: Number of records to process in each batch
             limit: Maximum number of records to index (None for all)
+            dry_run: Only estimate chunks, tokens, cost and time (see BaseIndexer.estimate_indexing)
         
         Returns:
             Dictionary with indexing statistics
         """
+        if dry_run:
+            return self.estimate_indexing(batch_size=batch_size, limit=limit)
+        
         db = SessionLocal()
         stats = {
             "total_processed": 0,
             "total_indexed": 0,
-            "errors": 0
+            "errors": 0,
+            "duplicates_skipped": 0,
+            "metadata_tokens_saved": 0
         }
         
         try:
@@ -183,28 +400,23 @@ class BaseIndexer:
                 batch = records[i:i + batch_size]
                 
                 try:
-                    # Convert to documents
-                    documents = self.create_documents(batch)
+                    # Convert to documents (near-duplicates are linked, not embedded)
+                    embed_records = self._records_to_embed(db, batch)
+                    stats["duplicates_skipped"] += len(batch) - len(embed_records)
+                    documents = self.create_documents(embed_records)
                     
-                    # Create or update index
-                    if i == 0:
-                        # First batch - create index
-                        self.index = VectorStoreIndex.from_documents(
-                            documents,
-                            storage_context=self.storage_context,
-                            show_progress=True,
-                            transformations=getattr(Settings, 'transformations', None)  # Use transformations if set
-                        )
-                    else:
-                        # Subsequent batches - insert into existing index
-                        for doc in documents:
-                            self.index.insert(doc)
+                    # Chunk, embed and write (unchanged documents are skipped)
+                    nodes = self._index_documents(documents)
+                    stats["metadata_tokens_saved"] += metadata_tokens_saved(
+                        nodes, MetadataMode.EMBED, self._token_encoder()
+                    )
                     
                     # Mark records as indexed (status = 1)
                     for record in batch:
-                        record.index_status = 1
+                        record.index_status = INDEXED
                     
                     db.commit()
+                    self._facets_stale = True
                     
                     stats["total_indexed"] += len(batch)
                     logger.info(f"Indexed batch {i//batch_size + 1}: {len(batch)} records")
@@ -216,6 +428,10 @@ class BaseIndexer:
                 
                 stats["total_processed"] += len(batch)
             
+            if stats["total_indexed"]:
+                self._ensure_vector_indexes()
+                self._refresh_facets()
+            
             logger.info(f"Indexing complete for {self.table_name}: {stats}")
             
         except Exception as e:
@@ -226,6 +442,125 @@ class BaseIndexer:
         
         return stats
     
+    def estimate_indexing(
+        self,
+        batch_size: int = 100,
+        limit: Optional[int] = None,
+        include_indexed: bool = False
+    ) -> dict:
+        """
+        Dry run: chunk pending records without calling the embedding provider
+        
+        Records are streamed through to_document_text and the configured node
+        parsers (LLM extractors are skipped), and each chunk's embedded text is
+        counted with the model's tokenizer.
+        
+        Args:
+            batch_size: Records loaded from the database at a time
+            limit: Maximum number of records to estimate (None for all)
+            include_indexed: Estimate every record, as reindex_all would
+        
+        Returns:
+            Dictionary with chunk count, total tokens, estimated cost and
+            projected wall-clock minutes at the configured rate limits
+        """
+        try:
+            encode, _ = load_token_codec(settings.embedding_provider, self._embedding_model_name())
+        except Exception as e:
+            logger.warning(f"No tokenizer available ({e}) - approximating 4 characters per token")
+            encode = lambda content: range(len(content) // 4 + 1)
+        
+        parsers = [t for t in self.transformations if isinstance(t, NodeParser)]
+        estimate = EmbeddingEstimate(*self._token_limits())
+        
+        db = SessionLocal()
+        try:
+            query = db.query(self.model_class)
+            if not include_indexed:
+                query = query.filter(self._pending_filter())
+            if limit:
+                query = query.limit(limit)
+            
+            for record in query.yield_per(batch_size):
+                documents = self.create_documents([record])
+                nodes = run_transformations(documents, parsers)
+                estimate.add_document(
+                    len(encode(node.get_content(metadata_mode=MetadataMode.EMBED)))
+                    for node in nodes
+                )
+        finally:
+            db.close()
+        
+        if settings.embedding_provider in ("azure", "openai"):
+            price = embedding_price_per_million(
+                self._embedding_model_name(),
+                settings.embedding_price_per_million_tokens
+            )
+        else:
+            price = 0.0
+        
+        report = estimate.report(
+            price,
+            settings.embedding_tokens_per_minute,
+            settings.embedding_requests_per_minute
+        )
+        report["dry_run"] = True
+        logger.info(f"Dry run for {self.table_name}: {report}")
+        return report
+    
+    def _records_to_embed(self, db: Session, records: List[Base]) -> List[Base]:
+        """Records in a batch that need vectors (all of them unless overridden)"""
+        return records
+    
+    def _index_documents(self, documents: List[Document]) -> list:
+        """Run a batch of documents through the ingestion pipeline, returning the written nodes"""
+        nodes = self.pipeline.run(documents=documents, show_progress=True)
+        logger.debug(f"Wrote {len(nodes)} nodes to {self.collection_name}")
+        return nodes
+    
+    def _token_encoder(self):
+        """Embedding model tokenizer (None if unavailable), loaded once"""
+        if not hasattr(self, "_encode"):
+            try:
+                self._encode = load_token_codec(settings.embedding_provider, self._embedding_model_name())[0]
+            except Exception as e:
+                logger.warning(f"No tokenizer for {self._embedding_model_name()} ({e}) - token savings not reported")
+                self._encode = None
+        return self._encode
+    
+    def _refresh_facets(self):
+        """
+        Refresh the portal's filter facets if batches were committed since the last refresh
+        
+        The refresh re-aggregates the source tables, so it runs once at the
+        end of an indexing or retention run rather than per batch.
+        """
+        if self.table_name not in FACET_SOURCES or not self._facets_stale:
+            return
+        
+        try:
+            with engine.begin() as conn:
+                refresh_facets(conn)
+            self._facets_stale = False
+        except Exception as e:
+            logger.warning(f"Could not refresh filter facets (run python migrate.py?): {e}")
+    
+    def _written_collections(self) -> List[str]:
+        """Collections this indexer writes vectors to"""
+        return [self.collection_name]
+    
+    def _ensure_vector_indexes(self):
+        """Create the configured ANN indexes on written collections if missing"""
+        if settings.vector_distance_metric != "inner_product" and not settings.binary_quantization:
+            return
+        
+        with engine.begin() as conn:
+            for collection_name in self._written_collections():
+                if settings.vector_distance_metric == "inner_product":
+                    ensure_ip_index(conn, collection_name)
+                if settings.binary_quantization:
+                    ensure_binary_index(conn, collection_name)
+    
     def get_index(self) -> VectorStoreIndex:
         """Get or create index"""
         if not hasattr(self, 'index'):
@@ -235,16 +570,38 @@ class BaseIndexer:
             )
         return self.index
     
-    def reindex_all(self, batch_size: int = 100) -> dict:
+    def reindex_all(self, batch_size: int = 100, dry_run: bool = False) -> dict:
         """
         Force reindex all records (not incremental)
-        Use this when you need to rebuild the entire index
+        Use this when you need to rebuild the entire index (e.g. after changing
+        the embedding model or distance metric)
+        
+        Existing vectors, docstore hashes and cached transformations of the
+        collections are deleted first, so every record is embedded again.
+        With dry_run=True nothing is reset; returns the estimate for all records
         """
+        if dry_run:
+            return self.estimate_indexing(batch_size=batch_size, include_indexed=True)
+        
+        with engine.begin() as conn:
+            for collection_name in self._stored_collections():
+                table = vector_table(collection_name)
+                if conn.execute(text(f"SELECT to_regclass('{table}')")).scalar() is not None:
+                    conn.execute(text(f"DELETE FROM {table}"))
+                self._clear_ingestion_state(conn, collection_name)
+                logger.info(f"Cleared collection {collection_name} for reindexing")
+        
         db = SessionLocal()
         
         try:
-            # Reset all index_status
-            db.query(self.model_class).update({"index_status": None})
+            # Reset all index_status (retired records stay retired)
+            query = db.query(self.model_class)
+            if self.RETIRED_STATUSES:
+                query = query.filter(
+                    (self.model_class.index_status == None) | 
+                    self.model_class.index_status.notin_(self.RETIRED_STATUSES)
+                )
+            query.update({"index_status": None}, synchronize_session=False)
             db.commit()
             
             # Now index all
@@ -293,10 +650,15 @@ class NewsArticleIndexer(BaseIndexer):
     
     Uses LlamaIndex transformations for:
     - SentenceSplitter: Intelligent chunking with paragraph awareness
-    - TitleExtractor: Generate descriptive titles for chunks
+    
+    and a deferred enrichment pass (see enrichment.py) for:
+    - TitleExtractor: Generate descriptive titles for chunks (optional)
     - KeywordExtractor: Extract relevant keywords (optional)
     """
     
+    # Articles of months removed by apply_retention
+    RETIRED_STATUSES = (RETIRED,)
+    
     def __init__(self, use_keyword_extraction: bool = False, use_title_extraction: bool = False):
         """
         Initialize NewsArticleIndexer with optional transformation pipeline.
@@ -307,23 +669,69 @@ class NewsArticleIndexer(BaseIndexer):
         """
         self.use_keyword_extraction = use_keyword_extraction
         self.use_title_extraction = use_title_extraction
+        
+        # Monthly partition pipelines, keyed by collection name
+        self._partition_pipelines: Dict[str, IngestionPipeline] = {}
+        
+        # Syndicated copies / URL variants are linked to a canonical article
+        self.duplicate_detector = None
+        if settings.news_near_duplicates:
+            self.duplicate_detector = NearDuplicateDetector(
+                threshold=settings.news_duplicate_threshold,
+                num_perm=settings.news_minhash_permutations,
+                band_rows=settings.news_minhash_band_rows,
+            )
+        self._duplicate_tables_checked = False
+        
         super().__init__(
             table_name="news_articles",
             model_class=NewsArticle,
             collection_name=f"{settings.vector_table_prefix}_news_articles"
         )
+    
+    def _setup_transformations(self) -> list:
+        """Setup chunking for news articles (LLM extraction runs in the deferred enrichment pass)"""
+        logger.info("Setting up transformation pipeline for news articles")
+        
+        transformations = [
+            # Split text intelligently with paragraph awareness
+            # Smaller chunks for news (2-3 paragraphs), ~10% overlap for context continuity
+            self.build_splitter(settings.news_chunk_size, settings.news_chunk_overlap),
+        ]
+        
+        if self.use_title_extraction or self.use_keyword_extraction:
+            logger.info("LLM metadata extraction will run as a deferred pass after vectors are written")
+        else:
+            logger.info("Using basic chunking only (no LLM-based metadata extraction)")
+        
+        return transformations
+    
+    @classmethod
+    def build_splitter(cls, chunk_size: int, chunk_overlap: int) -> NodeParser:
+        """News chunker: paragraph-aware, Tamil sentence rules when NEWS_SENTENCE_SPLITTER=tamil"""
+        splitter_options = dict(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            paragraph_separator="\n\n",  # News typically uses double newlines
+            include_metadata=True,       # Preserve metadata (category, source, date)
+            include_prev_next_rel=True   # Maintain article flow
+        )
         
-        # Setup transformation pipeline for news articles
-        self._setup_transformations()
+        if settings.news_sentence_splitter == "tamil":
+            # Unicode sentence boundaries, sizes counted in embedding-model tokens
+            try:
+                tokenizer = load_token_codec(settings.embedding_provider, cls._embedding_model_name())[0]
+            except Exception as e:
+                logger.warning(f"No tokenizer for {cls._embedding_model_name()} ({e}) - using default token counts")
+                tokenizer = None
+            return tamil_sentence_splitter(tokenizer=tokenizer, **splitter_options)
+        return SentenceSplitter.from_defaults(**splitter_options)
     
-    def _setup_transformations(self):
-        """Setup transformation pipeline for better chunking and metadata extraction"""
-        from llama_index.core.node_parser import SentenceSplitter
+    def _setup_extractors(self) -> list:
+        """LLM extractors for the deferred enrichment pass"""
         from llama_index.core.extractors import TitleExtractor, KeywordExtractor
         from llama_index.llms.azure_openai import AzureOpenAI
         
-        logger.info("Setting up transformation pipeline for news articles")
-        
         # Setup Azure OpenAI LLM for metadata extraction
         llm = AzureOpenAI(
             model=settings.azure_openai_llm_model,  # Actual model name (e.g., "gpt-4o")
@@ -333,41 +741,256 @@ class NewsArticleIndexer(BaseIndexer):
             api_version=settings.azure_openai_api_version,
         )
         
-        # Create transformations list
-        transformations = [
-            # 1. Split text intelligently with paragraph awareness
-            SentenceSplitter.from_defaults(
-                chunk_size=512,              # Smaller chunks for news (2-3 paragraphs)
-                chunk_overlap=50,            # 10% overlap for context continuity
-                paragraph_separator="\n\n",  # News typically uses double newlines
-                include_metadata=True,       # Preserve metadata (category, source, date)
-                include_prev_next_rel=True   # Maintain article flow
-            ),
-        ]
+        extractors = []
         
-        # 2. Optionally generate descriptive titles for each chunk (uses Azure OpenAI LLM)
+        # Optionally generate a descriptive title for each chunk
         if self.use_title_extraction:
-            transformations.append(
-                TitleExtractor(nodes=5, llm=llm)  # Use 5 surrounding nodes for context
-            )
+            extractors.append(TitleExtractor(nodes=1, llm=llm))
             logger.warning("Title extraction enabled - may trigger Azure content filters on some news articles")
         
-        # 3. Optionally add keyword extraction (requires additional LLM calls)
+        # Optionally extract keywords for each chunk
         if self.use_keyword_extraction:
-            transformations.append(
-                KeywordExtractor(keywords=5, llm=llm)  # Extract 5 keywords per chunk
-            )
+            extractors.append(KeywordExtractor(keywords=5, llm=llm))
             logger.warning("Keyword extraction enabled - may trigger Azure content filters on some news articles")
         
-        # Set transformations in global settings
-        # Note: This affects how documents are processed when creating the index
-        Settings.transformations = transformations
+        logger.info(f"Using Azure OpenAI LLM: {settings.azure_openai_llm_model} (deployment: {settings.azure_openai_llm_deployment})")
+        return extractors
+    
+    def enrich_metadata(self, limit: Optional[int] = None) -> dict:
+        """
+        Run LLM metadata extraction over stored chunks not enriched yet
         
-        logger.info(f"Transformation pipeline configured with {len(transformations)} steps")
-        if self.use_title_extraction or self.use_keyword_extraction:
-            logger.info(f"Using Azure OpenAI LLM: {settings.azure_openai_llm_model} (deployment: {settings.azure_openai_llm_deployment})")
+        Blocking wrapper around aenrich_metadata. Inside a running event loop
+        (notebooks, async apps) the pass runs on its own loop in a worker
+        thread; async callers should await aenrich_metadata instead.
+        
+        Args:
+            limit: Maximum chunks per collection (None for all pending)
+        
+        Returns:
+            Dictionary of enrichment stats per collection
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aenrich_metadata(limit=limit))
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.aenrich_metadata(limit=limit)).result()
+    
+    async def aenrich_metadata(self, limit: Optional[int] = None) -> dict:
+        """Async version of enrich_metadata"""
+        if not (self.use_title_extraction or self.use_keyword_extraction):
+            return {}
+        
+        cache = None
+        if settings.ingestion_cache:
+            cache = PostgresKVStore.from_params(
+                host=settings.db_host,
+                port=str(settings.db_port),
+                database=settings.db_name,
+                user=settings.db_user,
+                password=settings.db_password,
+                table_name=INGESTION_CACHE_TABLE,
+            )
+        
+        enricher = MetadataEnricher(
+            engine,
+            self._setup_extractors(),
+            concurrency=settings.enrichment_concurrency,
+            batch_size=settings.enrichment_batch_size,
+            cache=cache,
+        )
+        
+        if settings.news_partition_by_month:
+            collections = self.list_partitions()
         else:
-            logger.info("Using basic chunking only (no LLM-based metadata extraction)")
+            collections = [self.collection_name]
+        
+        return {
+            collection_name: await enricher.enrich_collection(collection_name, limit=limit)
+            for collection_name in collections
+        }
+    
+    def index_records(
+        self,
+        batch_size: int = 100,
+        limit: Optional[int] = None,
+        dry_run: bool = False
+    ) -> dict:
+        """Index records, apply the partition retention policy, then run deferred enrichment"""
+        stats = super().index_records(batch_size=batch_size, limit=limit, dry_run=dry_run)
+        
+        if not dry_run and settings.news_partition_by_month and settings.news_retention_months > 0:
+            stats["partitions_retired"] = self.apply_retention()
+        
+        # Vectors are already committed and searchable; enrich them afterwards
+        # (opt-in: this waits on LLM calls - otherwise run enrich_metadata.py)
+        if not dry_run and stats["total_indexed"] and settings.enrichment_after_indexing:
+            stats["enrichment"] = self.enrich_metadata()
+        
+        return stats
+    
+    def _near_duplicates_enabled(self) -> bool:
+        """
+        Whether near-duplicate detection is on and its tables exist
+        
+        The tables and news_articles columns come from migrations 005/009;
+        until they have run, detection is disabled with a warning.
+        """
+        if self.duplicate_detector is None:
+            return False
+        if not self._duplicate_tables_checked:
+            with engine.connect() as conn:
+                ready = near_duplicate_tables_ready(conn)
+            self._duplicate_tables_checked = True
+            if not ready:
+                logger.warning("Near-duplicate tables missing (run python migrate.py) - NEWS_NEAR_DUPLICATES ignored")
+                self.duplicate_detector = None
+        return self.duplicate_detector is not None
+    
+    def _records_to_embed(self, db: Session, records: List[Base]) -> List[Base]:
+        """
+        Skip near-duplicates of articles already seen (in earlier batches or this one)
+        
+        Links are written in the batch's transaction, so they roll back with it
+        if indexing fails.
+        """
+        if not self._near_duplicates_enabled():
+            return records
+        
+        canonical = self.duplicate_detector.assign(
+            db,
+            [(record.id, record.content or record.title or "") for record in records]
+        )
+        return [record for record in records if canonical.get(record.id, record.id) == record.id]
+    
+    def _index_documents(self, documents: List[Document]) -> list:
+        """Route documents to their monthly partition when partitioning is enabled"""
+        if not settings.news_partition_by_month:
+            return super()._index_documents(documents)
+        
+        partitions: Dict[str, List[Document]] = {}
+        for doc in documents:
+            collection_name = partition_collection_name(self.collection_name, self._document_month(doc))
+            partitions.setdefault(collection_name, []).append(doc)
+        
+        nodes = []
+        for collection_name, partition_docs in partitions.items():
+            nodes.extend(self._get_partition_pipeline(collection_name).run(documents=partition_docs))
+            logger.info(f"Wrote {len(partition_docs)} documents to partition {collection_name}")
+        return nodes
+    
+    def _written_collections(self) -> List[str]:
+        """Collections this indexer writes vectors to (monthly partitions when enabled)"""
+        if settings.news_partition_by_month:
+            return list(self._partition_pipelines)
+        return super()._written_collections()
+    
+    def _stored_collections(self) -> List[str]:
+        """Live collections holding news vectors (every public partition when enabled)"""
+        if settings.news_partition_by_month:
+            return self.list_partitions()
+        return super()._stored_collections()
+    
+    def _document_month(self, doc: Document) -> datetime:
+        """Get the timestamp that decides a document's partition (scraped_date, then created_at)"""
+        for key in ("scraped_date", "created_at"):
+            value = doc.metadata.get(key)
+            if value:
+                try:
+                    return datetime.fromisoformat(value)
+                except ValueError:
+                    logger.warning(f"Invalid {key} '{value}' on document {doc.id_}")
+        return datetime.utcnow()
+    
+    def _get_partition_pipeline(self, collection_name: str) -> IngestionPipeline:
+        """Get or create the ingestion pipeline for a monthly partition"""
+        if collection_name not in self._partition_pipelines:
+            self._partition_pipelines[collection_name] = self._build_pipeline(
+                collection_name,
+                self._setup_vector_store(collection_name)
+            )
+        return self._partition_pipelines[collection_name]
+    
+    def list_partitions(self, schema: str = "public") -> List[str]:
+        """List monthly partition collections in a schema, newest first"""
+        with engine.connect() as conn:
+            return list_partition_collections(conn, self.collection_name, schema=schema)
+    
+    def apply_retention(
+        self,
+        keep_months: Optional[int] = None,
+        action: Optional[str] = None
+    ) -> List[str]:
+        """
+        Archive or drop monthly partitions older than the retention window
+        
+        Args:
+            keep_months: Number of most recent months to keep (defaults to NEWS_RETENTION_MONTHS)
+            action: 'archive' moves partitions to NEWS_ARCHIVE_SCHEMA, 'drop' deletes them
+                    (defaults to NEWS_RETENTION_ACTION)
+        
+        Returns:
+            List of collections that were archived or dropped
+        """
+        keep_months = settings.news_retention_months if keep_months is None else keep_months
+        action = action or settings.news_retention_action
+        
+        if keep_months <= 0:
+            return []
+        
+        cutoff = retention_cutoff(keep_months)
+        expired = [c for c in self.list_partitions() if partition_month(c) < cutoff]
+        
+        if not expired:
+            return []
+        
+        with engine.begin() as conn:
+            if action == "archive":
+                conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{settings.news_archive_schema}"'))
+            
+            for collection_name in expired:
+                table = vector_table(collection_name)
+                if action == "archive":
+                    archived = f'"{settings.news_archive_schema}"."{vector_table_name(collection_name)}"'
+                    if conn.execute(text(f"SELECT to_regclass(:table)"), {"table": archived}).scalar() is not None:
+                        # Archived before, then rebuilt: the new copy replaces it
+                        # (the two would also clash on index names in the schema)
+                        logger.warning(f"Retention: replacing previously archived {archived}")
+                        conn.execute(text(f"DROP TABLE {archived}"))
+                    conn.execute(text(f'ALTER TABLE {table} SET SCHEMA "{settings.news_archive_schema}"'))
+                elif action == "drop":
+                    conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+                else:
+                    raise ValueError(f"Unknown retention action: {action}")
+                
+                # Let the articles be ingested again if the partition is rebuilt
+                self._clear_ingestion_state(conn, collection_name)
+                self._partition_pipelines.pop(collection_name, None)
+                logger.info(f"Retention: {action} partition {collection_name}")
+            
+            # Their vectors are gone: keep the articles out of indexing runs and
+            # the portal's filter facets (which count index_status = 1 only)
+            retired_ids = [
+                article_id for (article_id,) in conn.execute(
+                    text(
+                        "UPDATE news_articles SET index_status = :retired "
+                        "WHERE COALESCE(scraped_date, created_at) < :cutoff RETURNING id"
+                    ),
+                    {"retired": RETIRED, "cutoff": cutoff}
+                ).fetchall()
+            ]
+            
+            if self._near_duplicates_enabled():
+                # Retired articles stop matching; their duplicates get a live canonical
+                promoted = self.duplicate_detector.retire(conn, retired_ids)
+                if promoted:
+                    logger.info(f"Retention: re-linked {len(promoted)} duplicates of retired canonical articles")
+        
+        self._facets_stale = True
+        self._refresh_facets()
+        return expired
 
 
 # Convenience function
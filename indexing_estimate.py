@@ -0,0 +1,109 @@
+"""
+Dry-run cost and throughput estimates for embedding runs
+"""
+import math
+from typing import Dict, Iterable, Optional
+
+# USD per 1M input tokens (Azure OpenAI / OpenAI list prices)
+EMBEDDING_PRICES_PER_MILLION = {
+    "text-embedding-3-large": 0.13,
+    "text-embedding-3-small": 0.02,
+    "text-embedding-ada-002": 0.10,
+}
+
+
+def embedding_price_per_million(model_name: str, override: float = 0.0) -> Optional[float]:
+    """
+    Get the embedding price for a model (or Azure deployment named after one)
+
+    Returns:
+        USD per 1M tokens, or None if the model is unknown and no override is set
+    """
+    if override:
+        return override
+    for model, price in EMBEDDING_PRICES_PER_MILLION.items():
+        if model in model_name:
+            return price
+    return None
+
+
+class EmbeddingEstimate:
+    """Accumulate chunk token counts and pack them into requests like TokenBudgetEmbedding"""
+
+    def __init__(self, max_input_tokens: int, max_request_tokens: int, max_request_inputs: int):
+        self.max_input_tokens = max_input_tokens
+        self.max_request_tokens = max_request_tokens
+        self.max_request_inputs = max_request_inputs
+        self.documents = 0
+        self.chunks = 0
+        self.inputs = 0
+        self.tokens = 0
+        self.requests = 0
+        self.oversized_chunks = 0
+        self._request_tokens = 0
+        self._request_inputs = 0
+
+    def add_document(self, chunk_token_counts: Iterable[int]) -> None:
+        """Record one document's chunks (token counts of the embedded text)"""
+        self.documents += 1
+        for token_count in chunk_token_counts:
+            self.chunks += 1
+            self.tokens += token_count
+            if token_count > self.max_input_tokens:
+                self.oversized_chunks += 1
+
+            pieces = max(1, math.ceil(token_count / self.max_input_tokens))
+            for i in range(pieces):
+                piece_tokens = min(self.max_input_tokens, token_count - i * self.max_input_tokens)
+                self._add_input(max(piece_tokens, 0))
+
+    def _add_input(self, token_count: int) -> None:
+        if self._request_inputs and (
+            self._request_tokens + token_count > self.max_request_tokens
+            or self._request_inputs >= self.max_request_inputs
+        ):
+            self._request_tokens = 0
+            self._request_inputs = 0
+        if self._request_inputs == 0:
+            self.requests += 1
+        self._request_tokens += token_count
+        self._request_inputs += 1
+        self.inputs += 1
+
+    def report(
+        self,
+        price_per_million: Optional[float],
+        tokens_per_minute: int,
+        requests_per_minute: int
+    ) -> Dict:
+        """
+        Summarize the run
+
+        Args:
+            price_per_million: USD per 1M tokens (None = unknown)
+            tokens_per_minute: Provider token rate limit (0 = unlimited)
+            requests_per_minute: Provider request rate limit (0 = unlimited)
+
+        Returns:
+            Dictionary with counts, estimated cost and projected wall-clock minutes
+        """
+        # Whichever rate limit binds first sets the pace
+        minutes = max(
+            self.tokens / tokens_per_minute if tokens_per_minute else 0.0,
+            self.requests / requests_per_minute if requests_per_minute else 0.0,
+        )
+
+        return {
+            "documents": self.documents,
+            "chunks": self.chunks,
+            "embedding_inputs": self.inputs,
+            "oversized_chunks": self.oversized_chunks,
+            "total_tokens": self.tokens,
+            "requests": self.requests,
+            "price_per_million_tokens": price_per_million,
+            "estimated_cost_usd": (
+                round(self.tokens / 1_000_000 * price_per_million, 4)
+                if price_per_million is not None else None
+            ),
+            "projected_minutes": round(minutes, 1),
+        }
@@ -0,0 +1,72 @@
+"""Add Tamil/English text search configuration and tsvector columns for hybrid search
+
+Revision ID: 002
+Revises: 001
+Create Date: 2025-11-12 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from config import settings
+from vector_store import list_vector_tables
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+TEXT_SEARCH_CONFIG = 'tamil_english'
+
+
+def upgrade() -> None:
+    """
+    Create the tamil_english text search configuration and add a generated
+    text_search_tsv column (with GIN index) to every existing vector table.
+
+    Postgres ships no Tamil stemmer, so tamil_english copies 'simple'
+    (lowercased, unstemmed tokens - right for Tamil script) and maps ASCII
+    words to the English stemmer. Tamil tokenization needs a UTF-8 database
+    locale. Tables created later by PGVectorStore with hybrid_search=True
+    get the same column automatically.
+    """
+    conn = op.get_bind()
+
+    conn.execute(sa.text(f"""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{TEXT_SEARCH_CONFIG}') THEN
+                CREATE TEXT SEARCH CONFIGURATION {TEXT_SEARCH_CONFIG} (COPY = simple);
+                ALTER TEXT SEARCH CONFIGURATION {TEXT_SEARCH_CONFIG}
+                    ALTER MAPPING FOR asciiword, asciihword, hword_asciipart WITH english_stem;
+            END IF;
+        END
+        $$;
+    """))
+
+    for table in list_vector_tables(conn, settings.vector_table_prefix):
+        conn.execute(sa.text(f"""
+            ALTER TABLE "{table}" ADD COLUMN IF NOT EXISTS text_search_tsv tsvector
+            GENERATED ALWAYS AS (to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, text)) STORED
+        """))
+        conn.execute(sa.text(
+            f'CREATE INDEX IF NOT EXISTS "{table}_text_search_tsv_idx" '
+            f'ON "{table}" USING gin (text_search_tsv)'
+        ))
+
+    print("✓ Migration completed: Added tamil_english text search and tsvector columns")
+
+
+def downgrade() -> None:
+    """
+    Remove the tsvector columns and the text search configuration
+    """
+    conn = op.get_bind()
+
+    for table in list_vector_tables(conn, settings.vector_table_prefix):
+        conn.execute(sa.text(f'DROP INDEX IF EXISTS "{table}_text_search_tsv_idx"'))
+        conn.execute(sa.text(f'ALTER TABLE "{table}" DROP COLUMN IF EXISTS text_search_tsv'))
+
+    conn.execute(sa.text(f"DROP TEXT SEARCH CONFIGURATION IF EXISTS {TEXT_SEARCH_CONFIG}"))
@@ -0,0 +1,53 @@
+"""Normalize stored embeddings and add inner-product HNSW indexes
+
+Revision ID: 003
+Revises: 002
+Create Date: 2025-11-13 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from config import settings
+from vector_store import ensure_ip_index, list_vector_tables
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    L2-normalize every stored embedding and create an HNSW index with the
+    inner-product opclass (halfvec_ip_ops above 2000 dimensions).
+
+    Unit vectors make inner product equal to cosine similarity, so ranking is
+    unchanged when VECTOR_DISTANCE_METRIC=inner_product. Requires pgvector 0.7+
+    for l2_normalize and halfvec.
+    """
+    conn = op.get_bind()
+
+    for table in list_vector_tables(conn, settings.vector_table_prefix):
+        # Skip rows that are already unit length to keep the rewrite small
+        conn.execute(sa.text(f"""
+            UPDATE "{table}"
+            SET embedding = l2_normalize(embedding)
+            WHERE embedding IS NOT NULL
+              AND abs((embedding <#> embedding) + 1) > 1e-4
+        """))
+        ensure_ip_index(conn, table[len("data_"):])
+        print(f"  ✓ Normalized and indexed {table}")
+
+    print("✓ Migration completed: Normalized embeddings for inner-product search")
+
+
+def downgrade() -> None:
+    """
+    Drop the inner-product indexes (normalized vectors remain valid for cosine)
+    """
+    conn = op.get_bind()
+
+    for table in list_vector_tables(conn, settings.vector_table_prefix):
+        conn.execute(sa.text(f'DROP INDEX IF EXISTS "{table}_embedding_ip_idx"'))
@@ -0,0 +1,49 @@
+"""Add Hamming-distance indexes over binary-quantized embeddings
+
+Revision ID: 004
+Revises: 003
+Create Date: 2025-11-14 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from config import settings
+from vector_store import ensure_binary_index, list_vector_tables
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create an HNSW bit_hamming_ops index on binary_quantize(embedding) for
+    every existing vector table, used by search_mode='binary' for the
+    candidate pass. Skipped unless BINARY_QUANTIZATION is enabled; the
+    indexer also creates the index on its next run once it is enabled.
+    Requires pgvector 0.7+.
+    """
+    if not settings.binary_quantization:
+        print("BINARY_QUANTIZATION disabled - skipping binary-quantized indexes")
+        return
+
+    conn = op.get_bind()
+
+    for table in list_vector_tables(conn, settings.vector_table_prefix):
+        ensure_binary_index(conn, table[len("data_"):])
+        print(f"  ✓ Indexed {table}")
+
+    print("✓ Migration completed: Added binary-quantized Hamming indexes")
+
+
+def downgrade() -> None:
+    """
+    Drop the binary-quantized indexes
+    """
+    conn = op.get_bind()
+
+    for table in list_vector_tables(conn, settings.vector_table_prefix):
+        conn.execute(sa.text(f'DROP INDEX IF EXISTS "{table}_embedding_bq_idx"'))
@@ -0,0 +1,49 @@
+"""Add near-duplicate links and MinHash signature tables for news articles
+
+Revision ID: 005
+Revises: 004
+Create Date: 2025-11-20 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from near_duplicates import BANDS_TABLE, SIGNATURE_TABLE, ensure_tables
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add canonical_id / duplicate_count to news_articles and create the
+    MinHash signature and LSH band tables used to find near-duplicates at
+    index time. Existing articles are fingerprinted as they are (re)indexed.
+    """
+    conn = op.get_bind()
+
+    conn.execute(sa.text("ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS canonical_id integer"))
+    conn.execute(sa.text("ALTER TABLE news_articles ADD COLUMN IF NOT EXISTS duplicate_count integer DEFAULT 0"))
+    conn.execute(sa.text(
+        "CREATE INDEX IF NOT EXISTS idx_news_articles_canonical_id ON news_articles (canonical_id)"
+    ))
+
+    ensure_tables(conn)
+
+    print("✓ Migration completed: Added news near-duplicate tables and columns")
+
+
+def downgrade() -> None:
+    """
+    Drop the signature tables and the near-duplicate columns
+    """
+    conn = op.get_bind()
+
+    conn.execute(sa.text(f"DROP TABLE IF EXISTS {BANDS_TABLE}"))
+    conn.execute(sa.text(f"DROP TABLE IF EXISTS {SIGNATURE_TABLE}"))
+    conn.execute(sa.text("DROP INDEX IF EXISTS idx_news_articles_canonical_id"))
+    conn.execute(sa.text("ALTER TABLE news_articles DROP COLUMN IF EXISTS duplicate_count"))
+    conn.execute(sa.text("ALTER TABLE news_articles DROP COLUMN IF EXISTS canonical_id"))
@@ -0,0 +1,39 @@
+"""Add the filter_facets materialized view for portal filter options
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-11-24 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from filter_facets import FACETS_VIEW, ensure_facets_view
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create filter_facets (news categories / sources and job sectors of
+    indexed records, with counts) and the unique index that lets the indexer
+    refresh it concurrently.
+    """
+    conn = op.get_bind()
+
+    ensure_facets_view(conn)
+
+    print("✓ Migration completed: Added filter_facets materialized view")
+
+
+def downgrade() -> None:
+    """
+    Drop the facets view
+    """
+    conn = op.get_bind()
+
+    conn.execute(sa.text(f"DROP MATERIALIZED VIEW IF EXISTS {FACETS_VIEW}"))
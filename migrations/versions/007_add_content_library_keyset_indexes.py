@@ -0,0 +1,66 @@
+"""Add keyset-pagination indexes to the portal's content library tables
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-11-27 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+# table -> its usage flag column
+CONTENT_TABLES = {
+    'generated_titles': 'is_used',
+    'generated_social_content': 'is_published',
+    'generated_blogs': 'is_published',
+}
+
+
+def _index_columns(flag: str) -> dict:
+    """Index name suffix -> leading filter columns; every index ends in (created_at, id) DESC"""
+    return {
+        'created': [],
+        'source_flag_created': ['source_type', flag],
+        'source_sector_created': ['source_type', 'filter_sector'],
+        'source_category_created': ['source_type', 'filter_category', 'filter_source'],
+    }
+
+
+def upgrade() -> None:
+    """
+    Create composite indexes ending in (created_at DESC, id DESC) for the
+    portal's listings, so a filtered page is an index seek from the cursor
+    instead of an OFFSET scan. Tables the portal has not created yet are
+    skipped.
+    """
+    conn = op.get_bind()
+
+    for table, flag in CONTENT_TABLES.items():
+        if conn.execute(sa.text("SELECT to_regclass(:table)"), {"table": f"public.{table}"}).scalar() is None:
+            print(f"  - {table} does not exist, skipping")
+            continue
+
+        for suffix, columns in _index_columns(flag).items():
+            column_list = ", ".join(columns + ["created_at DESC", "id DESC"])
+            conn.execute(sa.text(f'CREATE INDEX IF NOT EXISTS "idx_{table}_{suffix}" ON {table} ({column_list})'))
+        print(f"  ✓ Indexed {table}")
+
+    print("✓ Migration completed: Added content library keyset indexes")
+
+
+def downgrade() -> None:
+    """
+    Drop the keyset indexes
+    """
+    conn = op.get_bind()
+
+    for table, flag in CONTENT_TABLES.items():
+        for suffix in _index_columns(flag):
+            conn.execute(sa.text(f'DROP INDEX IF EXISTS "idx_{table}_{suffix}"'))
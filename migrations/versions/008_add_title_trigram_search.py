@@ -0,0 +1,55 @@
+"""Add trigram search over generated title topics and titles
+
+Revision ID: 008
+Revises: 007
+Create Date: 2025-11-28 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Enable pg_trgm and add a generated search_text column (topic + title)
+    with a GIN trigram index to generated_titles. The portal's title search
+    matches it with ILIKE (substring) and %> (fuzzy word match) and ranks by
+    word_similarity, all served by the index. Trigram extraction of Tamil
+    text needs a UTF-8 database locale. Skipped if the portal has not
+    created generated_titles yet.
+    """
+    conn = op.get_bind()
+
+    if conn.execute(sa.text("SELECT to_regclass('public.generated_titles')")).scalar() is None:
+        print("generated_titles does not exist - skipping title search index "
+              "(the portal searches titles with ILIKE until search_text exists)")
+        return
+
+    conn.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    conn.execute(sa.text("""
+        ALTER TABLE generated_titles ADD COLUMN IF NOT EXISTS search_text text
+        GENERATED ALWAYS AS (coalesce(topic, '') || ' ' || coalesce(title, '')) STORED
+    """))
+    conn.execute(sa.text(
+        "CREATE INDEX IF NOT EXISTS idx_generated_titles_search_trgm "
+        "ON generated_titles USING gin (search_text gin_trgm_ops)"
+    ))
+
+    print("✓ Migration completed: Added trigram title search")
+
+
+def downgrade() -> None:
+    """
+    Drop the search index and column (pg_trgm is left installed)
+    """
+    conn = op.get_bind()
+
+    conn.execute(sa.text("DROP INDEX IF EXISTS idx_generated_titles_search_trgm"))
+    if conn.execute(sa.text("SELECT to_regclass('public.generated_titles')")).scalar() is not None:
+        conn.execute(sa.text("ALTER TABLE generated_titles DROP COLUMN IF EXISTS search_text"))
@@ -0,0 +1,40 @@
+"""Track the text each news MinHash signature was computed from
+
+Revision ID: 009
+Revises: 008
+Create Date: 2025-12-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from near_duplicates import SIGNATURE_TABLE, ensure_tables
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add text_hash to the signature table so articles whose text changed are
+    fingerprinted again. Existing signatures adopt the hash of the text seen
+    the next time their article is indexed.
+    """
+    conn = op.get_bind()
+
+    ensure_tables(conn)
+
+    print("✓ Migration completed: Added text_hash to news MinHash signatures")
+
+
+def downgrade() -> None:
+    """
+    Drop the text_hash column
+    """
+    conn = op.get_bind()
+
+    conn.execute(sa.text(f"DROP INDEX IF EXISTS {SIGNATURE_TABLE}_canonical_idx"))
+    conn.execute(sa.text(f"ALTER TABLE {SIGNATURE_TABLE} DROP COLUMN IF EXISTS text_hash"))
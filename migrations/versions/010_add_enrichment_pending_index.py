@@ -0,0 +1,54 @@
+"""Add partial indexes for finding news chunks awaiting enrichment
+
+Revision ID: 010
+Revises: 009
+Create Date: 2025-12-02 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from config import settings
+from enrichment import ensure_pending_index
+from vector_store import list_vector_tables
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+NEWS_TABLE = f"data_{settings.vector_table_prefix}_news_articles"
+
+
+def _news_tables(conn) -> list:
+    """News vector tables: the unpartitioned collection and its monthly partitions"""
+    return [
+        table for table in list_vector_tables(conn, settings.vector_table_prefix)
+        if table == NEWS_TABLE or table.startswith(f"{NEWS_TABLE}_")
+    ]
+
+
+def upgrade() -> None:
+    """
+    Index the ids of chunks without an enriched_at key, so the deferred
+    enrichment pass (enrichment.py) does not scan and cast every row's
+    metadata. The index shrinks as chunks are enriched.
+    """
+    conn = op.get_bind()
+
+    for table in _news_tables(conn):
+        ensure_pending_index(conn, table[len("data_"):])
+        print(f"  ✓ Indexed pending enrichment on {table}")
+
+    print("✓ Migration completed: Added enrichment pending indexes")
+
+
+def downgrade() -> None:
+    """
+    Drop the pending enrichment indexes
+    """
+    conn = op.get_bind()
+
+    for table in _news_tables(conn):
+        conn.execute(sa.text(f'DROP INDEX IF EXISTS "{table}_enrichment_pending_idx"'))
@@ -77,6 +77,15 @@ class Job(Base):
         
         return "\n".join(parts)
     
+    # Metadata stays filterable but is left out of the embedded / LLM text
+    # (already in to_document_text, or not useful to the model)
+    EXCLUDED_EMBED_METADATA_KEYS = [
+        "id", "company", "location", "sector", "job_type", "salary", "experience", "site_source", "created_at",
+    ]
+    EXCLUDED_LLM_METADATA_KEYS = [
+        "id", "company", "location", "sector", "job_type", "salary", "experience", "site_source",
+    ]
+    
     def to_metadata(self) -> dict:
         """Extract metadata for filtering"""
         return {
@@ -122,6 +131,10 @@ class TNNews(Base):
         
         return "\n".join(parts)
     
+    # Metadata stays filterable but is left out of the embedded / LLM text
+    EXCLUDED_EMBED_METADATA_KEYS = ["id", "category", "source", "published_date"]
+    EXCLUDED_LLM_METADATA_KEYS = ["id", "category", "source"]
+    
     def to_metadata(self) -> dict:
         """Extract metadata for filtering"""
         return {
@@ -163,6 +176,11 @@ class NewsArticle(Base):
         
         return "\n".join(parts)
     
+    # Metadata stays filterable but is left out of the embedded / LLM text
+    # (title, category and source are already in to_document_text)
+    EXCLUDED_EMBED_METADATA_KEYS = ["id", "title", "url", "category", "source", "scraped_date", "created_at"]
+    EXCLUDED_LLM_METADATA_KEYS = ["id", "title", "url", "category", "source", "created_at"]
+    
     def to_metadata(self) -> dict:
         """Extract metadata for filtering"""
         return {
@@ -215,6 +233,11 @@ class AIJob(Base):
         
         return "\n".join(parts)
     
+    # Metadata stays filterable but is left out of the embedded / LLM text
+    # (job_type is not in to_document_text, so it stays)
+    EXCLUDED_EMBED_METADATA_KEYS = ["id", "company", "location", "experience"]
+    EXCLUDED_LLM_METADATA_KEYS = ["id", "company", "location", "experience"]
+    
     def to_metadata(self) -> dict:
         """Extract metadata for filtering"""
         return {
@@ -0,0 +1,418 @@
+"""
+Near-duplicate detection for news articles (MinHash + LSH)
+
+Syndicated copies and URL variants of the same story defeat the exact
+content_hash match, so each copy would be embedded and compete for top-k
+slots. Each article's word shingles are summarized as a MinHash signature;
+LSH band buckets (stored in Postgres) find earlier articles that probably
+share most shingles, and the estimated Jaccard similarity decides. A
+duplicate is linked to its canonical article (news_articles.canonical_id)
+and not embedded; the canonical's duplicate_count is attached to retrieved
+nodes by DuplicateCountPostprocessor.
+
+Links are kept current: an article whose text changed is fingerprinted
+again, and when a canonical's vectors are removed (retention) the oldest
+remaining duplicate is promoted to canonical and queued for embedding.
+"""
+import hashlib
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from llama_index.core import QueryBundle
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.postprocessor.types import BaseNodePostprocessor
+from llama_index.core.schema import NodeWithScore
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_TABLE = "news_minhash"
+BANDS_TABLE = "news_minhash_bands"
+DUPLICATE_COUNT_KEY = "duplicate_count"
+
+# Split on whitespace and punctuation only: \w would break Tamil words at vowel signs
+WORD = re.compile(r"[^\s.,;:!?()\[\]\"'“”‘’।]+")
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def ensure_tables(conn) -> None:
+    """Create the signature and LSH band tables if missing"""
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {SIGNATURE_TABLE} (
+            article_id integer PRIMARY KEY,
+            canonical_id integer NOT NULL,
+            signature bytea NOT NULL,
+            text_hash text
+        )
+    """))
+    # Tables created before text changes were tracked
+    conn.execute(text(f"ALTER TABLE {SIGNATURE_TABLE} ADD COLUMN IF NOT EXISTS text_hash text"))
+    conn.execute(text(
+        f"CREATE INDEX IF NOT EXISTS {SIGNATURE_TABLE}_canonical_idx ON {SIGNATURE_TABLE} (canonical_id)"
+    ))
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {BANDS_TABLE} (
+            band smallint NOT NULL,
+            bucket bigint NOT NULL,
+            article_id integer NOT NULL,
+            PRIMARY KEY (band, bucket, article_id)
+        )
+    """))
+
+
+def tables_ready(conn) -> bool:
+    """Whether migrations 005 and 009 have created the tables and columns this module uses"""
+    return conn.execute(text("""
+        SELECT count(*) = 3 FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND (table_name, column_name) IN (
+              ('news_articles', 'canonical_id'),
+              (:signatures, 'text_hash'),
+              (:bands, 'bucket')
+          )
+    """), {"signatures": SIGNATURE_TABLE, "bands": BANDS_TABLE}).scalar()
+
+
+def text_hash(content: str) -> str:
+    """Hash of the text an article was fingerprinted from"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def shingles(content: str, size: int = 5) -> Set[str]:
+    """Word n-grams of normalized text (the whole text if shorter than one shingle)"""
+    words = WORD.findall(content.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """MinHash signatures with banded LSH keys"""
+
+    def __init__(self, num_perm: int = 128, band_rows: int = 8, seed: int = 1):
+        """
+        Args:
+            num_perm: Signature length (permutations)
+            band_rows: Signature rows per LSH band; more rows = fewer, closer candidates
+            seed: Permutation seed (must stay fixed once signatures are stored)
+        """
+        if num_perm % band_rows:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of band_rows ({band_rows})")
+        self.num_perm = num_perm
+        self.band_rows = band_rows
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set: Iterable[str]) -> np.ndarray:
+        """MinHash signature (uint32 per permutation) of a shingle set"""
+        hashes = np.array(
+            [
+                int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+                for s in shingle_set
+            ],
+            dtype=np.uint64
+        )
+        # Universal hashing (a*x + b mod p); uint64 products wrap, as in datasketch
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def bands(self, signature: np.ndarray) -> List[Tuple[int, int]]:
+        """(band, bucket) LSH keys; articles sharing any key are candidates"""
+        keys = []
+        for band, start in enumerate(range(0, self.num_perm, self.band_rows)):
+            digest = hashlib.blake2b(signature[start:start + self.band_rows].tobytes(), digest_size=8).digest()
+            keys.append((band, int.from_bytes(digest, "little", signed=True)))
+        return keys
+
+
+class NearDuplicateDetector:
+    """Link near-duplicate news articles to a canonical article, incrementally"""
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        band_rows: int = 8,
+        shingle_size: int = 5
+    ):
+        """
+        Args:
+            threshold: Estimated Jaccard similarity at or above which articles are duplicates
+            num_perm: MinHash signature length
+            band_rows: Signature rows per LSH band
+            shingle_size: Words per shingle
+        """
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm=num_perm, band_rows=band_rows)
+
+    def assign(self, conn, articles: List[Tuple[int, str]]) -> Dict[int, int]:
+        """
+        Find the canonical article for each article, recording new ones
+
+        Articles seen before keep their stored canonical unless their text
+        changed; changed articles are unlinked and matched again. A new (or
+        changed) article that matches an earlier one is linked to that
+        article's canonical; others become their own canonical. Runs on the
+        caller's connection/session so assignments commit or roll back with
+        the indexing batch.
+
+        Args:
+            conn: Connection or Session (news_articles and the minhash tables)
+            articles: (article id, text) pairs in arrival order
+
+        Returns:
+            Mapping of article id to canonical article id (articles without
+            any words are left out)
+        """
+        ids = [article_id for article_id, _ in articles]
+        stored = {
+            article_id: (canonical_id, stored_hash)
+            for article_id, canonical_id, stored_hash in conn.execute(
+                text(f"SELECT article_id, canonical_id, text_hash FROM {SIGNATURE_TABLE} WHERE article_id = ANY(:ids)"),
+                {"ids": ids}
+            ).fetchall()
+        }
+        canonical: Dict[int, int] = {}
+
+        for article_id, content in articles:
+            digest = text_hash(content)
+            if article_id in stored:
+                old_canonical, old_hash = stored[article_id]
+                if old_hash is None:
+                    # Fingerprinted before hashes were stored: adopt this text
+                    conn.execute(
+                        text(f"UPDATE {SIGNATURE_TABLE} SET text_hash = :hash WHERE article_id = :id"),
+                        {"hash": digest, "id": article_id}
+                    )
+                if old_hash in (None, digest):
+                    canonical[article_id] = old_canonical
+                    continue
+                self._unlink(conn, article_id, old_canonical)
+
+            shingle_set = shingles(content, self.shingle_size)
+            if not shingle_set:
+                continue
+
+            signature = self.hasher.signature(shingle_set)
+            bands = self.hasher.bands(signature)
+            match = self._best_match(conn, signature, bands, exclude=article_id)
+            canonical[article_id] = match if match is not None else article_id
+
+            conn.execute(
+                text(
+                    f"INSERT INTO {SIGNATURE_TABLE} (article_id, canonical_id, signature, text_hash) "
+                    f"VALUES (:id, :canonical, :signature, :hash) ON CONFLICT (article_id) DO UPDATE "
+                    f"SET canonical_id = EXCLUDED.canonical_id, signature = EXCLUDED.signature, "
+                    f"text_hash = EXCLUDED.text_hash"
+                ),
+                {"id": article_id, "canonical": canonical[article_id], "signature": signature.tobytes(), "hash": digest}
+            )
+            conn.execute(
+                text(
+                    f"INSERT INTO {BANDS_TABLE} (band, bucket, article_id) "
+                    f"VALUES (:band, :bucket, :id) ON CONFLICT DO NOTHING"
+                ),
+                [{"band": band, "bucket": bucket, "id": article_id} for band, bucket in bands]
+            )
+
+            if match is not None:
+                conn.execute(
+                    text("UPDATE news_articles SET canonical_id = :canonical WHERE id = :id"),
+                    {"canonical": match, "id": article_id}
+                )
+                conn.execute(
+                    text(
+                        "UPDATE news_articles SET duplicate_count = COALESCE(duplicate_count, 0) + 1 "
+                        "WHERE id = :canonical"
+                    ),
+                    {"canonical": match}
+                )
+                logger.debug(f"News article {article_id} is a near-duplicate of {match}")
+
+                # A changed canonical that now duplicates another story hands
+                # its own duplicates to a new canonical
+                if article_id in stored and stored[article_id][0] == article_id:
+                    for member, new_canonical in self.promote(conn, [article_id]).items():
+                        if member in canonical:
+                            canonical[member] = new_canonical
+
+        return canonical
+
+    def retire(self, conn, article_ids: List[int]) -> Dict[int, int]:
+        """
+        Forget articles whose vectors were removed, promoting their duplicates
+
+        Retired articles stop being match candidates. Each retired canonical
+        that still has live duplicates hands over to the oldest of them (see
+        promote), so the story stays searchable.
+
+        Returns:
+            Mapping of each re-linked duplicate to its new canonical
+        """
+        if not article_ids:
+            return {}
+        removed = conn.execute(
+            text(f"DELETE FROM {SIGNATURE_TABLE} WHERE article_id = ANY(:ids) RETURNING article_id, canonical_id"),
+            {"ids": article_ids}
+        ).fetchall()
+        canonicals = [article_id for article_id, canonical_id in removed if canonical_id == article_id]
+        retired = set(article_ids)
+        # Retired duplicates of a canonical that stays no longer count towards it
+        for article_id, canonical_id in removed:
+            if canonical_id != article_id and canonical_id not in retired:
+                conn.execute(
+                    text(
+                        "UPDATE news_articles SET duplicate_count = GREATEST(COALESCE(duplicate_count, 0) - 1, 0) "
+                        "WHERE id = :canonical"
+                    ),
+                    {"canonical": canonical_id}
+                )
+        conn.execute(text(f"DELETE FROM {BANDS_TABLE} WHERE article_id = ANY(:ids)"), {"ids": article_ids})
+        return self.promote(conn, canonicals)
+
+    def promote(self, conn, former_canonicals: List[int]) -> Dict[int, int]:
+        """
+        Re-link the duplicates of articles that are no longer canonical
+
+        The oldest remaining duplicate of each becomes the canonical: its link
+        is cleared and index_status reset so the next indexing run embeds it;
+        the other duplicates are linked to it.
+
+        Returns:
+            Mapping of each re-linked duplicate to its new canonical
+        """
+        relinked: Dict[int, int] = {}
+        for former in former_canonicals:
+            members = [
+                member for (member,) in conn.execute(
+                    text(
+                        f"SELECT article_id FROM {SIGNATURE_TABLE} "
+                        f"WHERE canonical_id = :former AND article_id <> :former ORDER BY article_id"
+                    ),
+                    {"former": former}
+                ).fetchall()
+            ]
+            if not members:
+                continue
+
+            new_canonical = members[0]
+            conn.execute(
+                text(
+                    f"UPDATE {SIGNATURE_TABLE} SET canonical_id = :new "
+                    f"WHERE canonical_id = :former AND article_id <> :former"
+                ),
+                {"new": new_canonical, "former": former}
+            )
+            conn.execute(
+                text(
+                    "UPDATE news_articles SET canonical_id = NULL, duplicate_count = :count, index_status = NULL "
+                    "WHERE id = :new"
+                ),
+                {"new": new_canonical, "count": len(members) - 1}
+            )
+            conn.execute(
+                text("UPDATE news_articles SET canonical_id = :new WHERE id = ANY(:ids)"),
+                {"new": new_canonical, "ids": members[1:]}
+            )
+            conn.execute(text("UPDATE news_articles SET duplicate_count = 0 WHERE id = :former"), {"former": former})
+            relinked.update({member: new_canonical for member in members})
+            logger.info(f"Promoted news article {new_canonical} to canonical in place of {former}")
+        return relinked
+
+    def _unlink(self, conn, article_id: int, old_canonical: int) -> None:
+        """Drop a changed article's fingerprint and its duplicate link before re-matching"""
+        conn.execute(text(f"DELETE FROM {BANDS_TABLE} WHERE article_id = :id"), {"id": article_id})
+        if old_canonical != article_id:
+            conn.execute(text("UPDATE news_articles SET canonical_id = NULL WHERE id = :id"), {"id": article_id})
+            conn.execute(
+                text(
+                    "UPDATE news_articles SET duplicate_count = GREATEST(COALESCE(duplicate_count, 0) - 1, 0) "
+                    "WHERE id = :canonical"
+                ),
+                {"canonical": old_canonical}
+            )
+
+    def _best_match(
+        self,
+        conn,
+        signature: np.ndarray,
+        bands: List[Tuple[int, int]],
+        exclude: Optional[int] = None
+    ) -> Optional[int]:
+        """Canonical id of the most similar earlier article above the threshold, if any"""
+        band_filter = " OR ".join(f"(b.band = :band{i} AND b.bucket = :bucket{i})" for i in range(len(bands)))
+        params = {}
+        for i, (band, bucket) in enumerate(bands):
+            params[f"band{i}"] = band
+            params[f"bucket{i}"] = bucket
+
+        candidates = conn.execute(
+            text(
+                f"SELECT DISTINCT s.article_id, s.canonical_id, s.signature "
+                f"FROM {BANDS_TABLE} b JOIN {SIGNATURE_TABLE} s ON s.article_id = b.article_id "
+                f"WHERE {band_filter}"
+            ),
+            params
+        ).fetchall()
+
+        best, best_similarity = None, self.threshold
+        for article_id, canonical_id, stored in candidates:
+            # An article never matches itself or the group it heads
+            if exclude is not None and exclude in (article_id, canonical_id):
+                continue
+            similarity = float(np.mean(np.frombuffer(stored, dtype=np.uint32) == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = canonical_id, similarity
+        return best
+
+
+class DuplicateCountPostprocessor(BaseNodePostprocessor):
+    """Attach each retrieved news article's near-duplicate count to its nodes"""
+
+    _engine: Engine = PrivateAttr()
+
+    def __init__(self, engine: Engine, **kwargs):
+        """
+        Args:
+            engine: SQLAlchemy engine for the news_articles database
+        """
+        super().__init__(**kwargs)
+        self._engine = engine
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "DuplicateCountPostprocessor"
+
+    def _postprocess_nodes(
+        self,
+        nodes: List[NodeWithScore],
+        query_bundle: Optional[QueryBundle] = None
+    ) -> List[NodeWithScore]:
+        ids = {n.node.metadata.get("id") for n in nodes} - {None, ""}
+        if not ids:
+            return nodes
+
+        try:
+            with self._engine.connect() as conn:
+                counts = dict(
+                    conn.execute(
+                        text("SELECT id, COALESCE(duplicate_count, 0) FROM news_articles WHERE id = ANY(:ids)"),
+                        {"ids": [int(i) for i in ids]}
+                    ).fetchall()
+                )
+        except Exception as e:
+            logger.warning(f"Could not load duplicate counts: {e}")
+            return nodes
+
+        for n in nodes:
+            article_id = n.node.metadata.get("id")
+            if article_id not in (None, ""):
+                n.node.metadata[DUPLICATE_COUNT_KEY] = counts.get(int(article_id), 0)
+        return nodes
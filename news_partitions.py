@@ -0,0 +1,93 @@
+"""
+Monthly partitioning helpers for the news_articles vector collection
+
+Each month of `scraped_date` is written to its own PGVectorStore collection
+(e.g. llamaindex_embedding_news_articles_2025_11), so a recency-bounded query
+only touches the partitions - and the smaller ANN indexes - inside its window.
+"""
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import text
+
+# PGVectorStore stores a collection named X in a table named data_X
+VECTOR_TABLE_PREFIX = "data_"
+
+PARTITION_SUFFIX_FORMAT = "%Y_%m"
+PARTITION_SUFFIX_PATTERN = re.compile(r"_(\d{4})_(\d{2})$")
+
+
+def partition_suffix(when: datetime) -> str:
+    """Get the partition suffix (YYYY_MM) for a timestamp"""
+    return when.strftime(PARTITION_SUFFIX_FORMAT)
+
+
+def partition_collection_name(base_collection: str, when: datetime) -> str:
+    """Get the collection name holding vectors for the month of `when`"""
+    return f"{base_collection}_{partition_suffix(when)}"
+
+
+def partition_month(collection_name: str) -> Optional[datetime]:
+    """Parse the month a partition collection covers (None if not a partition)"""
+    match = PARTITION_SUFFIX_PATTERN.search(collection_name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+def months_in_window(recency_days: int, now: Optional[datetime] = None) -> List[str]:
+    """
+    Get the partition suffixes overlapping the last `recency_days` days
+
+    The window is rounded out to whole months, newest first.
+    """
+    now = now or datetime.utcnow()
+    first = (now - timedelta(days=recency_days)).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    suffixes = []
+    while month >= first:
+        suffixes.append(partition_suffix(month))
+        month = (month - timedelta(days=1)).replace(day=1)
+
+    return suffixes
+
+
+def list_partition_collections(conn, base_collection: str, schema: str = "public") -> List[str]:
+    """
+    List existing partition collections for a base collection, newest first
+
+    Args:
+        conn: SQLAlchemy connection
+        base_collection: Unpartitioned collection name (e.g. llamaindex_embedding_news_articles)
+        schema: Schema to look in ("public" for live partitions, archive schema for archived ones)
+    """
+    pattern = f"{VECTOR_TABLE_PREFIX}{base_collection.lower()}_%"
+    result = conn.execute(
+        text(
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_schema = :schema AND table_name LIKE :pattern"
+        ),
+        {"schema": schema, "pattern": pattern}
+    )
+
+    collections = []
+    for (table_name,) in result:
+        collection = table_name[len(VECTOR_TABLE_PREFIX):]
+        # Only exact <base>_YYYY_MM names, not other collections sharing the prefix
+        if partition_month(collection) and \
+                PARTITION_SUFFIX_PATTERN.sub("", collection) == base_collection.lower():
+            collections.append(collection)
+
+    return sorted(collections, reverse=True)
+
+
+def retention_cutoff(keep_months: int, now: Optional[datetime] = None) -> datetime:
+    """Get the first month still retained when keeping the newest `keep_months` months"""
+    month = (now or datetime.utcnow()).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(max(keep_months - 1, 0)):
+        month = (month - timedelta(days=1)).replace(day=1)
+    return month
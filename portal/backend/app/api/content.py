@@ -1,7 +1,11 @@
 """
 API endpoints for content generation using LlamaIndex + Azure OpenAI
 """
-from fastapi import APIRouter, Depends, HTTPException
+import hashlib
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from core.database import get_db
@@ -17,43 +21,107 @@ from schemas.content import (
     GenerateBlogRequest,
     SavedBlog,
     ListContentRequest,
+    SOCIAL_FIELDS,
+    SOCIAL_SUMMARY_FIELDS,
+    BLOG_FIELDS,
+    BLOG_SUMMARY_FIELDS,
 )
+from core.cache import TTLCache
+from core.concurrency import run_blocking
+from core.pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
+from core.streaming import SSE_HEADERS, sse_event, stream_blocking
+from core.config import settings
 from services.query_engine import PortalQueryEngine
-from typing import List
+from services.jobs import QueueFullError, job_queue
+from services.warmup import get_db_query_engine, get_query_engine
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Literal, Optional, Tuple
 
 router = APIRouter(prefix="/content", tags=["Content Generation"])
 
-# Initialize query engine (singleton)
-query_engine = PortalQueryEngine()
+# The PortalQueryEngine singleton is built and warmed in the background at
+# startup (services/warmup.py); routes receive it through get_query_engine, or
+# get_db_query_engine when they only read and write saved rows
+# Filter options only change when the indexer refreshes the filter_facets view
+facets_cache = TTLCache(settings.facets_cache_ttl_seconds)
+
+
+def _load_filter_options(query_engine: PortalQueryEngine) -> Tuple[str, dict]:
+    """Read the facets once and build the response body and its ETag"""
+    facets = query_engine.get_filter_facets()
+    fields = {"news_categories": "news_category", "news_sources": "news_source", "job_sectors": "job_sector"}
+    
+    options = FilterOptionsResponse(
+        **{field: [value for value, _ in facets.get(facet, [])] for field, facet in fields.items()},
+        counts={field: dict(facets.get(facet, [])) for field, facet in fields.items()}
+    ).model_dump()
+    
+    digest = hashlib.sha256(json.dumps(options, sort_keys=True).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"', options
+
+
+def _resolve_fields(requested: Optional[List[str]], allowed: List[str], default: List[str]) -> List[str]:
+    """Fields a list request returns (id always included); 400 on unknown names"""
+    if requested is None:
+        return default
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return ["id"] + [f for f in allowed if f in requested and f != "id"]
+
+
+def _projected_response(rows: list, fields: List[str], limit: int) -> ORJSONResponse:
+    """
+    Serialize only the requested fields with orjson (datetimes as ISO 8601)
+    
+    Unrequested columns were never loaded, so they must not be touched here.
+    """
+    cursor = next_cursor(rows, limit)
+    return ORJSONResponse(
+        content=[{f: getattr(row, f, None) for f in fields} for row in rows],
+        headers={NEXT_CURSOR_HEADER: cursor} if cursor else None
+    )
 
 
 @router.get("/filters", response_model=FilterOptionsResponse)
-async def get_filter_options():
+async def get_filter_options(
+    request: Request,
+    response: Response,
+    query_engine: PortalQueryEngine = Depends(get_db_query_engine)
+):
     """
     Get available filter options for content generation
     
+    Served from an in-process cache of the filter_facets view; clients that
+    send the previous ETag in If-None-Match get 304 Not Modified.
+    
     Returns:
-        - news_categories: List of unique categories from news_articles
-        - news_sources: List of unique sources from news_articles
-        - job_sectors: List of unique sectors from jobs
+        - news_categories: List of unique categories of indexed news_articles
+        - news_sources: List of unique sources of indexed news_articles
+        - job_sectors: List of unique sectors of indexed jobs
+        - counts: Indexed record count per value
     """
     try:
-        categories = query_engine.get_news_categories()
-        sources = query_engine.get_news_sources()
-        sectors = query_engine.get_job_sectors()
-        
-        return FilterOptionsResponse(
-            news_categories=categories,
-            news_sources=sources,
-            job_sectors=sectors
+        etag, options = await run_blocking(
+            facets_cache.get_or_compute,
+            "filter_options",
+            lambda: _load_filter_options(query_engine)
         )
-    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get filter options: {str(e)}")
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return options
 
 
 @router.post("/generate-titles", response_model=TitleGenerationResponse)
-async def generate_titles(request: TitleGenerationRequest):
+async def generate_titles(
+    request: TitleGenerationRequest,
+    query_engine: PortalQueryEngine = Depends(get_query_engine)
+):
     """
     Generate blog titles using RAG with metadata filters
     
@@ -79,10 +147,13 @@ async def generate_titles(request: TitleGenerationRequest):
             if request.sector:
                 filters_applied["sector"] = request.sector
             
-            titles = query_engine.generate_titles_from_jobs(
+            titles = await run_blocking(
+                query_engine.generate_titles_from_jobs,
                 topic=topic,
                 sector=request.sector,
-                num_titles=request.count
+                num_titles=request.count,
+                search_mode=request.search_mode,
+                kind="llm"
             )
         
         elif request.source_type == "news":
@@ -91,12 +162,18 @@ async def generate_titles(request: TitleGenerationRequest):
                 filters_applied["category"] = request.category
             if request.source:
                 filters_applied["source"] = request.source
+            if request.recency_days:
+                filters_applied["recency_days"] = request.recency_days
             
-            titles = query_engine.generate_titles_from_news(
+            titles = await run_blocking(
+                query_engine.generate_titles_from_news,
                 topic=topic,
                 category=request.category,
                 source=request.source,
-                num_titles=request.count
+                num_titles=request.count,
+                recency_days=request.recency_days,
+                search_mode=request.search_mode,
+                kind="llm"
             )
         
         else:
@@ -118,10 +195,14 @@ async def generate_titles(request: TitleGenerationRequest):
 # ========== Content Library Endpoints ==========
 
 @router.post("/titles/save", response_model=dict)
-async def save_title(request: SaveTitleRequest):
+async def save_title(
+    request: SaveTitleRequest,
+    query_engine: PortalQueryEngine = Depends(get_db_query_engine)
+):
     """Save a generated title to the database"""
     try:
-        title_id = query_engine.save_title(
+        title_id = await run_blocking(
+            query_engine.save_title,
             source_type=request.source_type,
             topic=request.topic,
             title=request.title,
@@ -136,10 +217,27 @@ async def save_title(request: SaveTitleRequest):
 
 
 @router.post("/titles/list", response_model=List[SavedTitle])
-async def list_titles(request: ListTitlesRequest):
-    """Get saved titles with optional filters"""
+async def list_titles(
+    request: ListTitlesRequest,
+    response: Response,
+    query_engine: PortalQueryEngine = Depends(get_db_query_engine)
+):
+    """
+    Get saved titles with optional filters, newest first
+    
+    Pass the X-Next-Cursor response header as `cursor` to get the next page
+    (the header is absent on the last page). With `topic`, topics and titles
+    are searched (substring or fuzzy, indexed) and ranked by relevance; page
+    those results with `offset`.
+    """
+    try:
+        after = decode_cursor(request.cursor) if request.cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
-        titles = query_engine.get_titles(
+        titles = await run_blocking(
+            query_engine.get_titles,
             source_type=request.source_type,
             filter_sector=request.filter_sector,
             filter_category=request.filter_category,
@@ -147,9 +245,15 @@ async def list_titles(request: ListTitlesRequest):
             topic=request.topic,
             is_used=request.is_used,
             limit=request.limit,
-            offset=request.offset
+            offset=request.offset,
+            after=after
         )
         
+        # Topic searches are ranked by relevance, not keyset-paged
+        cursor = None if request.topic else next_cursor(titles, request.limit)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
+        
         # Convert to Pydantic models
         return [
             SavedTitle(
@@ -164,7 +268,8 @@ async def list_titles(request: ListTitlesRequest):
                 is_used=t.is_used,
                 used_count=t.used_count,
                 created_at=t.created_at.isoformat() if t.created_at else None,
-                created_by=t.created_by
+                created_by=t.created_by,
+                rank=getattr(t, "rank", None)
             )
             for t in titles
         ]
@@ -172,86 +277,276 @@ async def list_titles(request: ListTitlesRequest):
         raise HTTPException(status_code=500, detail=f"Failed to list titles: {str(e)}")
 
 
+async def _generate_social(query_engine: PortalQueryEngine, request: GenerateSocialContentRequest) -> dict:
+    """Generate and save one social media post (shared by sync requests and jobs)"""
+    # Generate content
+    content = await run_blocking(
+        query_engine.generate_social_content,
+        topic=request.topic,
+        title=request.title or "",
+        source_type=request.source_type,
+        tone=request.tone,
+        filter_sector=request.filter_sector,
+        filter_category=request.filter_category,
+        filter_source=request.filter_source,
+        recency_days=request.recency_days,
+        search_mode=request.search_mode,
+        kind="llm"
+    )
+    
+    # Save to database
+    content_id = await _save_social(query_engine, request, content)
+    
+    return {
+        "id": content_id,
+        "content": content,
+        "message": "Social content generated and saved successfully"
+    }
+
+
+async def _save_social(query_engine: PortalQueryEngine, request: GenerateSocialContentRequest, content: str) -> int:
+    """Save a generated social media post and return its id"""
+    return await run_blocking(
+        query_engine.save_social_content,
+        content=content,
+        source_type=request.source_type,
+        topic=request.topic,
+        title=request.title or "",
+        tone=request.tone,
+        title_id=request.title_id,
+        filter_sector=request.filter_sector,
+        filter_category=request.filter_category,
+        filter_source=request.filter_source
+    )
+
+
+async def _stream_and_save(
+    start: Callable[[], Iterator[str]],
+    save: Callable[[str], Awaitable[dict]],
+    label: str
+) -> AsyncIterator[str]:
+    """
+    Stream generated text as `token` events, then save it and send `done`
+    
+    Failures become an `error` event (the 200 status is already sent). If the
+    client disconnects mid-stream, nothing is saved.
+    """
+    try:
+        parts = []
+        async for delta in stream_blocking(start):
+            parts.append(delta)
+            yield sse_event("token", {"delta": delta})
+        yield sse_event("done", await save("".join(parts)))
+    except Exception as e:
+        yield sse_event("error", {"detail": f"Failed to generate {label}: {str(e)}"})
+
+
+def _submit_job(kind: str, run) -> JSONResponse:
+    """Queue a generation job and answer 202 with its id (503 if the queue is full)"""
+    try:
+        job = job_queue.submit(kind, run)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job.id, "status": job.status, "poll": f"{settings.api_prefix}/content/jobs/{job.id}"}
+    )
+
+
 @router.post("/social/generate", response_model=dict)
-async def generate_social_content(request: GenerateSocialContentRequest):
+async def generate_social_content(
+    request: GenerateSocialContentRequest,
+    mode: Literal["sync", "async"] = Query("sync", description="async: queue a job and return its id"),
+    query_engine: PortalQueryEngine = Depends(get_query_engine)
+):
     """Generate and save social media content"""
+    if mode == "async":
+        return _submit_job("social", lambda: _generate_social(query_engine, request))
+    
     try:
-        # Generate content
-        content = query_engine.generate_social_content(
+        return await _generate_social(query_engine, request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate social content: {str(e)}")
+
+
+@router.post("/social/generate/stream")
+async def stream_social_content(
+    request: GenerateSocialContentRequest,
+    query_engine: PortalQueryEngine = Depends(get_query_engine)
+):
+    """
+    Generate social media content as server-sent events
+    
+    Sends `token` events ({"delta": text}) as the LLM writes, then saves the
+    post and sends `done` ({"id": ...}), or `error` ({"detail": ...}).
+    """
+    def start():
+        return query_engine.stream_social_content(
             topic=request.topic,
             title=request.title or "",
             source_type=request.source_type,
             tone=request.tone,
             filter_sector=request.filter_sector,
             filter_category=request.filter_category,
-            filter_source=request.filter_source
-        )
-        
-        # Save to database
-        content_id = query_engine.save_social_content(
-            content=content,
-            source_type=request.source_type,
-            topic=request.topic,
-            title=request.title or "",
-            tone=request.tone,
-            title_id=request.title_id,
-            filter_sector=request.filter_sector,
-            filter_category=request.filter_category,
-            filter_source=request.filter_source
+            filter_source=request.filter_source,
+            recency_days=request.recency_days,
+            search_mode=request.search_mode
         )
-        
-        return {
-            "id": content_id,
-            "content": content,
-            "message": "Social content generated and saved successfully"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate social content: {str(e)}")
+    
+    async def save(text: str) -> dict:
+        content = text.strip()
+        return {"id": await _save_social(query_engine, request, content)}
+    
+    return StreamingResponse(
+        _stream_and_save(start, save, "social content"),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
 
 
 @router.post("/social/list", response_model=List[SavedSocialContent])
-async def list_social_content(request: ListContentRequest):
-    """Get saved social media content with optional filters"""
+async def list_social_content(
+    request: ListContentRequest,
+    query_engine: PortalQueryEngine = Depends(get_db_query_engine)
+):
+    """
+    Get saved social media content with optional filters, newest first
+    
+    Paged like /titles/list (cursor in, X-Next-Cursor out). Returns `fields`
+    only (default: everything but the full content, with a short preview);
+    GET /social/{content_id} has the whole post.
+    """
     try:
-        content_list = query_engine.get_social_content(
+        after = decode_cursor(request.cursor) if request.cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    fields = _resolve_fields(request.fields, SOCIAL_FIELDS, SOCIAL_SUMMARY_FIELDS)
+    
+    try:
+        content_list = await run_blocking(
+            query_engine.get_social_content,
             source_type=request.source_type,
             filter_sector=request.filter_sector,
             filter_category=request.filter_category,
             filter_source=request.filter_source,
             is_published=request.is_published,
             limit=request.limit,
-            offset=request.offset
+            offset=request.offset,
+            after=after,
+            fields=fields
         )
         
-        return [
-            SavedSocialContent(
-                id=c.id,
-                title_id=c.title_id,
-                source_type=c.source_type,
-                filter_sector=c.filter_sector,
-                filter_category=c.filter_category,
-                filter_source=c.filter_source,
-                topic=c.topic,
-                title=c.title,
-                content=c.content,
-                tone=c.tone,
-                is_published=c.is_published,
-                published_at=c.published_at.isoformat() if c.published_at else None,
-                created_at=c.created_at.isoformat() if c.created_at else None,
-                created_by=c.created_by
-            )
-            for c in content_list
-        ]
+        return _projected_response(content_list, fields, request.limit)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list social content: {str(e)}")
 
 
+@router.get("/social/{content_id}", response_model=SavedSocialContent)
+async def get_social_content(
+    content_id: int,
+    query_engine: PortalQueryEngine = Depends(get_db_query_engine)
+):
+    """Get one saved social media post, including its full content"""
+    c = await run_blocking(query_engine.get_social_content_item, content_id)
+    if c is None:
+        raise HTTPException(status_code=404, detail=f"Social content {content_id} not found")
+    
+    return SavedSocialContent(
+        id=c.id,
+        title_id=c.title_id,
+        source_type=c.source_type,
+        filter_sector=c.filter_sector,
+        filter_category=c.filter_category,
+        filter_source=c.filter_source,
+        topic=c.topic,
+        title=c.title,
+        content=c.content,
+        tone=c.tone,
+        is_published=c.is_published,
+        published_at=c.published_at.isoformat() if c.published_at else None,
+        created_at=c.created_at.isoformat() if c.created_at else None,
+        created_by=c.created_by
+    )
+
+
+async def _generate_blog(query_engine: PortalQueryEngine, request: GenerateBlogRequest) -> dict:
+    """Generate and save one blog (shared by sync requests and jobs)"""
+    # Generate blog
+    result = await run_blocking(
+        query_engine.generate_blog,
+        title=request.title,
+        topic=request.topic,
+        source_type=request.source_type,
+        tone=request.tone,
+        length=request.length,
+        filter_sector=request.filter_sector,
+        filter_category=request.filter_category,
+        filter_source=request.filter_source,
+        recency_days=request.recency_days,
+        search_mode=request.search_mode,
+        kind="llm"
+    )
+    
+    # Save to database
+    blog_id = await _save_blog(query_engine, request, result)
+    
+    return {
+        "id": blog_id,
+        "content": result["content"],
+        "word_count": result["word_count"],
+        "summary": result["summary"],
+        "message": "Blog generated and saved successfully"
+    }
+
+
+async def _save_blog(query_engine: PortalQueryEngine, request: GenerateBlogRequest, result: dict) -> int:
+    """Save a generated blog (content, word_count, summary) and return its id"""
+    return await run_blocking(
+        query_engine.save_blog,
+        title=request.title,
+        content=result["content"],
+        source_type=request.source_type,
+        tone=request.tone,
+        length=request.length,
+        word_count=result["word_count"],
+        summary=result["summary"],
+        title_id=request.title_id,
+        filter_sector=request.filter_sector,
+        filter_category=request.filter_category,
+        filter_source=request.filter_source
+    )
+
+
 @router.post("/blogs/generate", response_model=dict)
-async def generate_blog(request: GenerateBlogRequest):
+async def generate_blog(
+    request: GenerateBlogRequest,
+    mode: Literal["sync", "async"] = Query("sync", description="async: queue a job and return its id"),
+    query_engine: PortalQueryEngine = Depends(get_query_engine)
+):
     """Generate and save blog content"""
+    if mode == "async":
+        return _submit_job("blog", lambda: _generate_blog(query_engine, request))
+    
     try:
-        # Generate blog
-        result = query_engine.generate_blog(
+        return await _generate_blog(query_engine, request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate blog: {str(e)}")
+
+
+@router.post("/blogs/generate/stream")
+async def stream_blog(
+    request: GenerateBlogRequest,
+    query_engine: PortalQueryEngine = Depends(get_query_engine)
+):
+    """
+    Generate a blog as server-sent events
+    
+    Sends `token` events ({"delta": markdown}) as the LLM writes, then saves
+    the blog and sends `done` ({"id", "word_count", "summary"}), or `error`
+    ({"detail": ...}).
+    """
+    def start():
+        return query_engine.stream_blog(
             title=request.title,
             topic=request.topic,
             source_type=request.source_type,
@@ -259,74 +554,105 @@ async def generate_blog(request: GenerateBlogRequest):
             length=request.length,
             filter_sector=request.filter_sector,
             filter_category=request.filter_category,
-            filter_source=request.filter_source
-        )
-        
-        # Save to database
-        blog_id = query_engine.save_blog(
-            title=request.title,
-            content=result["content"],
-            source_type=request.source_type,
-            tone=request.tone,
-            length=request.length,
-            word_count=result["word_count"],
-            summary=result["summary"],
-            title_id=request.title_id,
-            filter_sector=request.filter_sector,
-            filter_category=request.filter_category,
-            filter_source=request.filter_source
+            filter_source=request.filter_source,
+            recency_days=request.recency_days,
+            search_mode=request.search_mode
         )
-        
-        return {
-            "id": blog_id,
-            "content": result["content"],
-            "word_count": result["word_count"],
-            "summary": result["summary"],
-            "message": "Blog generated and saved successfully"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate blog: {str(e)}")
+    
+    async def save(text: str) -> dict:
+        result = query_engine.blog_fields(text)
+        blog_id = await _save_blog(query_engine, request, result)
+        return {"id": blog_id, "word_count": result["word_count"], "summary": result["summary"]}
+    
+    return StreamingResponse(
+        _stream_and_save(start, save, "blog"),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
 
 
 @router.post("/blogs/list", response_model=List[SavedBlog])
-async def list_blogs(request: ListContentRequest):
-    """Get saved blogs with optional filters"""
+async def list_blogs(
+    request: ListContentRequest,
+    query_engine: PortalQueryEngine = Depends(get_db_query_engine)
+):
+    """
+    Get saved blogs with optional filters, newest first
+    
+    Paged like /titles/list (cursor in, X-Next-Cursor out). Returns `fields`
+    only (default: everything but the blog body, which is never read from the
+    database); GET /blogs/{blog_id} has the full blog.
+    """
     try:
-        blogs = query_engine.get_blogs(
+        after = decode_cursor(request.cursor) if request.cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    fields = _resolve_fields(request.fields, BLOG_FIELDS, BLOG_SUMMARY_FIELDS)
+    
+    try:
+        blogs = await run_blocking(
+            query_engine.get_blogs,
             source_type=request.source_type,
             filter_sector=request.filter_sector,
             filter_category=request.filter_category,
             filter_source=request.filter_source,
             is_published=request.is_published,
             limit=request.limit,
-            offset=request.offset
+            offset=request.offset,
+            after=after,
+            fields=fields
         )
         
-        return [
-            SavedBlog(
-                id=b.id,
-                title_id=b.title_id,
-                source_type=b.source_type,
-                filter_sector=b.filter_sector,
-                filter_category=b.filter_category,
-                filter_source=b.filter_source,
-                title=b.title,
-                content=b.content,
-                summary=b.summary,
-                tags=b.tags,
-                word_count=b.word_count,
-                tone=b.tone,
-                length=b.length,
-                is_published=b.is_published,
-                published_at=b.published_at.isoformat() if b.published_at else None,
-                published_url=b.published_url,
-                meta_description=b.meta_description,
-                keywords=b.keywords,
-                created_at=b.created_at.isoformat() if b.created_at else None,
-                updated_at=b.updated_at.isoformat() if b.updated_at else None,
-                created_by=b.created_by
-            )
-            for b in blogs
-        ]
+        return _projected_response(blogs, fields, request.limit)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list blogs: {str(e)}")
+
+
+@router.get("/blogs/{blog_id}", response_model=SavedBlog)
+async def get_blog(
+    blog_id: int,
+    query_engine: PortalQueryEngine = Depends(get_db_query_engine)
+):
+    """Get one saved blog, including its content"""
+    b = await run_blocking(query_engine.get_blog, blog_id)
+    if b is None:
+        raise HTTPException(status_code=404, detail=f"Blog {blog_id} not found")
+    
+    return SavedBlog(
+        id=b.id,
+        title_id=b.title_id,
+        source_type=b.source_type,
+        filter_sector=b.filter_sector,
+        filter_category=b.filter_category,
+        filter_source=b.filter_source,
+        title=b.title,
+        content=b.content,
+        summary=b.summary,
+        tags=b.tags,
+        word_count=b.word_count,
+        tone=b.tone,
+        length=b.length,
+        is_published=b.is_published,
+        published_at=b.published_at.isoformat() if b.published_at else None,
+        published_url=b.published_url,
+        meta_description=b.meta_description,
+        keywords=b.keywords,
+        created_at=b.created_at.isoformat() if b.created_at else None,
+        updated_at=b.updated_at.isoformat() if b.updated_at else None,
+        created_by=b.created_by
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=dict)
+async def get_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=30, description="Seconds to wait for the job to finish (long poll)")
+):
+    """Status of a generation job; `result` holds the route's usual response once it succeeds"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found (or expired)")
+    
+    if wait and not job.finished:
+        await job.wait(wait)
+    return job.to_dict()
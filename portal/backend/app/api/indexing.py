@@ -4,9 +4,11 @@ API endpoints for indexing statistics and monitoring
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import Dict
+from typing import Any, Dict
+from datetime import datetime
 import sys
 
+from core.cache import TTLCache
 from core.database import get_db
 from core.config import settings
 from schemas.indexing import (
@@ -23,35 +25,72 @@ from models import Job, NewsArticle, TNNews, AIJob
 
 router = APIRouter(prefix="/indexing", tags=["Indexing"])
 
+# Routes that query the database are plain `def`: FastAPI runs them in its
+# worker thread pool, so the blocking SQLAlchemy calls stay off the event loop
+
+TABLES = [
+    {"name": "jobs", "model": Job, "vector_table": f"{settings.vector_table_prefix}_jobs"},
+    {"name": "news_articles", "model": NewsArticle, "vector_table": f"{settings.vector_table_prefix}_news_articles"},
+    {"name": "tnnews", "model": TNNews, "vector_table": f"{settings.vector_table_prefix}_tnnews"},
+    {"name": "aijobs", "model": AIJob, "vector_table": f"{settings.vector_table_prefix}_aijobs"},
+]
+
+# Dashboard polling reads table counts from here; the tables are scanned at
+# most once per STATS_CACHE_TTL_SECONDS
+stats_cache = TTLCache(settings.stats_cache_ttl_seconds)
+
+
+def _table_counts(db: Session) -> Dict[str, Dict[str, Any]]:
+    """
+    Counts for every table, one aggregated query per table
+    
+    Returns:
+        {table_name: {total, indexed, indexed_today, last_updated}}
+    """
+    today = datetime.now().date()
+    counts = {}
+    
+    for table_config in TABLES:
+        model = table_config["model"]
+        is_indexed = model.index_status == 1
+        
+        total, indexed, indexed_today, last_updated = db.query(
+            func.count(model.id),
+            func.count(model.id).filter(is_indexed),
+            func.count(model.id).filter(is_indexed, func.date(model.updated_at) == today),
+            func.max(model.updated_at),
+        ).one()
+        
+        counts[table_config["name"]] = {
+            "total": total or 0,
+            "indexed": indexed or 0,
+            "indexed_today": indexed_today or 0,
+            "last_updated": last_updated,
+        }
+    
+    return counts
+
+
+def get_table_counts(db: Session) -> Dict[str, Dict[str, Any]]:
+    """Table counts from the short-TTL cache"""
+    return stats_cache.get_or_compute("table_counts", lambda: _table_counts(db))
+
 
 @router.get("/stats", response_model=IndexingStatsResponse)
-async def get_indexing_stats(db: Session = Depends(get_db)):
+def get_indexing_stats(db: Session = Depends(get_db)):
     """
     Get indexing statistics for all tables
     """
-    tables_config = [
-        {"name": "jobs", "model": Job, "vector_table": f"{settings.vector_table_prefix}_jobs"},
-        {"name": "news_articles", "model": NewsArticle, "vector_table": f"{settings.vector_table_prefix}_news_articles"},
-        {"name": "tnnews", "model": TNNews, "vector_table": f"{settings.vector_table_prefix}_tnnews"},
-        {"name": "aijobs", "model": AIJob, "vector_table": f"{settings.vector_table_prefix}_aijobs"},
-    ]
+    counts = get_table_counts(db)
     
     stats = {}
     total_records = 0
     total_indexed = 0
     
-    for table_config in tables_config:
+    for table_config in TABLES:
         table_name = table_config["name"]
-        model = table_config["model"]
-        
-        # Get total count
-        total = db.query(func.count(model.id)).scalar() or 0
-        
-        # Get indexed count (where index_status = 1)
-        indexed = db.query(func.count(model.id)).filter(model.index_status == 1).scalar() or 0
-        
-        # Get last updated
-        last_updated = db.query(func.max(model.updated_at)).scalar()
+        total = counts[table_name]["total"]
+        indexed = counts[table_name]["indexed"]
         
         # Calculate percentage
         percentage = (indexed / total * 100) if total > 0 else 0.0
@@ -62,7 +101,7 @@ async def get_indexing_stats(db: Session = Depends(get_db)):
             indexed_records=indexed,
             unindexed_records=total - indexed,
             index_percentage=round(percentage, 2),
-            last_updated=last_updated,
+            last_updated=counts[table_name]["last_updated"],
             vector_table=table_config["vector_table"]
         )
         
@@ -80,44 +119,24 @@ async def get_indexing_stats(db: Session = Depends(get_db)):
 
 
 @router.get("/dashboard", response_model=DashboardStats)
-async def get_dashboard_stats(db: Session = Depends(get_db)):
+def get_dashboard_stats(db: Session = Depends(get_db)):
     """
     Get overall dashboard statistics
     """
-    # Count records in each table
-    total_jobs = db.query(func.count(Job.id)).scalar() or 0
-    total_news = db.query(func.count(NewsArticle.id)).scalar() or 0
-    total_tnnews = db.query(func.count(TNNews.id)).scalar() or 0
-    total_aijobs = db.query(func.count(AIJob.id)).scalar() or 0
-    
-    # Count indexed today (you can modify this logic based on your needs)
-    from datetime import datetime, timedelta
-    today = datetime.now().date()
-    indexed_today = db.query(func.count(Job.id)).filter(
-        func.date(Job.updated_at) == today,
-        Job.index_status == 1
-    ).scalar() or 0
+    counts = get_table_counts(db)
     
     # Calculate overall indexing success rate
-    total_records = total_jobs + total_news + total_tnnews + total_aijobs
-    total_indexed = (
-        db.query(func.count(Job.id)).filter(Job.index_status == 1).scalar() or 0
-    ) + (
-        db.query(func.count(NewsArticle.id)).filter(NewsArticle.index_status == 1).scalar() or 0
-    ) + (
-        db.query(func.count(TNNews.id)).filter(TNNews.index_status == 1).scalar() or 0
-    ) + (
-        db.query(func.count(AIJob.id)).filter(AIJob.index_status == 1).scalar() or 0
-    )
-    
+    total_records = sum(c["total"] for c in counts.values())
+    total_indexed = sum(c["indexed"] for c in counts.values())
     success_rate = (total_indexed / total_records * 100) if total_records > 0 else 0.0
     
     return DashboardStats(
-        total_jobs=total_jobs,
-        total_news=total_news,
-        total_tnnews=total_tnnews,
-        total_aijobs=total_aijobs,
-        indexed_today=indexed_today,
+        total_jobs=counts["jobs"]["total"],
+        total_news=counts["news_articles"]["total"],
+        total_tnnews=counts["tnnews"]["total"],
+        total_aijobs=counts["aijobs"]["total"],
+        # Count indexed today (you can modify this logic based on your needs)
+        indexed_today=counts["jobs"]["indexed_today"],
         crawlers_active=0,  # TODO: Implement crawler status tracking
         indexing_success_rate=round(success_rate, 2)
     )
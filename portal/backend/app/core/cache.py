@@ -0,0 +1,57 @@
+"""
+Small in-process TTL cache for expensive, slowly changing API data
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe key/value cache whose entries expire after a fixed time
+
+    Values are computed at most once per key per TTL: concurrent callers on
+    an expired entry wait for the first one's result instead of all hitting
+    the database. Each key has its own lock, so a slow computation only
+    holds up callers of the same key.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        """
+        Args:
+            ttl_seconds: How long a computed value is served (0 disables caching)
+        """
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        # Guards _entries and _key_locks, never held while computing
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it if missing or expired"""
+        if self.ttl_seconds <= 0:
+            return compute()
+
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            value = compute()
+            with self._lock:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            return value
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one entry, or all entries when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -0,0 +1,43 @@
+"""
+Bounded thread-pool offload for blocking work in async routes
+
+PortalQueryEngine (retrieval, Azure OpenAI calls, SQLAlchemy sessions) is
+synchronous. Calling it directly from an `async def` route blocks the event
+loop, so one slow generation stalls every other request. Routes await
+run_blocking instead, which runs the call in a worker thread. LLM work and
+plain database work get separate limits, so long generations cannot use up
+the threads that quick listing queries need.
+"""
+from functools import partial
+from typing import Callable, Dict, TypeVar
+
+from anyio import CapacityLimiter, to_thread
+
+from .config import settings
+
+T = TypeVar("T")
+
+_limiters: Dict[str, CapacityLimiter] = {}
+
+
+def _limiter(kind: str) -> CapacityLimiter:
+    """Get the limiter for a kind of work (created inside the running event loop)"""
+    if kind not in _limiters:
+        total = settings.llm_concurrency if kind == "llm" else settings.db_thread_pool_size
+        _limiters[kind] = CapacityLimiter(total)
+    return _limiters[kind]
+
+
+async def run_blocking(func: Callable[..., T], *args, kind: str = "db", **kwargs) -> T:
+    """
+    Run a blocking call in a worker thread without blocking the event loop
+
+    Args:
+        func: Synchronous function to call
+        *args, **kwargs: Arguments for func
+        kind: 'llm' for retrieval + generation, 'db' for database-only work
+
+    Returns:
+        Whatever func returns (exceptions propagate to the caller)
+    """
+    return await to_thread.run_sync(partial(func, *args, **kwargs), limiter=_limiter(kind))
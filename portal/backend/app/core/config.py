@@ -31,6 +31,12 @@ class Settings(BaseSettings):
     azure_openai_llm_model: str = Field(default="gpt-4o", alias="AZURE_OPENAI_LLM_MODEL")
     azure_openai_api_version: str = Field(default="2024-02-15-preview", alias="AZURE_OPENAI_API_VERSION")
     
+    # Shared connection pool (core/database.py) - per worker process
+    db_pool_size: int = Field(default=10, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=20, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(default=30.0, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(default=1800, alias="DB_POOL_RECYCLE")
+    
     # Vector Configuration
     vector_dimension: int = Field(default=3072, alias="VECTOR_DIMENSION")
     vector_table_prefix: str = Field(default="llamaindex_embedding", alias="VECTOR_TABLE_PREFIX")
@@ -40,6 +46,30 @@ class Settings(BaseSettings):
     api_version: str = Field(default="1.0.0", alias="API_VERSION")
     api_prefix: str = Field(default="/api/v1", alias="API_PREFIX")
     
+    # Worker threads for blocking work in async routes (see core/concurrency.py)
+    llm_concurrency: int = Field(default=8, alias="LLM_CONCURRENCY")
+    db_thread_pool_size: int = Field(default=16, alias="DB_THREAD_POOL_SIZE")
+    
+    # Dashboard statistics are recomputed at most this often (0 = every request)
+    stats_cache_ttl_seconds: float = Field(default=30.0, alias="STATS_CACHE_TTL_SECONDS")
+    
+    # Filter options are re-read from the filter_facets view at most this often
+    facets_cache_ttl_seconds: float = Field(default=60.0, alias="FACETS_CACHE_TTL_SECONDS")
+    
+    # Background warm-up: requests wait this long for it before a 503
+    warmup_wait_seconds: float = Field(default=30.0, alias="WARMUP_WAIT_SECONDS")
+    warmup_news_partitions: int = Field(default=3, alias="WARMUP_NEWS_PARTITIONS")
+    # Failed warm-up attempts are retried after this delay, doubling up to the max
+    warmup_retry_initial_seconds: float = Field(default=5.0, alias="WARMUP_RETRY_INITIAL_SECONDS")
+    warmup_retry_max_seconds: float = Field(default=300.0, alias="WARMUP_RETRY_MAX_SECONDS")
+    
+    # Background generation jobs (services/jobs.py): workers per job type,
+    # jobs allowed to wait per type, and how long results stay pollable
+    job_workers_blog: int = Field(default=2, alias="JOB_WORKERS_BLOG")
+    job_workers_social: int = Field(default=4, alias="JOB_WORKERS_SOCIAL")
+    job_queue_max_depth: int = Field(default=100, alias="JOB_QUEUE_MAX_DEPTH")
+    job_result_ttl_seconds: float = Field(default=3600.0, alias="JOB_RESULT_TTL_SECONDS")
+    
     # CORS
     cors_origins: str = Field(default="http://localhost:5173", alias="CORS_ORIGINS")
     
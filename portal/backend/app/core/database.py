@@ -1,11 +1,20 @@
 """
 Database connection and session management
+
+`engine` is the portal's single connection pool: API sessions, the query
+engine's SQL and every vector store (SharedEnginePGVectorStore) check out
+connections from it, so one setting bounds the process's Postgres
+connections (DB_POOL_SIZE + DB_MAX_OVERFLOW per worker). Retrieval runs
+synchronously in worker threads; the vector stores' own async pools are
+never opened.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import QueuePool
+from typing import Any, Dict, Generator
+import threading
+import time
 import sys
-import os
 
 from .config import settings
 
@@ -15,12 +24,43 @@ sys.path.insert(0, settings.indexer_path)
 # Import existing models
 from models import Base, Job, NewsArticle, TNNews, AIJob
 
-# Create database engine
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkouts, time spent waiting for a connection and timeouts"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+# Create database engine (the shared pool)
 engine = create_engine(
     settings.database_url,
+    poolclass=InstrumentedQueuePool,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
     echo=False  # Set to True for SQL debugging
 )
 
@@ -44,6 +84,22 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def pool_stats() -> Dict[str, Any]:
+    """Current usage and cumulative wait statistics of the shared pool"""
+    pool = engine.pool
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": settings.db_max_overflow,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": pool.checkouts,
+        "timeouts": pool.timeouts,
+        "wait_seconds_avg": round(pool.wait_seconds_total / pool.checkouts, 6) if pool.checkouts else 0.0,
+        "wait_seconds_max": round(pool.wait_seconds_max, 6),
+    }
+
+
 def init_db() -> None:
     """
     Initialize database (if needed)
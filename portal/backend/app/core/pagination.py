@@ -0,0 +1,40 @@
+"""
+Keyset (cursor) pagination for content library listings
+
+Listings are ordered by (created_at DESC, id DESC). A cursor encodes the
+last row of a page, and the next page starts strictly after it. Unlike
+OFFSET, the database seeks straight to that position through the
+(..., created_at, id) indexes, so every page costs the same.
+"""
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor for the position after a row"""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor from encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def next_cursor(rows: list, limit: int) -> Optional[str]:
+    """Cursor for the page after `rows`, or None if this was the last page"""
+    if len(rows) < limit or rows[-1].created_at is None:
+        return None
+    return encode_cursor(rows[-1].created_at, rows[-1].id)
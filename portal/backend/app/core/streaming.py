@@ -0,0 +1,87 @@
+"""
+Server-sent events for streamed LLM output
+
+LlamaIndex streaming responses expose a blocking token generator
+(response_gen). stream_blocking starts the stream and drains it in a single
+worker thread, handing tokens to the event loop through a queue, so the
+event loop keeps serving other requests while the model writes. The whole
+stream holds one slot of the limiter, like a non-streamed generation.
+Events are formatted as text/event-stream frames with JSON data.
+"""
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Iterable
+
+from .concurrency import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Keep proxies (nginx) from buffering the stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+_END = object()
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """One server-sent event frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_blocking(start: Callable[[], Iterable[str]], kind: str = "llm") -> AsyncIterator[str]:
+    """
+    Yield from a blocking iterator without blocking the event loop
+
+    Args:
+        start: Called in the worker thread; returns the iterator to drain
+        kind: Limiter the worker thread counts against (see run_blocking)
+
+    Exceptions raised by start() or the iterator propagate to the consumer.
+    When the consumer stops early (client disconnected), the worker stops
+    at the next item and releases its slot.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def drain() -> None:
+        try:
+            for item in start():
+                if stop.is_set():
+                    return
+                loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, (_END, e))
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, (_END, None))
+
+    worker = asyncio.ensure_future(run_blocking(drain, kind=kind))
+    surfaced = False
+    try:
+        while True:
+            if queue.empty() and worker.done():
+                # drain never ran or exited without reporting (e.g. the thread
+                # could not be started): surface that instead of waiting forever
+                surfaced = True
+                worker.result()
+                raise RuntimeError("Stream worker stopped without finishing the stream")
+            next_item = asyncio.ensure_future(queue.get())
+            await asyncio.wait({next_item, worker}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_item.done():
+                next_item.cancel()
+                continue
+            item, error = next_item.result()
+            if error is not None:
+                raise error
+            if item is _END:
+                break
+            yield item
+    finally:
+        stop.set()
+        if not worker.done():
+            # The thread finishes at its next item; wait for it so its slot is
+            # released and any error is retrieved
+            await asyncio.wait({worker})
+        if not worker.cancelled() and worker.exception() is not None and not surfaced:
+            logger.warning(f"Stream worker failed: {worker.exception()}")
@@ -3,6 +3,8 @@ FastAPI application main entry point
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+import asyncio
 import uvicorn
 import sys
 from pathlib import Path
@@ -11,8 +13,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from core.config import settings
-from core.database import init_db
 from api import indexing, content
+from services import warmup
+from services.jobs import job_queue
+from core.database import pool_stats
 
 # Create FastAPI app
 app = FastAPI(
@@ -31,6 +35,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # Include routers
@@ -40,8 +45,15 @@ app.include_router(content.router, prefix=settings.api_prefix)
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
-    init_db()
+    """Start warming the database and query engine without delaying port binding"""
+    app.state.warmup_task = asyncio.create_task(warmup.warm_up())
+    job_queue.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the background job workers"""
+    await job_queue.stop()
 
 
 @app.get("/")
@@ -60,6 +72,25 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/pool")
+async def connection_pool():
+    """Shared database pool usage: checked out, overflow, wait time and timeouts"""
+    return pool_stats()
+
+
+@app.get("/jobs")
+async def job_metrics():
+    """Background job queues: depth, running jobs, outcomes and mean wait per job type"""
+    return job_queue.metrics()
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint: 503 until the query engine is warmed, then 200 with cold-start time"""
+    report = warmup.readiness()
+    return JSONResponse(report, status_code=200 if warmup.is_ready() else 503)
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "app.main:app",
@@ -2,7 +2,7 @@
 Pydantic schemas for content generation API
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Literal, Dict
 
 
 class ContentSearchRequest(BaseModel):
@@ -36,6 +36,10 @@ class FilterOptionsResponse(BaseModel):
     news_categories: List[str]
     news_sources: List[str]
     job_sectors: List[str]
+    counts: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict,
+        description="Indexed record count per value, keyed by news_categories / news_sources / job_sectors"
+    )
 
 
 class TitleGenerationRequest(BaseModel):
@@ -50,6 +54,8 @@ class TitleGenerationRequest(BaseModel):
     # Filters for news
     category: Optional[str] = Field(None, description="News category filter (only for news)")
     source: Optional[str] = Field(None, description="News source filter (only for news)")
+    recency_days: Optional[int] = Field(None, ge=1, description="Only use news scraped in the last N days (only for news)")
+    search_mode: Optional[Literal["vector", "hybrid", "binary"]] = Field(None, description="Retrieval mode: vector, hybrid (lexical + vector) or binary (quantized + rerank)")
 
 
 class TitleGenerationResponse(BaseModel):
@@ -92,6 +98,7 @@ class SavedTitle(BaseModel):
     used_count: int
     created_at: str
     created_by: Optional[str]
+    rank: Optional[float] = Field(default=None, description="Search relevance when listing by topic")
     
     class Config:
         from_attributes = True
@@ -114,10 +121,17 @@ class ListTitlesRequest(BaseModel):
     filter_sector: Optional[str] = None
     filter_category: Optional[str] = None
     filter_source: Optional[str] = None
-    topic: Optional[str] = None
+    topic: Optional[str] = Field(
+        default=None,
+        description="Search saved topics and titles (substring or fuzzy match, ranked)"
+    )
     is_used: Optional[bool] = None
     limit: int = Field(default=50, ge=1, le=200)
-    offset: int = Field(default=0, ge=0)
+    offset: int = Field(default=0, ge=0, description="Deprecated: use cursor")
+    cursor: Optional[str] = Field(
+        default=None,
+        description="X-Next-Cursor header value from the previous page"
+    )
 
 
 class SavedSocialContent(BaseModel):
@@ -130,7 +144,8 @@ class SavedSocialContent(BaseModel):
     filter_source: Optional[str]
     topic: Optional[str]
     title: Optional[str]
-    content: str
+    content: Optional[str] = None
+    preview: Optional[str] = Field(default=None, description="First characters of content (list summaries)")
     tone: Optional[str]
     is_published: bool
     published_at: Optional[str]
@@ -141,6 +156,12 @@ class SavedSocialContent(BaseModel):
         from_attributes = True
 
 
+# List endpoints return these fields unless the request names others;
+# full content is fetched per item (GET /content/social/{id})
+SOCIAL_FIELDS = list(SavedSocialContent.model_fields)
+SOCIAL_SUMMARY_FIELDS = [f for f in SOCIAL_FIELDS if f != "content"]
+
+
 class GenerateSocialContentRequest(BaseModel):
     """Request to generate social media content"""
     title_id: Optional[int] = None
@@ -151,6 +172,8 @@ class GenerateSocialContentRequest(BaseModel):
     filter_sector: Optional[str] = None
     filter_category: Optional[str] = None
     filter_source: Optional[str] = None
+    recency_days: Optional[int] = Field(None, ge=1, description="Only use news scraped in the last N days (only for news)")
+    search_mode: Optional[Literal["vector", "hybrid", "binary"]] = Field(None, description="Retrieval mode: vector, hybrid (lexical + vector) or binary (quantized + rerank)")
 
 
 class SavedBlog(BaseModel):
@@ -162,7 +185,7 @@ class SavedBlog(BaseModel):
     filter_category: Optional[str]
     filter_source: Optional[str]
     title: str
-    content: str
+    content: Optional[str] = None
     summary: Optional[str]
     tags: Optional[List[str]]
     word_count: Optional[int]
@@ -181,6 +204,11 @@ class SavedBlog(BaseModel):
         from_attributes = True
 
 
+# Blog listings leave out the body by default (GET /content/blogs/{id} has it)
+BLOG_FIELDS = list(SavedBlog.model_fields)
+BLOG_SUMMARY_FIELDS = [f for f in BLOG_FIELDS if f != "content"]
+
+
 class GenerateBlogRequest(BaseModel):
     """Request to generate blog content"""
     title_id: Optional[int] = None
@@ -192,6 +220,8 @@ class GenerateBlogRequest(BaseModel):
     filter_sector: Optional[str] = None
     filter_category: Optional[str] = None
     filter_source: Optional[str] = None
+    recency_days: Optional[int] = Field(None, ge=1, description="Only use news scraped in the last N days (only for news)")
+    search_mode: Optional[Literal["vector", "hybrid", "binary"]] = Field(None, description="Retrieval mode: vector, hybrid (lexical + vector) or binary (quantized + rerank)")
 
 
 class ListContentRequest(BaseModel):
@@ -202,4 +232,12 @@ class ListContentRequest(BaseModel):
     filter_source: Optional[str] = None
     is_published: Optional[bool] = None
     limit: int = Field(default=50, ge=1, le=200)
-    offset: int = Field(default=0, ge=0)
+    offset: int = Field(default=0, ge=0, description="Deprecated: use cursor")
+    cursor: Optional[str] = Field(
+        default=None,
+        description="X-Next-Cursor header value from the previous page"
+    )
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description="Fields to return (default: summary fields, without full content)"
+    )
@@ -0,0 +1,191 @@
+"""
+In-process background job queue for long-running content generation
+
+A generation request can hold an HTTP connection for tens of seconds
+(retrieval + LLM call + save), which ties up proxy connections and hits their
+timeouts. With ?mode=async the route submits the work here instead and
+returns a job id at once. Each job type has its own asyncio queue and a fixed
+number of worker tasks, so blog generations cannot starve social posts.
+Clients poll GET /content/jobs/{id}, optionally long-polling with ?wait=.
+
+Jobs live in this process's memory: they are lost on restart, and with
+several uvicorn workers a job is only visible to the worker that accepted it.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when a job type already has JOB_QUEUE_MAX_DEPTH jobs waiting"""
+
+
+class Job:
+    """One submitted generation and its outcome"""
+
+    def __init__(self, kind: str, run: Callable[[], Awaitable[Dict[str, Any]]]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._run = run
+        self._done = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    async def wait(self, timeout: float) -> None:
+        """Wait up to `timeout` seconds for the job to finish"""
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """Per-type bounded queues, each drained by a fixed number of workers"""
+
+    def __init__(self, workers: Dict[str, int], max_depth: int, result_ttl_seconds: float):
+        """
+        Args:
+            workers: Concurrent jobs allowed per job type
+            max_depth: Jobs that may wait per type before submit() refuses more
+            result_ttl_seconds: How long finished jobs stay available for polling
+        """
+        self.workers = workers
+        self.max_depth = max_depth
+        self.result_ttl_seconds = result_ttl_seconds
+        self._jobs: Dict[str, Job] = {}
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._tasks: list = []
+        self._running: Dict[str, int] = {kind: 0 for kind in workers}
+        self._counts: Dict[str, Dict[str, int]] = {
+            kind: {SUCCEEDED: 0, FAILED: 0} for kind in workers
+        }
+        self._wait_seconds: Dict[str, float] = {kind: 0.0 for kind in workers}
+
+    def start(self) -> None:
+        """Create the queues and worker tasks (inside the running event loop)"""
+        for kind, count in self.workers.items():
+            self._queues[kind] = asyncio.Queue(maxsize=self.max_depth)
+            for _ in range(count):
+                self._tasks.append(asyncio.create_task(self._worker(kind)))
+        logger.info(f"Job workers started: {self.workers}")
+
+    async def stop(self) -> None:
+        """Cancel the workers (queued and running jobs are dropped)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def submit(self, kind: str, run: Callable[[], Awaitable[Dict[str, Any]]]) -> Job:
+        """
+        Queue a job
+
+        Args:
+            kind: Job type (a key of `workers`)
+            run: Coroutine function doing the work; its return value is the result
+
+        Raises:
+            QueueFullError: If `max_depth` jobs of this type are already waiting
+        """
+        self._prune()
+        job = Job(kind, run)
+        try:
+            self._queues[kind].put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Too many queued {kind} jobs ({self.max_depth})")
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def _worker(self, kind: str) -> None:
+        queue = self._queues[kind]
+        while True:
+            job = await queue.get()
+            job.status = RUNNING
+            job.started_at = time.time()
+            self._wait_seconds[kind] += job.started_at - job.submitted_at
+            self._running[kind] += 1
+            try:
+                job.result = await job._run()
+                job.status = SUCCEEDED
+            except Exception as e:
+                job.error = str(e)
+                job.status = FAILED
+                logger.exception(f"{kind} job {job.id} failed")
+            finally:
+                if not job.finished:
+                    # Cancelled by stop()
+                    job.status = FAILED
+                    job.error = "Worker stopped"
+                job.finished_at = time.time()
+                self._running[kind] -= 1
+                self._counts[kind][job.status] += 1
+                job._done.set()
+                queue.task_done()
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than the result TTL"""
+        cutoff = time.time() - self.result_ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, running jobs, outcomes and mean queue wait per job type"""
+        metrics = {}
+        for kind, workers in self.workers.items():
+            queue = self._queues.get(kind)
+            started = sum(self._counts[kind].values()) + self._running[kind]
+            metrics[kind] = {
+                "workers": workers,
+                "queued": queue.qsize() if queue else 0,
+                "max_queued": self.max_depth,
+                "running": self._running[kind],
+                "succeeded": self._counts[kind][SUCCEEDED],
+                "failed": self._counts[kind][FAILED],
+                "avg_wait_seconds": round(self._wait_seconds[kind] / started, 3) if started else 0.0,
+            }
+        return metrics
+
+
+job_queue = JobQueue(
+    workers={"blog": settings.job_workers_blog, "social": settings.job_workers_social},
+    max_depth=settings.job_queue_max_depth,
+    result_ttl_seconds=settings.job_result_ttl_seconds,
+)
@@ -3,15 +3,19 @@ Portal Query Engine - Simplified for Blog Title Generation
 Uses LlamaIndex + PgVector with metadata filters
 """
 import logging
-from typing import List, Optional, Dict, Any
+import time
+from typing import List, Optional, Dict, Any, Iterator, Sequence, Tuple
 from pathlib import Path
-from llama_index.core import VectorStoreIndex
-from llama_index.core.vector_stores import MetadataFilters, MetadataFilter, FilterOperator
-from llama_index.vector_stores.postgres import PGVectorStore
+from llama_index.core import VectorStoreIndex, QueryBundle
+from llama_index.core.query_engine import RetrieverQueryEngine
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import NodeWithScore
+from llama_index.core.vector_stores import MetadataFilters, MetadataFilter, FilterOperator, VectorStoreQuery
 from llama_index.embeddings.azure_openai import AzureOpenAIEmbedding
 from llama_index.llms.azure_openai import AzureOpenAI
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, func, literal_column, or_, text, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import load_only, sessionmaker
 from datetime import datetime
 import os
 from dotenv import load_dotenv
@@ -26,16 +30,79 @@ from app.models.content import GeneratedTitle, GeneratedSocialContent, Generated
 env_path = Path(__file__).parent.parent.parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+# Shared helpers from the indexer project
+sys.path.insert(0, os.getenv('INDEXER_PATH', '../digitalgrub-indexer'))
+from news_partitions import list_partition_collections, months_in_window
+from hybrid_search import HybridRetriever
+from quantized_search import BinaryQuantizedRetriever
+from embeddings import NormalizedEmbedding, RemoteEmbedding
+from vector_store import InnerProductPGVectorStore, SharedEnginePGVectorStore
+from token_usage import ContextTokenReporter
+from near_duplicates import DuplicateCountPostprocessor
+from filter_facets import load_facets
+
+JOBS_COLLECTION = "llamaindex_embedding_jobs"
+NEWS_COLLECTION = "llamaindex_embedding_news_articles"
+
+# Characters of a social post returned as its list preview
+SOCIAL_PREVIEW_CHARS = 280
+
+# How long the presence (or absence) of generated_titles.search_text is trusted
+TITLE_SEARCH_CHECK_SECONDS = 300
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class PartitionedRetriever(BaseRetriever):
+    """
+    Fan a query out over monthly news partitions and keep the global top-k
+    
+    Vector similarities are comparable across partitions and are merged by
+    score. Hybrid RRF scores are not (each partition fuses its own lexical and
+    vector rankings), so with rrf_k the partitions are fused again by rank.
+    """
+    
+    def __init__(self, retrievers: List[BaseRetriever], similarity_top_k: int, rrf_k: Optional[int] = None):
+        """
+        Args:
+            retrievers: One retriever per partition
+            similarity_top_k: Nodes to return
+            rrf_k: Fuse partitions by rank with this RRF constant instead of by score
+        """
+        self._retrievers = retrievers
+        self._similarity_top_k = similarity_top_k
+        self._rrf_k = rrf_k
+        super().__init__()
+    
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        # The first retriever stores the query embedding on the bundle, so the
+        # query is only embedded once across partitions
+        nodes = []
+        for retriever in self._retrievers:
+            partition_nodes = retriever.retrieve(query_bundle)
+            if self._rrf_k is not None:
+                partition_nodes.sort(key=lambda node: node.score or 0.0, reverse=True)
+                for rank, node in enumerate(partition_nodes, start=1):
+                    node.score = 1.0 / (self._rrf_k + rank)
+            nodes.extend(partition_nodes)
+        
+        nodes.sort(key=lambda node: node.score or 0.0, reverse=True)
+        return nodes[:self._similarity_top_k]
+
+
 class PortalQueryEngine:
     """Query engine for portal with filtering capabilities"""
     
-    def __init__(self):
-        """Initialize connection to PgVector and Azure OpenAI"""
+    def __init__(self, engine: Optional[Engine] = None):
+        """
+        Initialize connection to PgVector and Azure OpenAI
+        
+        Args:
+            engine: Shared SQLAlchemy engine (connection pool) for all SQL and
+                    vector store queries; a private one is created if None
+        """
         
         # Database connection
         db_host = os.getenv('DB_HOST')
@@ -45,17 +112,29 @@ class PortalQueryEngine:
         db_password = os.getenv('DB_PASSWORD')
         
         self.db_url = f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        self.engine = create_engine(self.db_url)
+        self.engine = engine or create_engine(self.db_url, pool_pre_ping=True)
         self.Session = sessionmaker(bind=self.engine)
         
-        # Azure OpenAI Embedding
-        self.embed_model = AzureOpenAIEmbedding(
-            model="text-embedding-3-large",
-            deployment_name=os.getenv('AZURE_OPENAI_EMBEDDING_DEPLOYMENT'),
-            api_key=os.getenv('AZURE_OPENAI_API_KEY'),
-            azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
-            api_version=os.getenv('AZURE_OPENAI_API_VERSION'),
-        )
+        # Distance metric must match how the indexer stored the vectors
+        self.distance_metric = os.getenv('VECTOR_DISTANCE_METRIC', 'cosine')
+        
+        # Query embeddings: Azure OpenAI, or the host's shared embedding server
+        # (embedding_server.py in the indexer) so workers don't each load a model
+        if os.getenv('EMBEDDING_PROVIDER') == 'server':
+            self.embed_model = RemoteEmbedding(
+                base_url=os.getenv('EMBEDDING_SERVER_URL', 'http://127.0.0.1:8765')
+            )
+        else:
+            self.embed_model = AzureOpenAIEmbedding(
+                model="text-embedding-3-large",
+                deployment_name=os.getenv('AZURE_OPENAI_EMBEDDING_DEPLOYMENT'),
+                api_key=os.getenv('AZURE_OPENAI_API_KEY'),
+                azure_endpoint=os.getenv('AZURE_OPENAI_ENDPOINT'),
+                api_version=os.getenv('AZURE_OPENAI_API_VERSION'),
+            )
+        self.embed_dim = int(os.getenv('VECTOR_DIMENSION', '3072'))
+        if self.distance_metric == "inner_product":
+            self.embed_model = NormalizedEmbedding(self.embed_model)
         
         # Azure OpenAI LLM
         self.llm = AzureOpenAI(
@@ -66,81 +145,241 @@ class PortalQueryEngine:
             api_version=os.getenv('AZURE_OPENAI_API_VERSION'),
         )
         
-        # Initialize indexes (lazy loading)
-        self._jobs_index = None
-        self._news_index = None
+        # Initialize indexes (lazy loading), keyed by collection name
+        self._indexes: Dict[str, VectorStoreIndex] = {}
+        
+        # Monthly news partitions (see news_partitions.py in the indexer)
+        self.news_partitioned = os.getenv('NEWS_PARTITION_BY_MONTH', 'false').lower() == 'true'
+        
+        # Hybrid lexical + vector search (see hybrid_search.py in the indexer)
+        self.hybrid_search = os.getenv('HYBRID_SEARCH', 'false').lower() == 'true'
+        self.text_search_config = os.getenv('TEXT_SEARCH_CONFIG', 'tamil_english')
+        self.hybrid_rrf_k = int(os.getenv('HYBRID_RRF_K', '60'))
+        self.search_mode = "hybrid" if self.hybrid_search else "vector"
+        
+        # Binary-quantized candidate pass + exact rerank (search_mode='binary')
+        self.binary_rerank_candidates = int(os.getenv('BINARY_RERANK_CANDIDATES', '100'))
+        
+        # Logs LLM context tokens saved by excluded metadata keys per query
+        self.context_token_reporter = ContextTokenReporter()
+        
+        # (checked at, present) for generated_titles.search_text (see get_titles)
+        self._title_search_text = (float("-inf"), False)
+        
+        # Near-duplicates are not embedded; retrieved news carries their count instead
+        # (news_articles.duplicate_count exists once the indexer's migration 005 has run)
+        self.near_duplicates = os.getenv('NEWS_NEAR_DUPLICATES', 'false').lower() == 'true'
+        self.duplicate_counts = DuplicateCountPostprocessor(self.engine)
     
-    def _get_jobs_index(self) -> VectorStoreIndex:
-        """Get or create jobs vector index"""
-        if self._jobs_index is None:
-            vector_store = PGVectorStore.from_params(
+    def _get_index(self, collection_name: str) -> VectorStoreIndex:
+        """Get or create the vector index for a collection"""
+        if collection_name not in self._indexes:
+            store_class = InnerProductPGVectorStore if self.distance_metric == "inner_product" else SharedEnginePGVectorStore
+            vector_store = store_class.from_params(
                 database=os.getenv('DB_NAME'),
                 host=os.getenv('DB_HOST'),
                 password=os.getenv('DB_PASSWORD'),
                 port=int(os.getenv('DB_PORT')),
                 user=os.getenv('DB_USER'),
-                table_name="llamaindex_embedding_jobs",
-                embed_dim=3072,
-            )
+                table_name=collection_name,
+                embed_dim=self.embed_dim,
+                hybrid_search=self.hybrid_search,
+                text_search_config=self.text_search_config,
+            ).share_engine(self.engine)
             
-            self._jobs_index = VectorStoreIndex.from_vector_store(
+            self._indexes[collection_name] = VectorStoreIndex.from_vector_store(
                 vector_store=vector_store,
                 embed_model=self.embed_model,
             )
-            logger.info("Jobs index initialized")
+            logger.info(f"Index initialized: {collection_name}")
         
-        return self._jobs_index
+        return self._indexes[collection_name]
+    
+    def warm_up(self, news_partitions: int = 3) -> Dict[str, float]:
+        """
+        Open connections and initialize vector stores before the first request
+        
+        Embeds one query (warming the embedding client's connection) and runs
+        a top-1 search on the jobs collection and the newest news collections,
+        which initializes each store and its connection pool.
+        
+        Args:
+            news_partitions: Newest monthly news partitions to warm (when partitioned)
+        
+        Returns:
+            Seconds spent per step
+        """
+        timings = {}
+        
+        start = time.perf_counter()
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        timings["database"] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        query_embedding = self.embed_model.get_query_embedding("warm-up")
+        timings["embedding"] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        collections = [JOBS_COLLECTION] + self._get_news_collections()[:news_partitions]
+        for collection_name in collections:
+            self._get_index(collection_name).vector_store.query(
+                VectorStoreQuery(query_embedding=query_embedding, similarity_top_k=1)
+            )
+        timings["vector_stores"] = time.perf_counter() - start
+        
+        logger.info(f"Query engine warmed ({len(collections)} collections): {timings}")
+        return timings
+    
+    def _get_jobs_index(self) -> VectorStoreIndex:
+        """Get or create jobs vector index"""
+        return self._get_index(JOBS_COLLECTION)
     
     def _get_news_index(self) -> VectorStoreIndex:
         """Get or create news vector index"""
-        if self._news_index is None:
-            vector_store = PGVectorStore.from_params(
-                database=os.getenv('DB_NAME'),
-                host=os.getenv('DB_HOST'),
-                password=os.getenv('DB_PASSWORD'),
-                port=int(os.getenv('DB_PORT')),
-                user=os.getenv('DB_USER'),
-                table_name="llamaindex_embedding_news_articles",
-                embed_dim=3072,
+        return self._get_index(NEWS_COLLECTION)
+    
+    def _get_news_collections(self, recency_days: Optional[int] = None) -> List[str]:
+        """
+        Get the news collections to search
+        
+        With monthly partitioning, only partitions inside the recency window are
+        returned (the window is rounded out to whole months); otherwise the single
+        news collection is searched and recency_days is ignored.
+        """
+        if not self.news_partitioned:
+            return [NEWS_COLLECTION]
+        
+        with self.engine.connect() as conn:
+            partitions = list_partition_collections(conn, NEWS_COLLECTION)
+        
+        if recency_days:
+            wanted = {f"{NEWS_COLLECTION}_{suffix}" for suffix in months_in_window(recency_days)}
+            partitions = [p for p in partitions if p in wanted]
+        
+        logger.info(f"Searching {len(partitions)} news partitions: {partitions}")
+        return partitions
+    
+    def _get_retriever(
+        self,
+        collection_name: str,
+        similarity_top_k: int,
+        filters: Optional[MetadataFilters],
+        search_mode: str,
+        lexical_query: Optional[str]
+    ) -> BaseRetriever:
+        """Create a vector, hybrid or binary-quantized retriever over one collection"""
+        if search_mode == "hybrid":
+            return HybridRetriever(
+                engine=self.engine,
+                collection_name=collection_name,
+                embed_model=self.embed_model,
+                similarity_top_k=similarity_top_k,
+                filters=filters,
+                lexical_query=lexical_query,
+                text_search_config=self.text_search_config,
+                rrf_k=self.hybrid_rrf_k,
+                distance_metric=self.distance_metric,
             )
-            
-            self._news_index = VectorStoreIndex.from_vector_store(
-                vector_store=vector_store,
+        
+        if search_mode == "binary":
+            return BinaryQuantizedRetriever(
+                engine=self.engine,
+                collection_name=collection_name,
                 embed_model=self.embed_model,
+                similarity_top_k=similarity_top_k,
+                filters=filters,
+                rerank_candidates=self.binary_rerank_candidates,
+                distance_metric=self.distance_metric,
             )
-            logger.info("News index initialized")
         
-        return self._news_index
+        return self._get_index(collection_name).as_retriever(
+            similarity_top_k=similarity_top_k,
+            filters=filters
+        )
     
-    def get_news_categories(self) -> List[str]:
-        """Get unique categories from news_articles table"""
-        query = "SELECT DISTINCT category FROM news_articles WHERE category IS NOT NULL ORDER BY category"
+    def _build_query_engine(
+        self,
+        source_type: str,
+        similarity_top_k: int,
+        filters: Optional[MetadataFilters] = None,
+        recency_days: Optional[int] = None,
+        search_mode: Optional[str] = None,
+        lexical_query: Optional[str] = None,
+        streaming: bool = False
+    ) -> RetrieverQueryEngine:
+        """
+        Build a query engine over jobs or news
+        
+        Args:
+            source_type: 'jobs' or 'news'
+            similarity_top_k: Number of nodes passed to the LLM
+            filters: Optional metadata filters
+            recency_days: Only search news partitions inside this window
+            search_mode: 'vector', 'hybrid' or 'binary' (defaults to HYBRID_SEARCH)
+            lexical_query: Keywords for the full-text side of hybrid search
+            streaming: Return streaming responses (tokens from response_gen)
+        """
+        search_mode = search_mode or self.search_mode
+        
+        if source_type == "jobs":
+            collections = [JOBS_COLLECTION]
+        else:
+            collections = self._get_news_collections(recency_days)
+        
+        retrievers = [
+            self._get_retriever(c, similarity_top_k, filters, search_mode, lexical_query)
+            for c in collections
+        ]
+        
+        if len(retrievers) == 1:
+            retriever = retrievers[0]
+        else:
+            retriever = PartitionedRetriever(
+                retrievers=retrievers,
+                similarity_top_k=similarity_top_k,
+                rrf_k=self.hybrid_rrf_k if search_mode == "hybrid" else None
+            )
+        
+        postprocessors = [self.context_token_reporter]
+        if source_type == "news" and self.near_duplicates:
+            postprocessors.insert(0, self.duplicate_counts)
+        
+        return RetrieverQueryEngine.from_args(
+            retriever,
+            llm=self.llm,
+            node_postprocessors=postprocessors,
+            streaming=streaming
+        )
+    
+    def get_filter_facets(self) -> Dict[str, List[tuple]]:
+        """
+        Get filter values with indexed record counts from the filter_facets view
+        
+        Returns:
+            {'news_category' | 'news_source' | 'job_sector': [(value, count), ...]}
+        """
         with self.engine.connect() as conn:
-            result = conn.execute(text(query))
-            categories = [row[0] for row in result]
-        return categories
+            return load_facets(conn)
+    
+    def get_news_categories(self) -> List[str]:
+        """Get unique categories of indexed news articles"""
+        return [value for value, _ in self.get_filter_facets().get("news_category", [])]
     
     def get_news_sources(self) -> List[str]:
-        """Get unique sources from news_articles table"""
-        query = "SELECT DISTINCT source FROM news_articles WHERE source IS NOT NULL ORDER BY source"
-        with self.engine.connect() as conn:
-            result = conn.execute(text(query))
-            sources = [row[0] for row in result]
-        return sources
+        """Get unique sources of indexed news articles"""
+        return [value for value, _ in self.get_filter_facets().get("news_source", [])]
     
     def get_job_sectors(self) -> List[str]:
-        """Get unique sectors from jobs table"""
-        query = "SELECT DISTINCT sector FROM jobs WHERE sector IS NOT NULL ORDER BY sector"
-        with self.engine.connect() as conn:
-            result = conn.execute(text(query))
-            sectors = [row[0] for row in result]
-        return sectors
+        """Get unique sectors of indexed jobs"""
+        return [value for value, _ in self.get_filter_facets().get("job_sector", [])]
     
     def generate_titles_from_jobs(
         self,
         topic: str,
         sector: Optional[str] = None,
-        num_titles: int = 5
+        num_titles: int = 5,
+        search_mode: Optional[str] = None
     ) -> List[str]:
         """
         Generate blog titles using job data with optional sector filter
@@ -149,12 +388,11 @@ class PortalQueryEngine:
             topic: Topic for blog titles
             sector: Optional sector filter (e.g., "Technology", "Healthcare")
             num_titles: Number of titles to generate
+            search_mode: 'vector', 'hybrid' or 'binary' (defaults to HYBRID_SEARCH)
         
         Returns:
             List of blog titles
         """
-        index = self._get_jobs_index()
-        
         # Build filters
         filters = None
         if sector:
@@ -169,10 +407,12 @@ class PortalQueryEngine:
             )
         
         # Create query engine with filters
-        query_engine = index.as_query_engine(
+        query_engine = self._build_query_engine(
+            "jobs",
             similarity_top_k=10,
             filters=filters,
-            llm=self.llm
+            search_mode=search_mode,
+            lexical_query=topic
         )
         
         # Create prompt
@@ -207,7 +447,9 @@ Return only the titles, one per line, without numbering."""
         topic: str,
         category: Optional[str] = None,
         source: Optional[str] = None,
-        num_titles: int = 5
+        num_titles: int = 5,
+        recency_days: Optional[int] = None,
+        search_mode: Optional[str] = None
     ) -> List[str]:
         """
         Generate blog titles using news data with optional category/source filters
@@ -217,12 +459,12 @@ Return only the titles, one per line, without numbering."""
             category: Optional category filter
             source: Optional source filter
             num_titles: Number of titles to generate
+            recency_days: Only search news scraped in the last N days (monthly partitions)
+            search_mode: 'vector', 'hybrid' or 'binary' (defaults to HYBRID_SEARCH)
         
         Returns:
             List of blog titles
         """
-        index = self._get_news_index()
-        
         # Build filters
         filter_list = []
         if category:
@@ -245,10 +487,13 @@ Return only the titles, one per line, without numbering."""
         filters = MetadataFilters(filters=filter_list) if filter_list else None
         
         # Create query engine with filters
-        query_engine = index.as_query_engine(
+        query_engine = self._build_query_engine(
+            "news",
             similarity_top_k=10,
             filters=filters,
-            llm=self.llm
+            recency_days=recency_days,
+            search_mode=search_mode,
+            lexical_query=topic
         )
         
         # Create prompt
@@ -347,6 +592,26 @@ Return only the titles, one per line, without numbering."""
         finally:
             session.close()
     
+    def _has_title_search_text(self, session) -> bool:
+        """
+        Whether generated_titles has the search_text column
+        
+        The answer is cached for TITLE_SEARCH_CHECK_SECONDS either way, so a
+        missing column is noticed (and logged) once per interval, not per call.
+        """
+        checked_at, present = self._title_search_text
+        if time.monotonic() - checked_at < TITLE_SEARCH_CHECK_SECONDS:
+            return present
+        
+        present = session.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND column_name = 'search_text')"
+        ), {"table": GeneratedTitle.__tablename__}).scalar()
+        if not present:
+            logger.warning("generated_titles.search_text missing (run migrate.py in the indexer) - using ILIKE title search")
+        self._title_search_text = (time.monotonic(), present)
+        return present
+    
     def get_titles(
         self,
         source_type: Optional[str] = None,
@@ -356,12 +621,38 @@ Return only the titles, one per line, without numbering."""
         topic: Optional[str] = None,
         is_used: Optional[bool] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        after: Optional[Tuple[datetime, int]] = None
     ) -> List[GeneratedTitle]:
-        """Get saved titles with filters"""
+        """
+        Get saved titles with filters, newest first
+        
+        Page with `after` (the (created_at, id) of the previous page's last
+        row); `offset` is kept for older clients but scans skipped rows.
+        
+        With `topic`, topics and titles are searched through the trigram
+        index on generated_titles.search_text (substring or fuzzy word
+        match) and results are ranked by word similarity instead; `after`
+        does not apply to ranked results. Each title gets a `rank` attribute.
+        Until the indexer's migration 008 has added search_text, topics and
+        titles are matched with plain ILIKE, unranked.
+        """
         session = self.Session()
         try:
-            query = session.query(GeneratedTitle)
+            rank = None
+            if topic and not self._has_title_search_text(session):
+                query = session.query(GeneratedTitle).filter(or_(
+                    GeneratedTitle.topic.ilike(f"%{topic}%"),
+                    GeneratedTitle.title.ilike(f"%{topic}%")
+                ))
+            elif topic:
+                search_text = literal_column(f"{GeneratedTitle.__tablename__}.search_text")
+                rank = func.word_similarity(topic, search_text).label("rank")
+                query = session.query(GeneratedTitle, rank).filter(
+                    or_(search_text.ilike(f"%{topic}%"), search_text.op("%>")(topic))
+                )
+            else:
+                query = session.query(GeneratedTitle)
             
             if source_type:
                 query = query.filter(GeneratedTitle.source_type == source_type)
@@ -371,15 +662,29 @@ Return only the titles, one per line, without numbering."""
                 query = query.filter(GeneratedTitle.filter_category == filter_category)
             if filter_source:
                 query = query.filter(GeneratedTitle.filter_source == filter_source)
-            if topic:
-                query = query.filter(GeneratedTitle.topic.ilike(f"%{topic}%"))
             if is_used is not None:
                 query = query.filter(GeneratedTitle.is_used == is_used)
             
-            query = query.order_by(GeneratedTitle.created_at.desc())
-            query = query.limit(limit).offset(offset)
+            if rank is not None:
+                query = query.order_by(rank.desc(), GeneratedTitle.created_at.desc(), GeneratedTitle.id.desc())
+            else:
+                # Keyset pagination: seek past the previous page's last row
+                if after is not None:
+                    query = query.filter(tuple_(GeneratedTitle.created_at, GeneratedTitle.id) < tuple_(*after))
+                query = query.order_by(GeneratedTitle.created_at.desc(), GeneratedTitle.id.desc())
+            
+            query = query.limit(limit)
+            if offset:
+                query = query.offset(offset)
+            
+            if rank is None:
+                return query.all()
             
-            return query.all()
+            titles = []
+            for title, score in query.all():
+                title.rank = score
+                titles.append(title)
+            return titles
         finally:
             session.close()
     
@@ -391,15 +696,56 @@ Return only the titles, one per line, without numbering."""
         tone: str = "professional",
         filter_sector: Optional[str] = None,
         filter_category: Optional[str] = None,
-        filter_source: Optional[str] = None
+        filter_source: Optional[str] = None,
+        recency_days: Optional[int] = None,
+        search_mode: Optional[str] = None
     ) -> str:
         """Generate social media content based on title and filters"""
-        # Choose index based on source type
-        if source_type == "jobs":
-            index = self._get_jobs_index()
-        else:
-            index = self._get_news_index()
+        query_engine, prompt = self._prepare_social_content(
+            topic, title, source_type, tone, filter_sector, filter_category,
+            filter_source, recency_days, search_mode
+        )
+        response = query_engine.query(prompt)
+        return str(response).strip()
+    
+    def stream_social_content(
+        self,
+        topic: str,
+        title: str,
+        source_type: str,
+        tone: str = "professional",
+        filter_sector: Optional[str] = None,
+        filter_category: Optional[str] = None,
+        filter_source: Optional[str] = None,
+        recency_days: Optional[int] = None,
+        search_mode: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Like generate_social_content, but yield the text as the LLM produces it
         
+        Retrieval runs (and the LLM call starts) before this returns; iterating
+        blocks for each token.
+        """
+        query_engine, prompt = self._prepare_social_content(
+            topic, title, source_type, tone, filter_sector, filter_category,
+            filter_source, recency_days, search_mode, streaming=True
+        )
+        return query_engine.query(prompt).response_gen
+    
+    def _prepare_social_content(
+        self,
+        topic: str,
+        title: str,
+        source_type: str,
+        tone: str,
+        filter_sector: Optional[str],
+        filter_category: Optional[str],
+        filter_source: Optional[str],
+        recency_days: Optional[int],
+        search_mode: Optional[str],
+        streaming: bool = False
+    ) -> Tuple[RetrieverQueryEngine, str]:
+        """Query engine and prompt for a social media post"""
         # Build filters
         filter_list = []
         if source_type == "jobs" and filter_sector:
@@ -413,10 +759,14 @@ Return only the titles, one per line, without numbering."""
         filters = MetadataFilters(filters=filter_list) if filter_list else None
         
         # Create query engine
-        query_engine = index.as_query_engine(
+        query_engine = self._build_query_engine(
+            source_type,
             similarity_top_k=5,
             filters=filters,
-            llm=self.llm
+            recency_days=recency_days,
+            search_mode=search_mode,
+            lexical_query=f"{title} {topic}",
+            streaming=streaming
         )
         
         # Create prompt based on tone
@@ -435,8 +785,7 @@ Requirements:
 
 Return only the social media content text."""
 
-        response = query_engine.query(prompt)
-        return str(response).strip()
+        return query_engine, prompt
     
     def save_social_content(
         self,
@@ -486,9 +835,19 @@ Return only the social media content text."""
         filter_source: Optional[str] = None,
         is_published: Optional[bool] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        after: Optional[Tuple[datetime, int]] = None,
+        fields: Optional[Sequence[str]] = None
     ) -> List[GeneratedSocialContent]:
-        """Get saved social content with filters"""
+        """
+        Get saved social content with filters, newest first
+        
+        Page with `after` (the (created_at, id) of the previous page's last
+        row); `offset` is kept for older clients but scans skipped rows.
+        
+        `fields` limits the columns loaded (all if None); 'preview' loads the
+        first SOCIAL_PREVIEW_CHARS of content instead of the whole post.
+        """
         session = self.Session()
         try:
             query = session.query(GeneratedSocialContent)
@@ -504,10 +863,30 @@ Return only the social media content text."""
             if is_published is not None:
                 query = query.filter(GeneratedSocialContent.is_published == is_published)
             
-            query = query.order_by(GeneratedSocialContent.created_at.desc())
-            query = query.limit(limit).offset(offset)
+            # Keyset pagination: seek past the previous page's last row
+            if after is not None:
+                query = query.filter(tuple_(GeneratedSocialContent.created_at, GeneratedSocialContent.id) < tuple_(*after))
+            
+            query = self._load_fields(query, GeneratedSocialContent, fields)
+            with_preview = fields is not None and "preview" in fields
+            if with_preview:
+                query = query.add_columns(
+                    func.left(GeneratedSocialContent.content, SOCIAL_PREVIEW_CHARS).label("preview")
+                )
+            
+            query = query.order_by(GeneratedSocialContent.created_at.desc(), GeneratedSocialContent.id.desc())
+            query = query.limit(limit)
+            if offset:
+                query = query.offset(offset)
             
-            return query.all()
+            if not with_preview:
+                return query.all()
+            
+            items = []
+            for item, preview in query.all():
+                item.preview = preview
+                items.append(item)
+            return items
         finally:
             session.close()
     
@@ -520,15 +899,74 @@ Return only the social media content text."""
         length: str = "medium",
         filter_sector: Optional[str] = None,
         filter_category: Optional[str] = None,
-        filter_source: Optional[str] = None
+        filter_source: Optional[str] = None,
+        recency_days: Optional[int] = None,
+        search_mode: Optional[str] = None
     ) -> Dict[str, Any]:
         """Generate blog content based on title and filters"""
-        # Choose index based on source type
-        if source_type == "jobs":
-            index = self._get_jobs_index()
-        else:
-            index = self._get_news_index()
+        query_engine, prompt = self._prepare_blog(
+            title, topic, source_type, tone, length, filter_sector,
+            filter_category, filter_source, recency_days, search_mode
+        )
+        response = query_engine.query(prompt)
+        return self.blog_fields(str(response))
+    
+    def stream_blog(
+        self,
+        title: str,
+        topic: str,
+        source_type: str,
+        tone: str = "professional",
+        length: str = "medium",
+        filter_sector: Optional[str] = None,
+        filter_category: Optional[str] = None,
+        filter_source: Optional[str] = None,
+        recency_days: Optional[int] = None,
+        search_mode: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Like generate_blog, but yield the markdown as the LLM produces it
+        
+        Pass the assembled text to blog_fields() for the word count and summary.
+        """
+        query_engine, prompt = self._prepare_blog(
+            title, topic, source_type, tone, length, filter_sector,
+            filter_category, filter_source, recency_days, search_mode, streaming=True
+        )
+        return query_engine.query(prompt).response_gen
+    
+    @staticmethod
+    def blog_fields(content: str) -> Dict[str, Any]:
+        """Content, word count and summary of a generated blog"""
+        content = content.strip()
+        
+        # Count words
+        word_count = len(content.split())
+        
+        # Generate summary (first 200 chars)
+        summary = content[:200] + "..." if len(content) > 200 else content
         
+        return {
+            "content": content,
+            "word_count": word_count,
+            "summary": summary
+        }
+    
+    def _prepare_blog(
+        self,
+        title: str,
+        topic: str,
+        source_type: str,
+        tone: str,
+        length: str,
+        filter_sector: Optional[str],
+        filter_category: Optional[str],
+        filter_source: Optional[str],
+        recency_days: Optional[int],
+        search_mode: Optional[str],
+        streaming: bool = False
+    ) -> Tuple[RetrieverQueryEngine, str]:
+        """Query engine and prompt for a blog post"""
         # Build filters
         filter_list = []
         if source_type == "jobs" and filter_sector:
@@ -542,10 +980,14 @@ Return only the social media content text."""
         filters = MetadataFilters(filters=filter_list) if filter_list else None
         
         # Create query engine
-        query_engine = index.as_query_engine(
+        query_engine = self._build_query_engine(
+            source_type,
             similarity_top_k=10,
             filters=filters,
-            llm=self.llm
+            recency_days=recency_days,
+            search_mode=search_mode,
+            lexical_query=f"{title} {topic}",
+            streaming=streaming
         )
         
         # Determine target word count based on length
@@ -569,20 +1011,7 @@ Requirements:
 
 Return the blog content in markdown format with proper headings."""
 
-        response = query_engine.query(prompt)
-        content = str(response).strip()
-        
-        # Count words
-        word_count = len(content.split())
-        
-        # Generate summary (first 200 chars)
-        summary = content[:200] + "..." if len(content) > 200 else content
-        
-        return {
-            "content": content,
-            "word_count": word_count,
-            "summary": summary
-        }
+        return query_engine, prompt
     
     def save_blog(
         self,
@@ -636,9 +1065,19 @@ Return the blog content in markdown format with proper headings."""
         filter_source: Optional[str] = None,
         is_published: Optional[bool] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        after: Optional[Tuple[datetime, int]] = None,
+        fields: Optional[Sequence[str]] = None
     ) -> List[GeneratedBlog]:
-        """Get saved blogs with filters"""
+        """
+        Get saved blogs with filters, newest first
+        
+        Page with `after` (the (created_at, id) of the previous page's last
+        row); `offset` is kept for older clients but scans skipped rows.
+        
+        `fields` limits the columns loaded (all if None), so list pages
+        don't read blog bodies.
+        """
         session = self.Session()
         try:
             query = session.query(GeneratedBlog)
@@ -654,9 +1093,42 @@ Return the blog content in markdown format with proper headings."""
             if is_published is not None:
                 query = query.filter(GeneratedBlog.is_published == is_published)
             
-            query = query.order_by(GeneratedBlog.created_at.desc())
-            query = query.limit(limit).offset(offset)
+            # Keyset pagination: seek past the previous page's last row
+            if after is not None:
+                query = query.filter(tuple_(GeneratedBlog.created_at, GeneratedBlog.id) < tuple_(*after))
+            
+            query = query.order_by(GeneratedBlog.created_at.desc(), GeneratedBlog.id.desc())
+            query = query.limit(limit)
+            if offset:
+                query = query.offset(offset)
             
-            return query.all()
+            return self._load_fields(query, GeneratedBlog, fields).all()
         finally:
             session.close()
+    
+    def get_blog(self, blog_id: int) -> Optional[GeneratedBlog]:
+        """Get one saved blog with all fields"""
+        session = self.Session()
+        try:
+            return session.get(GeneratedBlog, blog_id)
+        finally:
+            session.close()
+    
+    def get_social_content_item(self, content_id: int) -> Optional[GeneratedSocialContent]:
+        """Get one saved social media post with all fields"""
+        session = self.Session()
+        try:
+            return session.get(GeneratedSocialContent, content_id)
+        finally:
+            session.close()
+    
+    @staticmethod
+    def _load_fields(query, model, fields: Optional[Sequence[str]]):
+        """
+        Load only the table columns in `fields` (plus id and created_at for
+        paging); the rest stay deferred and are never read from the database
+        """
+        if fields is None:
+            return query
+        columns = [getattr(model, f) for f in fields if f in model.__table__.columns]
+        return query.options(load_only(model.id, model.created_at, *columns))
@@ -0,0 +1,140 @@
+"""
+Background warm-up of the PortalQueryEngine singleton
+
+Building the engine creates Azure OpenAI clients, and the first search
+initializes each PGVectorStore and its connection pool. Doing that at import
+time kept the app from binding its port; doing it on the first request made
+that request slow. At startup the app now binds immediately while
+warm_up() builds and warms the engine in a worker thread. /ready reports 503
+until it finishes, and routes that need the engine wait for it (bounded).
+
+A failed attempt (database or embedding endpoint down) is retried with
+exponential backoff, so the app recovers without a restart. Routes that only
+read saved content from the database use get_db_query_engine, which needs the
+engine built but not warmed, so an embedding outage does not take them down.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+from fastapi import HTTPException
+
+from core.concurrency import run_blocking
+from core.config import settings
+from core.database import engine, init_db
+from services.query_engine import PortalQueryEngine
+
+logger = logging.getLogger(__name__)
+
+# Close enough to process start: imported while the app module loads
+PROCESS_STARTED = time.monotonic()
+
+# Set once the engine exists (database reachable) / once it is fully warmed
+_built = asyncio.Event()
+_ready = asyncio.Event()
+_state: Dict[str, Any] = {
+    "status": "starting",
+    "query_engine": None,
+    "cold_start_seconds": None,
+    "timings": {},
+    "attempts": 0,
+    "error": None,
+}
+
+
+def _build() -> PortalQueryEngine:
+    """Create the tables and the engine's clients (runs in a worker thread)"""
+    timings = _state["timings"]
+
+    start = time.perf_counter()
+    init_db()
+    timings["init_db"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    query_engine = PortalQueryEngine(engine=engine)
+    timings["clients"] = time.perf_counter() - start
+    return query_engine
+
+
+def _warm(query_engine: PortalQueryEngine) -> None:
+    """Embed a query and open the vector stores (runs in a worker thread)"""
+    _state["timings"].update(query_engine.warm_up(news_partitions=settings.warmup_news_partitions))
+
+
+async def warm_up() -> None:
+    """Build and warm the query engine, retrying with backoff, then mark the app ready"""
+    delay = settings.warmup_retry_initial_seconds
+    while True:
+        _state["status"] = "warming"
+        _state["attempts"] += 1
+        try:
+            if _state["query_engine"] is None:
+                _state["query_engine"] = await run_blocking(_build)
+                _built.set()
+            await run_blocking(_warm, _state["query_engine"])
+            break
+        except Exception as e:
+            # Stay not-ready until an attempt succeeds
+            _state["status"] = "retrying"
+            _state["error"] = str(e)
+            logger.exception(f"Warm-up attempt {_state['attempts']} failed, retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.warmup_retry_max_seconds)
+
+    _state["status"] = "ready"
+    _state["error"] = None
+    _state["cold_start_seconds"] = round(time.monotonic() - PROCESS_STARTED, 3)
+    _ready.set()
+    logger.info(f"Ready after {_state['cold_start_seconds']}s cold start: {_state['timings']}")
+
+
+def readiness() -> Dict[str, Any]:
+    """Readiness report for /ready"""
+    return {
+        "status": _state["status"],
+        "cold_start_seconds": _state["cold_start_seconds"],
+        "timings": {step: round(seconds, 3) for step, seconds in _state["timings"].items()},
+        "attempts": _state["attempts"],
+        "error": _state["error"],
+    }
+
+
+def is_ready() -> bool:
+    """Whether warm-up has finished successfully"""
+    return _ready.is_set()
+
+
+async def _wait_for(event: asyncio.Event, what: str) -> None:
+    """Wait up to WARMUP_WAIT_SECONDS for `event`, then answer 503 with Retry-After"""
+    if event.is_set():
+        return
+    try:
+        await asyncio.wait_for(event.wait(), timeout=settings.warmup_wait_seconds)
+    except asyncio.TimeoutError:
+        detail = f"{what} is warming up"
+        if _state["error"]:
+            detail += f" (last attempt failed: {_state['error']})"
+        raise HTTPException(status_code=503, detail=detail, headers={"Retry-After": "5"})
+
+
+async def get_query_engine() -> PortalQueryEngine:
+    """
+    FastAPI dependency: the warmed query engine
+
+    Waits up to WARMUP_WAIT_SECONDS for warm-up to finish, then answers 503
+    with Retry-After so clients retry instead of piling up.
+    """
+    await _wait_for(_ready, "Query engine")
+    return _state["query_engine"]
+
+
+async def get_db_query_engine() -> PortalQueryEngine:
+    """
+    FastAPI dependency: the query engine for routes that only use the database
+
+    Available as soon as the engine is built, before (or without) the
+    embedding and vector store warm-up.
+    """
+    await _wait_for(_built, "Database")
+    return _state["query_engine"]
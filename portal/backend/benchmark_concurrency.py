@@ -0,0 +1,119 @@
+"""
+Concurrency test for the portal API
+
+Sends requests to one endpoint at increasing concurrency and, while they run,
+polls /health. If blocking work ran on the event loop, throughput would stay
+flat as concurrency grows and /health would wait behind every generation.
+With blocking work offloaded (core/concurrency.py), throughput should scale
+up to the LLM_CONCURRENCY limit and /health should stay at a few
+milliseconds.
+
+Usage (server running):
+    python benchmark_concurrency.py --endpoint titles --levels 1,2,4,8 --requests 16
+    python benchmark_concurrency.py --endpoint filters --levels 1,8,32 --requests 200
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+ENDPOINTS: Dict[str, Tuple[str, str, dict]] = {
+    "titles": ("POST", "/api/v1/content/generate-titles", {"source_type": "news", "topic": "Chennai", "count": 3}),
+    "filters": ("GET", "/api/v1/content/filters", {}),
+    "stats": ("GET", "/api/v1/indexing/stats", {}),
+    "titles-list": ("POST", "/api/v1/content/titles/list", {"limit": 20}),
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no values)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def poll_health(client: httpx.AsyncClient, stop: asyncio.Event, latencies: List[float]):
+    """Measure /health latency every 100 ms until stopped"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            await client.get("/health")
+            latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.1)
+
+
+async def run_level(client: httpx.AsyncClient, endpoint: str, concurrency: int, total: int) -> Dict:
+    """Send `total` requests with at most `concurrency` in flight"""
+    method, path, body = ENDPOINTS[endpoint]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                if method == "GET":
+                    response = await client.get(path)
+                else:
+                    response = await client.post(path, json=body)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except httpx.HTTPError:
+                errors += 1
+
+    health: List[float] = []
+    stop = asyncio.Event()
+    poller = asyncio.create_task(poll_health(client, stop, health))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await poller
+
+    return {
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "errors": errors,
+        "health_p95_ms": percentile(health, 95) * 1000,
+        "health_max_ms": max(health, default=0.0) * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Portal API throughput vs concurrency")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--endpoint", choices=sorted(ENDPOINTS), default="titles")
+    parser.add_argument("--levels", default="1,2,4,8", help="Concurrency levels to test")
+    parser.add_argument("--requests", type=int, default=16, help="Requests per level")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+        print("\n" + "=" * 60)
+        print(f"CONCURRENCY TEST - {ENDPOINTS[args.endpoint][0]} {ENDPOINTS[args.endpoint][1]}")
+        print("=" * 60)
+        print(f"\n{'conc':>5}{'req/s':>9}{'scale':>7}{'p50 s':>8}{'p95 s':>8}{'errors':>8}{'health p95':>12}{'max ms':>9}")
+
+        baseline = None
+        for concurrency in map(int, args.levels.split(",")):
+            r = await run_level(client, args.endpoint, concurrency, args.requests)
+            baseline = baseline or r["throughput"] or None
+            scale = r["throughput"] / baseline if baseline else 0.0
+            print(
+                f"{concurrency:>5}{r['throughput']:>9.2f}{scale:>6.1f}x{r['p50']:>8.2f}{r['p95']:>8.2f}"
+                f"{r['errors']:>8}{r['health_p95_ms']:>10.1f}ms{r['health_max_ms']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app imports its packages as top-level modules (core, services, ...)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
@@ -0,0 +1,100 @@
+"""
+Tests for the TTL cache
+"""
+import threading
+import time
+
+from core import cache
+from core.cache import TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def counter():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    return compute, calls
+
+
+def test_value_is_cached_until_ttl_expires(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    ttl_cache = TTLCache(ttl_seconds=60)
+    compute, calls = counter()
+
+    assert ttl_cache.get_or_compute("stats", compute) == 1
+    clock.now += 59
+    assert ttl_cache.get_or_compute("stats", compute) == 1
+    clock.now += 2
+    assert ttl_cache.get_or_compute("stats", compute) == 2
+    assert len(calls) == 2
+
+
+def test_keys_expire_independently(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    ttl_cache = TTLCache(ttl_seconds=60)
+
+    ttl_cache.get_or_compute("a", lambda: "a1")
+    clock.now += 30
+    ttl_cache.get_or_compute("b", lambda: "b1")
+    clock.now += 31
+
+    assert ttl_cache.get_or_compute("a", lambda: "a2") == "a2"
+    assert ttl_cache.get_or_compute("b", lambda: "b2") == "b1"
+
+
+def test_zero_ttl_disables_caching():
+    ttl_cache = TTLCache(ttl_seconds=0)
+    compute, calls = counter()
+
+    ttl_cache.get_or_compute("stats", compute)
+    ttl_cache.get_or_compute("stats", compute)
+
+    assert len(calls) == 2
+
+
+def test_invalidate_one_key_or_all():
+    ttl_cache = TTLCache(ttl_seconds=60)
+    ttl_cache.get_or_compute("a", lambda: 1)
+    ttl_cache.get_or_compute("b", lambda: 1)
+
+    ttl_cache.invalidate("a")
+    assert ttl_cache.get_or_compute("a", lambda: 2) == 2
+    assert ttl_cache.get_or_compute("b", lambda: 2) == 1
+
+    ttl_cache.invalidate()
+    assert ttl_cache.get_or_compute("b", lambda: 3) == 3
+
+
+def test_concurrent_callers_compute_once():
+    ttl_cache = TTLCache(ttl_seconds=60)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(ttl_cache.get_or_compute("stats", slow)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
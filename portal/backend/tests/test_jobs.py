@@ -0,0 +1,124 @@
+"""
+Tests for the background job queue
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+from services.jobs import FAILED, QUEUED, SUCCEEDED, JobQueue, QueueFullError
+
+
+def run(test):
+    """Run an async test body on a fresh event loop"""
+    return asyncio.run(test())
+
+
+def make_queue(**kwargs) -> JobQueue:
+    options = dict(workers={"blog": 1}, max_depth=1, result_ttl_seconds=60)
+    options.update(kwargs)
+    return JobQueue(**options)
+
+
+def test_jobs_run_and_record_outcomes():
+    async def test():
+        queue = make_queue(max_depth=5)
+        queue.start()
+
+        async def succeed():
+            return {"title": "Done"}
+
+        async def fail():
+            raise RuntimeError("LLM unavailable")
+
+        ok = queue.submit("blog", succeed)
+        bad = queue.submit("blog", fail)
+        assert ok.status == QUEUED
+        await ok.wait(timeout=1)
+        await bad.wait(timeout=1)
+        await queue.stop()
+
+        assert (ok.status, ok.result) == (SUCCEEDED, {"title": "Done"})
+        assert (bad.status, bad.error) == (FAILED, "LLM unavailable")
+        assert queue.get(ok.id) is ok
+        metrics = queue.metrics()["blog"]
+        assert (metrics["succeeded"], metrics["failed"], metrics["running"]) == (1, 1, 0)
+
+    run(test)
+
+
+def test_submit_refuses_jobs_beyond_max_depth():
+    async def test():
+        queue = make_queue(max_depth=1)
+        queue.start()
+        release = asyncio.Event()
+
+        async def blocked():
+            await release.wait()
+            return {}
+
+        running = queue.submit("blog", blocked)
+        # Let the single worker take the first job off the queue
+        await asyncio.sleep(0)
+        waiting = queue.submit("blog", blocked)
+        with pytest.raises(QueueFullError):
+            queue.submit("blog", blocked)
+        assert queue.metrics()["blog"]["queued"] == 1
+
+        release.set()
+        await running.wait(timeout=1)
+        await waiting.wait(timeout=1)
+        await queue.stop()
+        assert running.status == waiting.status == SUCCEEDED
+
+    run(test)
+
+
+def test_finished_jobs_are_pruned_after_result_ttl():
+    async def test():
+        queue = make_queue(max_depth=5, result_ttl_seconds=60)
+        queue.start()
+        release = asyncio.Event()
+
+        async def quick():
+            return {}
+
+        async def blocked():
+            await release.wait()
+            return {}
+
+        old = queue.submit("blog", quick)
+        await old.wait(timeout=1)
+        recent = queue.submit("blog", quick)
+        await recent.wait(timeout=1)
+        unfinished = queue.submit("blog", blocked)
+        old.finished_at -= 120
+
+        # Pruning happens on submit
+        queue.submit("blog", quick)
+
+        assert queue.get(old.id) is None
+        assert queue.get(recent.id) is recent
+        assert queue.get(unfinished.id) is unfinished
+        release.set()
+        await queue.stop()
+
+    run(test)
+
+
+def test_stop_fails_running_jobs():
+    async def test():
+        queue = make_queue()
+        queue.start()
+
+        async def forever():
+            await asyncio.Event().wait()
+
+        job = queue.submit("blog", forever)
+        await asyncio.sleep(0)
+        await queue.stop()
+
+        assert (job.status, job.error) == (FAILED, "Worker stopped")
+
+    run(test)
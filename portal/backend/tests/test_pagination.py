@@ -0,0 +1,58 @@
+"""
+Tests for keyset pagination cursors
+"""
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from core.pagination import decode_cursor, encode_cursor, next_cursor
+
+
+@pytest.mark.parametrize("created_at", [
+    datetime(2024, 5, 1, 12, 30, 15, 123456),
+    datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+])
+def test_cursor_round_trip(created_at):
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(datetime(2024, 5, 1, 12, 30), 987654321)
+
+    assert all(c.isalnum() or c in "-_=" for c in cursor)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    encode_cursor(datetime(2024, 5, 1), 1)[:-4],
+    "MjAyNC0wNS0wMQ==",  # "2024-05-01" without an id
+    "bm90LWEtZGF0ZXwx",  # "not-a-date|1"
+    "MjAyNC0wNS0wMXxhYmM=",  # "2024-05-01|abc"
+])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def rows(count: int):
+    return [SimpleNamespace(id=i, created_at=datetime(2024, 5, 1, 12, i)) for i in range(count)]
+
+
+def test_next_cursor_points_after_last_row_of_full_page():
+    page = rows(3)
+
+    assert decode_cursor(next_cursor(page, limit=3)) == (page[-1].created_at, page[-1].id)
+
+
+def test_no_next_cursor_after_short_page():
+    assert next_cursor(rows(2), limit=3) is None
+    assert next_cursor([], limit=3) is None
+
+
+def test_no_next_cursor_without_created_at():
+    page = rows(3)
+    page[-1].created_at = None
+
+    assert next_cursor(page, limit=3) is None
@@ -76,8 +76,12 @@ export const contentApi = {
     is_published?: boolean;
     limit?: number;
     offset?: number;
+    cursor?: string;
+    fields?: string[];
   }) => api.post('/content/social/list', data),
   
+  getSocial: (id: number) => api.get(`/content/social/${id}`),
+  
   // Blog content
   generateBlog: (data: {
     title_id?: number;
@@ -99,5 +103,9 @@ export const contentApi = {
     is_published?: boolean;
     limit?: number;
     offset?: number;
+    cursor?: string;
+    fields?: string[];
   }) => api.post('/content/blogs/list', data),
+  
+  getBlog: (id: number) => api.get(`/content/blogs/${id}`),
 };
@@ -258,6 +258,27 @@ const ContentGenerator: React.FC = () => {
     setPreviewModal(true);
   };
 
+  // Saved lists carry summaries only; full content is fetched by id
+  const fetchFullContent = async (kind: 'social' | 'blog', id: number) => {
+    try {
+      const response = kind === 'social' ? await contentApi.getSocial(id) : await contentApi.getBlog(id);
+      return response.data.content as string;
+    } catch (error) {
+      message.error('Failed to load content');
+      return null;
+    }
+  };
+
+  const copySaved = async (kind: 'social' | 'blog', id: number) => {
+    const content = await fetchFullContent(kind, id);
+    if (content !== null) copyToClipboard(content);
+  };
+
+  const previewSaved = async (id: number) => {
+    const content = await fetchFullContent('blog', id);
+    if (content !== null) showPreview(content);
+  };
+
   // Common filter component
   const FilterSection = () => (
     <Card size="small" style={{ marginBottom: 16 }}>
@@ -538,7 +559,7 @@ const ContentGenerator: React.FC = () => {
                       key="copy"
                       size="small"
                       icon={<CopyOutlined />}
-                      onClick={() => copyToClipboard(item.content)}
+                      onClick={() => copySaved('social', item.id)}
                     />,
                   ]}
                 >
@@ -546,7 +567,7 @@ const ContentGenerator: React.FC = () => {
                     title={item.title || 'Untitled'}
                     description={
                       <>
-                        <Paragraph ellipsis={{ rows: 2 }}>{item.content}</Paragraph>
+                        <Paragraph ellipsis={{ rows: 2 }}>{item.preview}</Paragraph>
                         <Space size="small">
                           <Tag>{item.tone}</Tag>
                           <Tag>{item.source_type}</Tag>
@@ -666,7 +687,7 @@ const ContentGenerator: React.FC = () => {
                     <Button
                       key="view"
                       size="small"
-                      onClick={() => showPreview(item.content)}
+                      onClick={() => previewSaved(item.id)}
                     >
                       View
                     </Button>,
@@ -674,7 +695,7 @@ const ContentGenerator: React.FC = () => {
                       key="copy"
                       size="small"
                       icon={<CopyOutlined />}
-                      onClick={() => copyToClipboard(item.content)}
+                      onClick={() => copySaved('blog', item.id)}
                     />,
                   ]}
                 >
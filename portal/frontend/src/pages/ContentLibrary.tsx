@@ -32,7 +32,8 @@ interface SocialRecord {
   source_type: string;
   topic?: string;
   title?: string;
-  content: string;
+  content?: string;
+  preview?: string;
   tone?: string;
   filter_sector?: string;
   filter_category?: string;
@@ -46,7 +47,7 @@ interface BlogRecord {
   id: number;
   source_type: string;
   title: string;
-  content: string;
+  content?: string;
   summary?: string;
   word_count?: number;
   tone?: string;
@@ -101,6 +102,27 @@ const ContentLibrary: React.FC = () => {
     setPreviewModal(true);
   };
 
+  // List pages leave out full content; load the whole record by id
+  const fetchFullRecord = async (type: 'social' | 'blog', id: number) => {
+    try {
+      const response = type === 'social' ? await contentApi.getSocial(id) : await contentApi.getBlog(id);
+      return response.data;
+    } catch (error) {
+      message.error('Failed to load content');
+      return null;
+    }
+  };
+
+  const showFullPreview = async (type: 'social' | 'blog', id: number) => {
+    const record = await fetchFullRecord(type, id);
+    if (record) showPreview(record, type);
+  };
+
+  const copyFullContent = async (type: 'social' | 'blog', id: number) => {
+    const record = await fetchFullRecord(type, id);
+    if (record) copyToClipboard(record.content);
+  };
+
   // Titles Table Columns
   const titleColumns: ColumnsType<TitleRecord> = [
     {
@@ -181,8 +203,8 @@ const ContentLibrary: React.FC = () => {
     },
     {
       title: 'Content Preview',
-      dataIndex: 'content',
-      key: 'content',
+      dataIndex: 'preview',
+      key: 'preview',
       width: '30%',
       render: (text) => (
         <Paragraph ellipsis={{ rows: 2 }} style={{ marginBottom: 0 }}>
@@ -230,12 +252,12 @@ const ContentLibrary: React.FC = () => {
           <Button
             type="link"
             icon={<CopyOutlined />}
-            onClick={() => copyToClipboard(record.content)}
+            onClick={() => copyFullContent('social', record.id)}
           />
           <Button
             type="link"
             icon={<EyeOutlined />}
-            onClick={() => showPreview(record, 'social')}
+            onClick={() => showFullPreview('social', record.id)}
           />
         </Space>
       ),
@@ -307,12 +329,12 @@ const ContentLibrary: React.FC = () => {
           <Button
             type="link"
             icon={<EyeOutlined />}
-            onClick={() => showPreview(record, 'blog')}
+            onClick={() => showFullPreview('blog', record.id)}
           />
           <Button
             type="link"
             icon={<CopyOutlined />}
-            onClick={() => copyToClipboard(record.content)}
+            onClick={() => copyFullContent('blog', record.id)}
           />
         </Space>
       ),
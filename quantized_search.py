@@ -0,0 +1,128 @@
+"""
+Binary-quantized two-stage retrieval over PGVectorStore collections
+
+A Hamming-distance HNSW index over binary_quantize(embedding) (1 bit per
+dimension, 32x smaller than the float vectors) gives a cheap candidate pass;
+the top-N candidates are then reranked exactly with the full-precision vectors.
+"""
+import logging
+from typing import List, Optional
+
+from llama_index.core import QueryBundle
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import NodeWithScore
+from llama_index.core.vector_stores import MetadataFilters
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from vector_store import (
+    build_filter_clause,
+    distance_sql,
+    hamming_distance_sql,
+    node_from_row,
+    similarity_from_distance,
+    vector_table,
+)
+
+logger = logging.getLogger(__name__)
+
+# Candidates pulled from the Hamming index before the exact rerank
+DEFAULT_RERANK_CANDIDATES = 100
+
+BINARY_RERANK_QUERY = """
+SELECT node_id, text, metadata_, {exact_distance} AS distance
+FROM (
+    SELECT node_id, text, metadata_, embedding
+    FROM {table}
+    WHERE {where}
+    ORDER BY {hamming_distance}
+    LIMIT :candidates
+) AS candidates
+ORDER BY distance
+LIMIT :top_k
+"""
+
+
+def binary_rerank_sql(table: str, where: str, dim: int, metric: str) -> str:
+    """Build the two-stage (Hamming candidates, exact rerank) query"""
+    return BINARY_RERANK_QUERY.format(
+        table=table,
+        where=where,
+        hamming_distance=hamming_distance_sql(dim),
+        exact_distance=distance_sql(metric, dim, exact=True),
+    )
+
+
+def set_ef_search(conn, candidates: int) -> None:
+    """Let the HNSW scan return at least `candidates` rows (transaction-local)"""
+    conn.execute(
+        text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+        {"ef_search": str(max(candidates, 40))}
+    )
+
+
+class BinaryQuantizedRetriever(BaseRetriever):
+    """Retrieve by Hamming distance on binary-quantized vectors, then rerank exactly"""
+
+    def __init__(
+        self,
+        engine: Engine,
+        collection_name: str,
+        embed_model: BaseEmbedding,
+        similarity_top_k: int = 10,
+        filters: Optional[MetadataFilters] = None,
+        rerank_candidates: int = DEFAULT_RERANK_CANDIDATES,
+        distance_metric: str = "cosine"
+    ):
+        """
+        Args:
+            engine: SQLAlchemy engine for the vector database
+            collection_name: PGVectorStore collection (without the data_ prefix)
+            embed_model: Embedding model used for the query vector
+            similarity_top_k: Number of reranked results to return
+            filters: Optional equality metadata filters
+            rerank_candidates: Candidates taken from the Hamming index for exact rerank
+            distance_metric: 'cosine', 'l2' or 'inner_product' for the rerank
+        """
+        self._engine = engine
+        self._collection_name = collection_name
+        self._embed_model = embed_model
+        self._similarity_top_k = similarity_top_k
+        self._filters = filters
+        self._rerank_candidates = max(rerank_candidates, similarity_top_k)
+        self._distance_metric = distance_metric
+        super().__init__()
+
+    def _retrieve(self, query_bundle: QueryBundle) -> List[NodeWithScore]:
+        # Reuse an embedding computed by a sibling retriever (e.g. another partition)
+        if query_bundle.embedding is None:
+            query_bundle.embedding = self._embed_model.get_query_embedding(query_bundle.query_str)
+
+        where, params = build_filter_clause(self._filters)
+        sql = binary_rerank_sql(
+            vector_table(self._collection_name),
+            where,
+            len(query_bundle.embedding),
+            self._distance_metric
+        )
+
+        params.update({
+            "embedding": "[" + ",".join(str(x) for x in query_bundle.embedding) + "]",
+            "candidates": self._rerank_candidates,
+            "top_k": self._similarity_top_k,
+        })
+
+        with self._engine.begin() as conn:
+            set_ef_search(conn, self._rerank_candidates)
+            rows = conn.execute(text(sql), params).fetchall()
+
+        logger.debug(f"Binary-quantized search on {self._collection_name} returned {len(rows)} nodes")
+
+        return [
+            NodeWithScore(
+                node=node_from_row(node_id, node_text, metadata),
+                score=similarity_from_distance(self._distance_metric, float(distance))
+            )
+            for node_id, node_text, metadata, distance in rows
+        ]
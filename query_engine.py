@@ -3,10 +3,14 @@ Query Engine for Content Generation using RAG
 """
 import logging
 from typing import List, Optional, Dict, Any
-from llama_index.core import VectorStoreIndex
+from llama_index.core import VectorStoreIndex, Settings
 from llama_index.core.query_engine import RetrieverQueryEngine
-from llama_index.core.retrievers import VectorIndexRetriever
-from indexer import JobIndexer, TNNewsIndexer, AIJobIndexer
+from llama_index.core.retrievers import BaseRetriever, VectorIndexRetriever
+from indexer import BaseIndexer, JobIndexer, TNNewsIndexer, AIJobIndexer
+from hybrid_search import HybridRetriever
+from quantized_search import BinaryQuantizedRetriever
+from models import engine
+from token_usage import ContextTokenReporter
 from config import settings
 
 # Configure logging
@@ -17,7 +21,18 @@ logger = logging.getLogger(__name__)
 class ContentGenerator:
     """Generate blog content using RAG"""
     
-    def __init__(self):
+    def __init__(self, search_mode: Optional[str] = None):
+        """
+        Args:
+            search_mode: 'vector', 'hybrid' (lexical + vector with RRF) or 'binary'
+                         (binary-quantized candidates + exact rerank);
+                         defaults to 'hybrid' when HYBRID_SEARCH is enabled
+        """
+        self.search_mode = search_mode or ("hybrid" if settings.hybrid_search else "vector")
+        
+        # Logs LLM context tokens saved by excluded metadata keys per query
+        self.context_token_reporter = ContextTokenReporter()
+        
         self.job_indexer = JobIndexer()
         self.news_indexer = TNNewsIndexer()
         self.ai_job_indexer = AIJobIndexer()
@@ -27,20 +42,61 @@ class ContentGenerator:
         self.news_index = self.news_indexer.get_index()
         self.ai_job_index = self.ai_job_indexer.get_index()
     
+    def _create_retriever(
+        self,
+        source: str,
+        similarity_top_k: int = 10,
+        lexical_query: Optional[str] = None
+    ) -> BaseRetriever:
+        """
+        Create a retriever for the configured search mode
+        
+        Args:
+            source: Data source (jobs, tnnews, aijobs)
+            similarity_top_k: Number of results
+            lexical_query: Keywords for the full-text side of hybrid search
+        """
+        if self.search_mode == "hybrid":
+            return HybridRetriever(
+                engine=engine,
+                collection_name=self._get_indexer_by_source(source).collection_name,
+                embed_model=Settings.embed_model,
+                similarity_top_k=similarity_top_k,
+                lexical_query=lexical_query,
+                text_search_config=settings.text_search_config,
+                rrf_k=settings.hybrid_rrf_k,
+                distance_metric=settings.vector_distance_metric,
+            )
+        
+        if self.search_mode == "binary":
+            return BinaryQuantizedRetriever(
+                engine=engine,
+                collection_name=self._get_indexer_by_source(source).collection_name,
+                embed_model=Settings.embed_model,
+                similarity_top_k=similarity_top_k,
+                rerank_candidates=settings.binary_rerank_candidates,
+                distance_metric=settings.vector_distance_metric,
+            )
+        
+        return VectorIndexRetriever(
+            index=self._get_index_by_source(source),
+            similarity_top_k=similarity_top_k,
+        )
+    
     def _create_query_engine(
         self, 
-        index: VectorStoreIndex,
+        source: str,
         similarity_top_k: int = 10,
-        filters: Optional[Dict[str, Any]] = None
+        lexical_query: Optional[str] = None
     ) -> RetrieverQueryEngine:
-        """Create a query engine with optional metadata filters"""
+        """Create a query engine over a data source"""
         
-        retriever = VectorIndexRetriever(
-            index=index,
-            similarity_top_k=similarity_top_k,
-        )
+        retriever = self._create_retriever(source, similarity_top_k, lexical_query)
         
-        query_engine = RetrieverQueryEngine(retriever=retriever)
+        query_engine = RetrieverQueryEngine.from_args(
+            retriever,
+            node_postprocessors=[self.context_token_reporter]
+        )
         
         return query_engine
     
@@ -61,8 +117,7 @@ class ContentGenerator:
         Returns:
             List of blog title suggestions
         """
-        index = self._get_index_by_source(source)
-        query_engine = self._create_query_engine(index, similarity_top_k=10)
+        query_engine = self._create_query_engine(source, similarity_top_k=10, lexical_query=topic)
         
         prompt = f"""
         Based on the retrieved data about '{topic}', generate {num_suggestions} engaging blog post titles.
@@ -96,8 +151,7 @@ class ContentGenerator:
         Returns:
             Dictionary with title, content, tags, summary
         """
-        index = self._get_index_by_source(source)
-        query_engine = self._create_query_engine(index, similarity_top_k=15)
+        query_engine = self._create_query_engine(source, similarity_top_k=15, lexical_query=title)
         
         prompt = f"""
         Write a comprehensive blog post with the title: "{title}"
@@ -148,8 +202,7 @@ class ContentGenerator:
         Returns:
             Trend analysis content
         """
-        index = self._get_index_by_source(source)
-        query_engine = self._create_query_engine(index, similarity_top_k=20)
+        query_engine = self._create_query_engine(source, similarity_top_k=20, lexical_query=topic)
         
         prompt = f"""
         Analyze trends related to '{topic}' based on the retrieved data.
@@ -189,8 +242,11 @@ class ContentGenerator:
         Returns:
             Comparison content
         """
-        index = self._get_index_by_source(source)
-        query_engine = self._create_query_engine(index, similarity_top_k=20)
+        query_engine = self._create_query_engine(
+            source,
+            similarity_top_k=20,
+            lexical_query=f"{item1} {item2}"
+        )
         
         prompt = f"""
         Create a detailed comparison between '{item1}' and '{item2}' based on the retrieved data.
@@ -227,12 +283,7 @@ class ContentGenerator:
         Returns:
             List of similar documents with metadata
         """
-        index = self._get_index_by_source(source)
-        
-        retriever = VectorIndexRetriever(
-            index=index,
-            similarity_top_k=top_k,
-        )
+        retriever = self._create_retriever(source, similarity_top_k=top_k)
         
         nodes = retriever.retrieve(query)
         
@@ -248,6 +299,17 @@ class ContentGenerator:
     
     # Helper methods
     
+    def _get_indexer_by_source(self, source: str) -> BaseIndexer:
+        """Get indexer by source name"""
+        if source == "jobs":
+            return self.job_indexer
+        elif source == "tnnews":
+            return self.news_indexer
+        elif source == "aijobs":
+            return self.ai_job_indexer
+        else:
+            raise ValueError(f"Unknown source: {source}")
+    
     def _get_index_by_source(self, source: str) -> VectorStoreIndex:
         """Get index by source name"""
         if source == "jobs":
@@ -0,0 +1,105 @@
+"""
+Tamil-aware sentence splitting for news chunking
+
+LlamaIndex's default SentenceSplitter finds sentences with NLTK's English punkt
+model and measures length with a GPT tokenizer. On Tamil text both are off:
+sentence boundaries miss Indic punctuation and break on Tamil initials
+("மு.க. ஸ்டாலின்"), and chunk/overlap sizes are counted in the wrong tokens.
+This splitter finds sentence boundaries with Unicode-aware rules and measures
+length with the embedding model's own tokenizer.
+"""
+import re
+from typing import Callable, List, Optional
+
+from llama_index.core.node_parser import SentenceSplitter
+
+TAMIL_CONSONANTS = "க-ஹ"
+TAMIL_VOWELS = "அ-ஔ"
+# Dependent vowel signs and the virama (pulli)
+TAMIL_VOWEL_SIGNS = "ா-்"
+
+# Sentence-final punctuation, including danda/double danda and the ellipsis,
+# optionally followed by closing quotes or brackets
+SENTENCE_END = re.compile(r"(?<=[.!?।॥…])[\"'’”)\]]*\s+")
+
+# One Tamil letter: a consonant with an optional vowel sign, or a vowel
+TAMIL_LETTER = rf"(?:[{TAMIL_CONSONANTS}][{TAMIL_VOWEL_SIGNS}]?|[{TAMIL_VOWELS}])"
+
+# Tamil initials ("மு.க.", "எம்.ஜி.ஆர்.") are not sentence ends: a single
+# letter, or - chained to a previous initial - a letter closed by one pulli
+# consonant ("ஆர்")
+TAMIL_INITIAL = re.compile(
+    rf"(?:(?:^|\s){TAMIL_LETTER}|\.{TAMIL_LETTER}(?:[{TAMIL_CONSONANTS}]்)?)\.$"
+)
+
+ENGLISH_ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "st", "jr", "sr", "vs", "etc", "rs", "govt", "dept", "prof", "inc", "ltd",
+}
+
+# Abbreviations only when a number follows ("No. 5", but not "there is no. Next")
+NUMBER_ABBREVIATIONS = {"no"}
+
+
+def _is_abbreviation(sentence: str, following: str = "") -> bool:
+    """Whether a candidate sentence actually ends in an initial or abbreviation"""
+    stripped = sentence.rstrip()
+    if not stripped.endswith("."):
+        return False
+    if TAMIL_INITIAL.search(stripped):
+        return True
+    last_word = stripped.rsplit(None, 1)[-1].rstrip(".").lower()
+    if last_word in NUMBER_ABBREVIATIONS:
+        return following[:1].isdigit()
+    return last_word in ENGLISH_ABBREVIATIONS or (len(last_word) == 1 and last_word.isascii() and last_word.isalpha())
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences on Unicode sentence punctuation and line breaks
+
+    Pieces keep their trailing whitespace so that joining them restores the
+    original text (SentenceSplitter relies on this when merging splits).
+    """
+    sentences: List[str] = []
+    for line in re.split(r"(?<=\n)", text):
+        start = 0
+        pending = ""
+        for match in SENTENCE_END.finditer(line):
+            piece = pending + line[start:match.end()]
+            start = match.end()
+            if _is_abbreviation(line[:match.start()][-40:], line[match.end():]):
+                pending = piece
+                continue
+            sentences.append(piece)
+            pending = ""
+        tail = pending + line[start:]
+        if tail:
+            sentences.append(tail)
+    return sentences
+
+
+def tamil_sentence_splitter(
+    chunk_size: int,
+    chunk_overlap: int,
+    tokenizer: Optional[Callable[[str], List]] = None,
+    **kwargs
+) -> SentenceSplitter:
+    """
+    Build a SentenceSplitter with Tamil-aware sentence boundaries
+
+    Args:
+        chunk_size: Chunk size in tokens of `tokenizer`
+        chunk_overlap: Overlap in tokens of `tokenizer`
+        tokenizer: Embedding model tokenizer (text -> tokens); LlamaIndex's
+                   default GPT tokenizer if None
+        **kwargs: Other SentenceSplitter options (paragraph_separator, ...)
+    """
+    return SentenceSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        tokenizer=tokenizer,
+        chunking_tokenizer_fn=split_sentences,
+        # Clause-level fallback for sentences longer than a chunk
+        secondary_chunking_regex=rf"[^,;:।॥]+[,;:।॥]?",
+        **kwargs
+    )
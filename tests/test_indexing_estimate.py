@@ -0,0 +1,64 @@
+"""
+Tests for dry-run embedding estimates
+"""
+import pytest
+
+from indexing_estimate import EmbeddingEstimate, embedding_price_per_million
+
+
+def test_price_matches_model_inside_deployment_name():
+    assert embedding_price_per_million("prod-text-embedding-3-small") == 0.02
+
+
+def test_price_override_wins_and_unknown_model_is_none():
+    assert embedding_price_per_million("text-embedding-3-large", override=0.5) == 0.5
+    assert embedding_price_per_million("bge-m3") is None
+
+
+def test_chunks_pack_into_requests_by_token_budget():
+    estimate = EmbeddingEstimate(max_input_tokens=100, max_request_tokens=250, max_request_inputs=10)
+    estimate.add_document([100, 100])
+    estimate.add_document([100, 50])
+
+    assert (estimate.documents, estimate.chunks, estimate.inputs) == (2, 4, 4)
+    # 100 + 100 | 100 + 50
+    assert estimate.requests == 2
+    assert estimate.tokens == 350
+
+
+def test_chunks_pack_into_requests_by_input_limit():
+    estimate = EmbeddingEstimate(max_input_tokens=100, max_request_tokens=10_000, max_request_inputs=3)
+    estimate.add_document([1] * 7)
+
+    assert estimate.requests == 3
+
+
+def test_oversized_chunk_is_split_into_inputs():
+    estimate = EmbeddingEstimate(max_input_tokens=100, max_request_tokens=1_000, max_request_inputs=10)
+    estimate.add_document([250])
+
+    assert estimate.oversized_chunks == 1
+    assert estimate.inputs == 3
+    assert estimate.tokens == 250
+
+
+def test_report_cost_and_binding_rate_limit():
+    estimate = EmbeddingEstimate(max_input_tokens=1_000, max_request_tokens=1_000, max_request_inputs=1)
+    estimate.add_document([500] * 4)
+
+    report = estimate.report(price_per_million=0.13, tokens_per_minute=1_000, requests_per_minute=100)
+
+    assert report["estimated_cost_usd"] == pytest.approx(0.0003, abs=1e-4)
+    assert report["requests"] == 4
+    # 2000 tokens at 1000/min outweighs 4 requests at 100/min
+    assert report["projected_minutes"] == 2.0
+
+
+def test_report_unknown_price_and_unlimited_rates():
+    estimate = EmbeddingEstimate(max_input_tokens=100, max_request_tokens=100, max_request_inputs=1)
+    estimate.add_document([10])
+
+    report = estimate.report(price_per_million=None, tokens_per_minute=0, requests_per_minute=0)
+
+    assert report["estimated_cost_usd"] is None
+    assert report["projected_minutes"] == 0.0
@@ -0,0 +1,86 @@
+"""
+Tests for MinHash signatures and LSH band keys
+"""
+import pytest
+
+pytest.importorskip("llama_index.core")
+
+import numpy as np
+
+from near_duplicates import MinHasher, shingles
+
+STORY = (
+    "The state government announced a new scheme on Monday to provide free bus travel "
+    "for college students across all districts, the transport minister said in Chennai, "
+    "adding that the scheme would start from the next academic year and cover private colleges"
+)
+
+
+def estimated_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.mean(a == b))
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b)
+
+
+def test_shingles_are_word_ngrams():
+    assert shingles("One two three four five six", size=5) == {
+        "one two three four five", "two three four five six",
+    }
+
+
+def test_short_text_is_one_shingle():
+    assert shingles("Breaking news!", size=5) == {"breaking news"}
+    assert shingles("", size=5) == set()
+
+
+def test_tamil_words_stay_whole():
+    assert shingles("தமிழ் செய்தி", size=5) == {"தமிழ் செய்தி"}
+
+
+def test_num_perm_must_divide_into_bands():
+    with pytest.raises(ValueError):
+        MinHasher(num_perm=100, band_rows=8)
+
+
+def test_signature_is_deterministic_for_a_seed():
+    shingle_set = shingles(STORY)
+    signature = MinHasher().signature(shingle_set)
+
+    assert signature.dtype == np.uint32
+    assert signature.shape == (128,)
+    assert np.array_equal(signature, MinHasher().signature(shingle_set))
+    assert not np.array_equal(signature, MinHasher(seed=2).signature(shingle_set))
+
+
+def test_signature_similarity_estimates_jaccard():
+    hasher = MinHasher(num_perm=256)
+    original = shingles(STORY)
+    edited = shingles(STORY.replace("on Monday", "on Tuesday"))
+
+    estimate = estimated_similarity(hasher.signature(original), hasher.signature(edited))
+
+    assert estimate == pytest.approx(jaccard(original, edited), abs=0.1)
+
+
+def test_bands_cover_the_signature():
+    hasher = MinHasher(num_perm=128, band_rows=8)
+
+    keys = hasher.bands(hasher.signature(shingles(STORY)))
+
+    assert [band for band, _ in keys] == list(range(16))
+    assert all(-2 ** 63 <= bucket < 2 ** 63 for _, bucket in keys)
+
+
+def test_near_duplicates_share_a_band_and_unrelated_articles_do_not():
+    hasher = MinHasher()
+    original = hasher.bands(hasher.signature(shingles(STORY)))
+    syndicated = hasher.bands(hasher.signature(shingles(STORY + " (PTI)")))
+    unrelated = hasher.bands(hasher.signature(shingles(
+        "Heavy rain lashed several coastal districts overnight and the meteorological department "
+        "has warned fishermen not to venture into the sea for the next three days"
+    )))
+
+    assert set(original) & set(syndicated)
+    assert not set(original) & set(unrelated)
@@ -0,0 +1,55 @@
+"""
+Tests for Tamil-aware sentence boundaries
+"""
+import pytest
+
+pytest.importorskip("llama_index.core")
+
+from tamil_splitter import split_sentences
+
+
+def test_splits_on_sentence_punctuation_and_keeps_text():
+    text = "முதல் வாக்கியம். இரண்டாவது வாக்கியம்! மூன்றாவது?"
+
+    sentences = split_sentences(text)
+
+    assert sentences == ["முதல் வாக்கியம். ", "இரண்டாவது வாக்கியம்! ", "மூன்றாவது?"]
+    assert "".join(sentences) == text
+
+
+def test_splits_on_danda_and_line_breaks():
+    text = "ஒன்று। இரண்டு\nமூன்று"
+
+    assert split_sentences(text) == ["ஒன்று। ", "இரண்டு\n", "மூன்று"]
+
+
+def test_keeps_closing_quote_with_sentence():
+    assert split_sentences('அவர் "வருகிறேன்." என்றார்.') == ['அவர் "வருகிறேன்." ', "என்றார்."]
+
+
+@pytest.mark.parametrize("text", [
+    "மு.க. ஸ்டாலின் பேசினார்.",
+    "எம்.ஜி.ஆர். நினைவு நாள்.",
+])
+def test_tamil_initials_do_not_end_sentences(text):
+    assert split_sentences(text) == [text]
+
+
+def test_word_ending_before_full_stop_is_not_an_initial():
+    text = "அவர் வந்தார். பின்னர் சென்றார்."
+
+    assert split_sentences(text) == ["அவர் வந்தார். ", "பின்னர் சென்றார்."]
+
+
+@pytest.mark.parametrize("text", [
+    "Dr. Kumar met Mr. Raj today.",
+    "The order cost Rs. 500 in total.",
+    "He lives at No. 5 Anna Salai.",
+    "Written by A. Raman.",
+])
+def test_abbreviations_do_not_end_sentences(text):
+    assert split_sentences(text) == [text]
+
+
+def test_no_without_number_ends_sentence():
+    assert split_sentences("They said no. Then they left.") == ["They said no. ", "Then they left."]
@@ -0,0 +1,81 @@
+"""
+Tests for TokenBudgetEmbedding request packing
+
+Tokens are whitespace-separated words, so token counts are easy to read.
+"""
+import pytest
+
+pytest.importorskip("llama_index.core")
+
+from llama_index.core.embeddings import MockEmbedding
+
+from embeddings import TokenBudgetEmbedding
+
+
+def words(count: int, word: str = "w") -> str:
+    return " ".join([word] * count)
+
+
+def make_embedding(**kwargs) -> TokenBudgetEmbedding:
+    options = dict(max_input_tokens=10, max_request_tokens=25, max_request_inputs=3)
+    options.update(kwargs)
+    return TokenBudgetEmbedding(
+        MockEmbedding(embed_dim=2),
+        encode=str.split,
+        decode=" ".join,
+        **options
+    )
+
+
+def test_plan_packs_requests_under_token_budget():
+    requests, owners = make_embedding()._plan([words(10), words(10), words(10)])
+
+    assert [len(request) for request in requests] == [2, 1]
+    assert owners == [[(0, 10)], [(1, 10)], [(2, 10)]]
+
+
+def test_plan_respects_input_limit():
+    requests, _ = make_embedding()._plan([words(1)] * 7)
+
+    assert [len(request) for request in requests] == [3, 3, 1]
+
+
+def test_plan_splits_oversized_input_in_order():
+    text = " ".join(f"t{i}" for i in range(23))
+    requests, owners = make_embedding()._plan(["a", text, "b"])
+
+    pieces = [piece for request in requests for piece in request]
+    assert pieces[0] == "a"
+    assert " ".join(pieces[1:4]) == text
+    assert pieces[4] == "b"
+    assert owners == [[(0, 1)], [(1, 10), (2, 10), (3, 3)], [(4, 1)]]
+    assert all(sum(len(piece.split()) for piece in request) <= 25 for request in requests)
+
+
+def test_plan_truncates_when_splitting_disabled():
+    requests, owners = make_embedding(split_oversized=False)._plan([words(23)])
+
+    assert requests == [[words(10)]]
+    assert owners == [[(0, 10)]]
+
+
+def test_combine_keeps_single_piece_embeddings():
+    embeddings = [[1.0, 0.0], [0.0, 1.0]]
+
+    assert TokenBudgetEmbedding._combine(embeddings, [[(0, 4)], [(1, 7)]]) == embeddings
+
+
+def test_combine_averages_split_input_by_token_count_in_order():
+    embeddings = [[9.0, 9.0], [1.0, 0.0], [0.0, 1.0], [5.0, 5.0]]
+    owners = [[(0, 2)], [(1, 3), (2, 1)], [(3, 2)]]
+
+    combined = TokenBudgetEmbedding._combine(embeddings, owners)
+
+    assert combined == [[9.0, 9.0], [0.75, 0.25], [5.0, 5.0]]
+
+
+def test_get_text_embeddings_returns_one_embedding_per_input():
+    embedding = make_embedding()
+    texts = [words(4), words(23), words(9), words(1)]
+
+    assert len(embedding.get_text_embedding_batch(texts)) == len(texts)
@@ -0,0 +1,82 @@
+"""
+Token accounting for metadata excluded from embedding and LLM text
+"""
+import logging
+import threading
+from typing import Callable, Iterable, List, Optional
+
+from llama_index.core import QueryBundle
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.postprocessor.types import BaseNodePostprocessor
+from llama_index.core.schema import BaseNode, MetadataMode, NodeWithScore
+
+logger = logging.getLogger(__name__)
+
+
+def metadata_tokens_saved(
+    nodes: Iterable[BaseNode],
+    mode: MetadataMode,
+    encode: Optional[Callable[[str], List]]
+) -> int:
+    """
+    Tokens not sent because of excluded metadata keys
+
+    Args:
+        nodes: Chunks as embedded (MetadataMode.EMBED) or given to the LLM (MetadataMode.LLM)
+        mode: Which exclusion list to account for
+        encode: Tokenizer (text -> tokens); returns 0 when unavailable
+    """
+    if encode is None:
+        return 0
+    return sum(
+        max(0, len(encode(node.get_metadata_str(MetadataMode.ALL))) - len(encode(node.get_metadata_str(mode))))
+        for node in nodes
+    )
+
+
+class ContextTokenReporter(BaseNodePostprocessor):
+    """
+    Pass-through postprocessor that logs the LLM context tokens saved by
+    excluded metadata keys for each query, and keeps a running total
+
+    One instance is shared by concurrent queries (portal worker threads), so
+    the running totals are updated under a lock.
+    """
+
+    queries: int = 0
+    tokens_saved: int = 0
+
+    _encode: Callable[[str], List] = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def __init__(self, encode: Optional[Callable[[str], List]] = None, **kwargs):
+        """
+        Args:
+            encode: LLM tokenizer (defaults to LlamaIndex's global tokenizer)
+        """
+        super().__init__(**kwargs)
+        if encode is None:
+            from llama_index.core.utils import get_tokenizer
+
+            encode = get_tokenizer()
+        self._encode = encode
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ContextTokenReporter"
+
+    def _postprocess_nodes(
+        self,
+        nodes: List[NodeWithScore],
+        query_bundle: Optional[QueryBundle] = None
+    ) -> List[NodeWithScore]:
+        saved = metadata_tokens_saved((n.node for n in nodes), MetadataMode.LLM, self._encode)
+        with self._lock:
+            self.queries += 1
+            self.tokens_saved += saved
+            queries, tokens_saved = self.queries, self.tokens_saved
+        logger.info(
+            f"Query context: {len(nodes)} chunks, {saved} metadata tokens saved "
+            f"({tokens_saved} over {queries} queries)"
+        )
+        return nodes
@@ -0,0 +1,262 @@
+"""
+PgVector store helpers: distance expressions, ANN indexes, a store that
+shares an existing SQLAlchemy engine, and the inner-product store for
+pre-normalized embeddings
+"""
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.schema import BaseNode, TextNode
+from llama_index.core.vector_stores.types import (
+    FilterOperator,
+    MetadataFilters,
+    VectorStoreQuery,
+    VectorStoreQueryMode,
+    VectorStoreQueryResult,
+)
+from llama_index.core.vector_stores.utils import metadata_dict_to_node
+from llama_index.vector_stores.postgres import PGVectorStore
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from news_partitions import VECTOR_TABLE_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# pgvector ANN indexes support up to 2000 dimensions on vector; larger
+# embeddings (e.g. 3072-dim text-embedding-3-large) are indexed as halfvec
+MAX_VECTOR_INDEX_DIM = 2000
+
+
+def vector_table_name(collection_name: str) -> str:
+    """Get the (unquoted) table name PGVectorStore uses for a collection"""
+    return f"{VECTOR_TABLE_PREFIX}{collection_name.lower()}"
+
+
+def vector_table(collection_name: str) -> str:
+    """Get the schema-qualified, quoted table name PGVectorStore uses for a collection"""
+    return f'public."{vector_table_name(collection_name)}"'
+
+
+def list_vector_tables(conn, table_prefix: str) -> List[str]:
+    """List PGVectorStore tables (data_<table_prefix>_*) in the public schema"""
+    result = conn.execute(
+        text(
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_schema = 'public' AND table_name LIKE :pattern"
+        ),
+        {"pattern": f"{VECTOR_TABLE_PREFIX}{table_prefix}_%"}
+    )
+    return [row[0] for row in result]
+
+
+def build_filter_clause(filters: Optional[MetadataFilters]) -> Tuple[str, Dict[str, Any]]:
+    """Translate equality metadata filters into a SQL clause over metadata_"""
+    if not filters or not filters.filters:
+        return "TRUE", {}
+
+    clauses = []
+    params = {}
+    for i, metadata_filter in enumerate(filters.filters):
+        if metadata_filter.operator != FilterOperator.EQ:
+            raise ValueError(f"Only EQ metadata filters are supported, got {metadata_filter.operator}")
+        clauses.append(f"metadata_->>'{metadata_filter.key}' = :filter_{i}")
+        params[f"filter_{i}"] = str(metadata_filter.value)
+
+    condition = f" {filters.condition.value.upper()} " if filters.condition else " AND "
+    return "(" + condition.join(clauses) + ")", params
+
+
+def node_from_row(node_id: str, node_text: str, metadata: Optional[Dict[str, Any]]) -> BaseNode:
+    """
+    Rebuild a node from a vector table row the way PGVectorStore does
+
+    metadata_ holds the serialized node (_node_content), which carries the
+    excluded embed/LLM metadata keys; using the raw column as metadata would
+    put that JSON into LLM context.
+    """
+    try:
+        node = metadata_dict_to_node(metadata or {})
+        node.set_content(str(node_text))
+        return node
+    except Exception:
+        # Rows written without node content
+        return TextNode(id_=node_id, text=node_text, metadata=metadata or {})
+
+
+def distance_sql(
+    metric: str,
+    dim: int,
+    column: str = "embedding",
+    param: str = ":embedding",
+    exact: bool = False
+) -> str:
+    """
+    SQL distance between the embedding column and a bound query vector
+
+    For inner product the expression matches the HNSW index created by
+    ensure_ip_index, so ORDER BY on it can use the index. exact=True always
+    compares full-precision vectors (e.g. for reranking).
+    """
+    if metric == "inner_product":
+        if dim > MAX_VECTOR_INDEX_DIM and not exact:
+            return f"CAST({column} AS halfvec({dim})) <#> CAST({param} AS halfvec({dim}))"
+        return f"{column} <#> CAST({param} AS vector({dim}))"
+    if metric == "l2":
+        return f"{column} <-> CAST({param} AS vector({dim}))"
+    return f"{column} <=> CAST({param} AS vector({dim}))"
+
+
+def hamming_distance_sql(dim: int, column: str = "embedding", param: str = ":embedding") -> str:
+    """SQL Hamming distance between binary-quantized embeddings (matches ensure_binary_index)"""
+    return (
+        f"CAST(binary_quantize({column}) AS bit({dim})) "
+        f"<~> CAST(binary_quantize(CAST({param} AS vector({dim}))) AS bit({dim}))"
+    )
+
+
+def similarity_from_distance(metric: str, distance: float) -> float:
+    """Convert a pgvector distance to the similarity score PGVectorStore would report"""
+    if metric == "inner_product":
+        # <#> returns the negative inner product (= cosine for unit vectors)
+        return -distance
+    return 1.0 - distance
+
+
+def embedding_dimension(conn, table: str) -> Optional[int]:
+    """Read the declared dimension of a table's embedding column"""
+    return conn.execute(
+        text(
+            "SELECT atttypmod FROM pg_attribute "
+            "WHERE attrelid = CAST(:table AS regclass) AND attname = 'embedding'"
+        ),
+        {"table": f'public."{table}"'}
+    ).scalar()
+
+
+def ensure_ip_index(conn, collection_name: str) -> None:
+    """Create the inner-product HNSW index on a collection if it is missing"""
+    table = vector_table_name(collection_name)
+    dim = embedding_dimension(conn, table)
+    if not dim or dim <= 0:
+        return
+
+    if dim > MAX_VECTOR_INDEX_DIM:
+        target = f"(CAST(embedding AS halfvec({dim}))) halfvec_ip_ops"
+    else:
+        target = "embedding vector_ip_ops"
+
+    conn.execute(text(
+        f'CREATE INDEX IF NOT EXISTS "{table}_embedding_ip_idx" '
+        f'ON public."{table}" USING hnsw ({target})'
+    ))
+
+
+def ensure_binary_index(conn, collection_name: str) -> None:
+    """Create the Hamming-distance HNSW index over binary-quantized embeddings if missing"""
+    table = vector_table_name(collection_name)
+    dim = embedding_dimension(conn, table)
+    if not dim or dim <= 0:
+        return
+
+    conn.execute(text(
+        f'CREATE INDEX IF NOT EXISTS "{table}_embedding_bq_idx" '
+        f'ON public."{table}" USING hnsw ((CAST(binary_quantize(embedding) AS bit({dim}))) bit_hamming_ops)'
+    ))
+
+
+class SharedEnginePGVectorStore(PGVectorStore):
+    """
+    PGVectorStore that runs its queries on a caller's engines
+
+    PGVectorStore creates its own sync and async engines (and connection
+    pools) per collection. With share_engine(), every collection uses one
+    shared, centrally sized pool instead. The async engine is only shared
+    when one is passed; otherwise async queries (aquery) still go through the
+    store's own async pool, which is opened on the first async query.
+    """
+
+    _shared_engine: Optional[Engine] = PrivateAttr(default=None)
+    _shared_async_engine: Optional[AsyncEngine] = PrivateAttr(default=None)
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "SharedEnginePGVectorStore"
+
+    def share_engine(
+        self,
+        engine: Engine,
+        async_engine: Optional[AsyncEngine] = None
+    ) -> "SharedEnginePGVectorStore":
+        """Use `engine` (and `async_engine`, if given) for all queries (call before the first query)"""
+        self._shared_engine = engine
+        self._shared_async_engine = async_engine
+        return self
+
+    def _connect(self) -> Any:
+        super()._connect()
+        # The engines PGVectorStore just built have not opened connections yet
+        if self._shared_engine is not None and self._engine is not self._shared_engine:
+            self._engine.dispose()
+            self._engine = self._shared_engine
+            self._session = sessionmaker(self._shared_engine)
+        if self._shared_async_engine is not None and self._async_engine is not self._shared_async_engine:
+            self._async_engine.sync_engine.dispose()
+            self._async_engine = self._shared_async_engine
+            self._async_session = async_sessionmaker(self._shared_async_engine)
+
+
+class InnerProductPGVectorStore(SharedEnginePGVectorStore):
+    """
+    PGVectorStore that ranks by inner product (<#>) instead of cosine distance
+
+    Embeddings must be L2-normalized (see embeddings.NormalizedEmbedding), in
+    which case inner product equals cosine similarity: ranking and reported
+    scores are unchanged, but pgvector skips the per-row norm computation and
+    can use the vector_ip_ops / halfvec_ip_ops HNSW index.
+    """
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "InnerProductPGVectorStore"
+
+    def _build_query(
+        self,
+        embedding: Optional[Any],
+        limit: int = 10,
+        metadata_filters: Optional[MetadataFilters] = None,
+    ) -> Any:
+        from sqlalchemy import literal_column, select
+
+        vector_literal = "'[" + ",".join(str(float(x)) for x in embedding) + "]'"
+        distance = distance_sql("inner_product", self.embed_dim, param=vector_literal)
+
+        stmt = select(  # type: ignore
+            self._table_class.id,
+            self._table_class.node_id,
+            self._table_class.text,
+            self._table_class.metadata_,
+            literal_column(distance).label("distance"),
+        ).order_by(text("distance asc"))
+
+        return self._apply_filters_and_limit(stmt, limit, metadata_filters)
+
+    def query(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        return self._to_cosine_similarity(query, super().query(query, **kwargs))
+
+    async def aquery(self, query: VectorStoreQuery, **kwargs: Any) -> VectorStoreQueryResult:
+        return self._to_cosine_similarity(query, await super().aquery(query, **kwargs))
+
+    @staticmethod
+    def _to_cosine_similarity(
+        query: VectorStoreQuery,
+        result: VectorStoreQueryResult
+    ) -> VectorStoreQueryResult:
+        # PGVectorStore reports 1 - distance; with distance = -<q, e> that is
+        # 1 + cosine, so shift back to keep scores comparable with cosine search
+        if query.mode == VectorStoreQueryMode.DEFAULT and result.similarities:
+            result.similarities = [s - 1.0 for s in result.similarities]
+        return result